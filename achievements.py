@@ -0,0 +1,52 @@
+"""
+Achievement Index - the trophy cabinet, sorted for quick checks!
+Achievements are grouped by requirement_type and sorted by
+requirement_value, so when a counter moves we only look at the
+thresholds it just crossed instead of re-checking every achievement.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from game_data import AchievementRecord, GameData, get_game_data
+
+
+class AchievementIndex:
+    """Achievements by requirement_type, each list sorted by requirement_value"""
+
+    def __init__(self, records: List[AchievementRecord]):
+        self.by_type: Dict[str, List[AchievementRecord]] = {}
+        for record in sorted(records, key=lambda r: (r.requirement_value, r.id)):
+            self.by_type.setdefault(record.requirement_type, []).append(record)
+        self._values = {t: [r.requirement_value for r in rs] for t, rs in self.by_type.items()}
+
+    def crossed(self, requirement_type: str, old_value: int, new_value: int) -> List[AchievementRecord]:
+        """Achievements whose threshold lies in (old_value, new_value]"""
+        values = self._values.get(requirement_type)
+        if not values or new_value <= old_value:
+            return []
+        start = bisect_right(values, old_value)
+        stop = bisect_right(values, new_value, lo=start)
+        return self.by_type[requirement_type][start:stop]
+
+    def reached(self, requirement_type: str, value: int) -> List[AchievementRecord]:
+        """Every achievement of this type that `value` is enough for"""
+        values = self._values.get(requirement_type, [])
+        return self.by_type.get(requirement_type, [])[:bisect_right(values, value)]
+
+
+# Rebuilt whenever the game data is reloaded
+_cached_data: Optional[GameData] = None
+_cached_index: Optional[AchievementIndex] = None
+
+
+def get_achievement_index(db: Session) -> AchievementIndex:
+    """Return the cached achievement index, building it from the game data cache"""
+    global _cached_data, _cached_index
+    game_data = get_game_data(db)
+    if _cached_index is None or _cached_data is not game_data:
+        _cached_index = AchievementIndex(game_data.achievements)
+        _cached_data = game_data
+    return _cached_index
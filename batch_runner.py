@@ -0,0 +1,244 @@
+"""
+Batch Action Runner - Partner B's bot driver!
+Reads actions from a JSON Lines file, one per line:
+
+    {"player": "nasra", "action": "battle", "args": {"monster_id": 3}}
+
+and runs them straight through GameEngine in one process: no rich
+tables, no prompts, no catch animation. Actions are committed in groups
+of `batch_size` and every action gets one JSON result line back.
+"""
+
+import json
+import time
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional
+
+from config import HEAL_COST
+from game_engine import GameEngine
+from models import Player, PlayerMonster
+
+
+class ActionError(Exception):
+    """An action that can't be done (unknown player, no monsters, ...)"""
+
+
+def _int_arg(args: dict, key: str, default: Optional[int], minimum: int, maximum: Optional[int] = None) -> Optional[int]:
+    """A whole-number argument within range, or ActionError"""
+    value = args.get(key, default)
+    if value is None:
+        return None
+    in_range = minimum <= value and (maximum is None or value <= maximum) \
+        if isinstance(value, int) and not isinstance(value, bool) else False
+    if not in_range:
+        allowed = f"from {minimum} to {maximum}" if maximum is not None else f"of at least {minimum}"
+        raise ActionError(f"args.{key} must be a whole number {allowed}, not {value!r}")
+    return value
+
+
+class BatchRunner:
+    """Runs parsed actions through one GameEngine, batching the commits"""
+
+    def __init__(self, engine: Optional[GameEngine] = None, batch_size: int = 100):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.engine = engine or GameEngine()
+        self.batch_size = batch_size
+        self._player_ids: Dict[str, int] = {}
+        self.actions: Dict[str, Callable[[Optional[Player], dict], dict]] = {
+            "create": self._create,
+            "explore": self._explore,
+            "catch": self._catch,
+            "battle": self._battle,
+            "pvp": self._pvp,
+            "heal": self._heal,
+            "achievements": self._achievements,
+            "stats": self._stats,
+            "leaderboard": self._leaderboard,
+        }
+
+    def run(self, actions: Iterable[dict]) -> Iterator[dict]:
+        """Run every action and yield one result per action, in order"""
+        batch: List[dict] = []
+        for number, action in enumerate(actions, 1):
+            batch.append({"line": number, **action})   # read_actions' own "line" wins
+            if len(batch) >= self.batch_size:
+                yield from self._run_batch(batch)
+                batch = []
+        if batch:
+            yield from self._run_batch(batch)
+
+    def _run_batch(self, batch: List[dict]) -> List[dict]:
+        results = []
+        try:
+            with self.engine.transaction():
+                for action in batch:
+                    results.append(self._run_one(action))
+        except Exception as error:
+            # The whole batch was rolled back, so none of it happened
+            self._player_ids.clear()
+            failed_line = batch[len(results)]["line"]
+            return [{"line": a["line"], "action": a.get("action"), "player": a.get("player"),
+                     "ok": False,
+                     "error": f"{type(error).__name__}: {error}" if a["line"] == failed_line
+                     else f"rolled back with line {failed_line}"}
+                    for a in batch]
+        return results
+
+    def _run_one(self, action: dict) -> dict:
+        result = {"line": action["line"], "action": action.get("action"), "player": action.get("player")}
+        handler = self.actions.get(action.get("action"))
+        started = time.perf_counter()
+        try:
+            if "parse_error" in action:
+                raise ActionError(f"bad JSON: {action['parse_error']}")
+            if handler is None:
+                raise ActionError(f"unknown action '{action.get('action')}'")
+            args = action.get("args") or {}
+            player = None if action.get("action") in ("create", "leaderboard") else self._player(action.get("player"))
+            result.update(handler(player, args), ok=True)
+        except ActionError as error:
+            result.update(ok=False, error=str(error))
+        # Unlocks are reported with the action that earned them, so none pile up unreported
+        unlocked = self.engine.pop_pending_achievements()
+        if unlocked:
+            result["achievements_unlocked"] = [{"player_id": player_id, "name": a.name}
+                                               for player_id, records in unlocked.items() for a in records]
+        result["ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    def _player(self, username: Optional[str]) -> Player:
+        """Find a player by name, remembering the id so later actions skip the lookup"""
+        if not username:
+            raise ActionError("missing 'player'")
+        player_id = self._player_ids.get(username)
+        if player_id is not None:
+            return self.engine.db.get(Player, player_id)
+        player = self.engine.db.query(Player).filter(Player.username == username).first()
+        if not player:
+            raise ActionError(f"trainer '{username}' not found")
+        self._player_ids[username] = player.id
+        return player
+
+    # Actions
+    def _create(self, _, args):
+        username = args.get("username")
+        if not username:
+            raise ActionError("create needs args.username")
+        existing = self.engine.db.query(Player).filter(Player.username == username).first()
+        if existing:
+            return {"player_id": existing.id, "created": False}
+        player = self.engine.create_player(username)
+        self._player_ids[username] = player.id
+        return {"player_id": player.id, "created": True}
+
+    def _explore(self, player, args):
+        species = self.engine.encounter_wild_monster()
+        result = {"species": species.name, "rarity": species.rarity}
+        if args.get("catch", True):
+            result["caught"] = self.engine.attempt_catch(player.id, species)
+        return result
+
+    def _catch(self, player, args):
+        game_data = self.engine.game_data
+        wanted = args.get("species")
+        species = game_data.species_by_id.get(wanted) if isinstance(wanted, int) else game_data.species_by_name.get(wanted)
+        if species is None:
+            raise ActionError(f"unknown species '{wanted}'")
+        return {"species": species.name, "caught": self.engine.attempt_catch(player.id, species)}
+
+    def _battle(self, player, args):
+        query = self.engine.db.query(PlayerMonster).filter(PlayerMonster.player_id == player.id)
+        if "monster_id" in args:
+            monster = query.filter(PlayerMonster.id == args["monster_id"]).first()
+        else:
+            # Same rule as the CLI: only monsters above 10% HP can fight
+            monster = query.filter(PlayerMonster.current_hp_expr() > PlayerMonster.max_hp * 0.1) \
+                .order_by(PlayerMonster.id).first()
+        if monster is None:
+            raise ActionError("no healthy monster to battle with")
+        outcome = self.engine.battle_wild_monster(monster)
+        return {
+            "monster_id": monster.id,
+            "won": outcome["won"],
+            "wild": outcome["wild_monster"]["name"],
+            "wild_level": outcome["wild_monster"]["level"],
+            "hp_left": monster.current_hp,
+            "evolved": [f"{e.from_species} -> {e.to_species}" for e in outcome["evolutions"]],
+        }
+
+    def _pvp(self, player, args):
+        seed = _int_arg(args, "seed", None, 0, 2 ** 64 - 1)    # Packed into the battle record as 64 bits
+        opponent = self._player(args.get("opponent"))
+        if opponent.id == player.id:
+            raise ActionError("a trainer can't battle themselves")
+        fighters = []
+        for trainer, key in ((player, "monster_id"), (opponent, "opponent_monster_id")):
+            query = self.engine.db.query(PlayerMonster).filter(PlayerMonster.player_id == trainer.id)
+            if key in args:
+                monster = query.filter(PlayerMonster.id == args[key]).first()
+            else:
+                monster = query.filter(PlayerMonster.current_hp_expr() > PlayerMonster.max_hp * 0.1) \
+                    .order_by(PlayerMonster.level.desc(), PlayerMonster.id).first()
+            if monster is None:
+                raise ActionError(f"{trainer.username} has no healthy monster to battle with")
+            fighters.append(monster)
+        outcome = self.engine.pvp_battle(*fighters, seed=seed)
+        return {
+            "battle_id": outcome["battle_id"],
+            "seed": outcome["seed"],
+            "winner_id": outcome["winner_id"],
+            "turns": outcome["turns"],
+        }
+
+    def _heal(self, player, args):
+        healed = self.engine.heal_for_money(player.id, HEAL_COST)
+        return {"healed": healed, "money": player.money}
+
+    def _achievements(self, player, args):
+        return {"unlocked": [a.name for a in self.engine.check_achievements(player.id)]}
+
+    def _stats(self, player, args):
+        stats = self.engine.get_player_stats(player.id)
+        stats.pop("player")
+        return {"level": player.level, "experience": player.experience, "money": player.money, **stats}
+
+    def _leaderboard(self, _, args):
+        return {"top": [{"username": e.username, "level": e.level, "experience": e.experience,
+                         "monsters": e.monster_count, "wins": e.battle_wins}
+                        for e in self.engine.get_leaderboard(_int_arg(args, "limit", 10, 1))]}
+
+
+def read_actions(source: IO[str]) -> Iterator[dict]:
+    """Parse JSON Lines, skipping blank lines; bad lines are reported as failed actions"""
+    for line_number, text in enumerate(source, 1):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            action = json.loads(text)
+        except json.JSONDecodeError as error:
+            action = {"parse_error": str(error)}
+        if not isinstance(action, dict):
+            action = {"parse_error": "each line must be a JSON object"}
+        action["line"] = line_number
+        yield action
+
+
+def run_batch_file(source: IO[str], output: IO[str], batch_size: int = 100,
+                   engine: Optional[GameEngine] = None) -> dict:
+    """Run an action file and write one JSON result per line; return a summary"""
+    runner = BatchRunner(engine, batch_size)
+    started = time.perf_counter()
+    total = failed = 0
+    for result in runner.run(read_actions(source)):
+        total += 1
+        failed += not result["ok"]
+        output.write(json.dumps(result) + "\n")
+    elapsed = time.perf_counter() - started
+    return {
+        "actions": total,
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "actions_per_second": round(total / elapsed, 1) if elapsed else None,
+        "batch_size": batch_size,
+    }
@@ -0,0 +1,127 @@
+"""
+Battle Record Packing - Partner B's space saver for battle history!
+Battles are the biggest table we have, so instead of a JSON dict with the
+same key names repeated on every row, each battle's details are packed
+into a few bytes with struct:
+
+    byte 0    format version (1)
+    byte 1    kind: 1 = wild battle, 2 = PvP battle
+    rest      fixed-size fields for that kind (little-endian)
+
+Species are stored by id; names and types come back from the game data
+when the record is decoded. Old JSON rows still decode, and
+repack_battles() converts them in chunks.
+"""
+
+import json
+import struct
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Engine
+
+from models import Battle
+
+VERSION = 1
+WILD, PVP = 1, 2
+
+HEADER = struct.Struct("<BB")
+# species_id, level, hp, max_hp, attack, defense, speed
+WILD_STATS = struct.Struct("<HHIIIII")
+# seed
+PVP_SEED = struct.Struct("<Q")
+# monster_id, player_id, species_id, level, hp, max_hp, attack, defense, speed
+COMBATANT = struct.Struct("<IIHHIIIII")
+STAT_NAMES = ("level", "hp", "max_hp", "attack", "defense", "speed")
+
+
+def pack_wild(wild_stats: Dict, species_id: int) -> bytes:
+    """Pack the wild monster's stats dict from battle_wild_monster"""
+    return HEADER.pack(VERSION, WILD) + WILD_STATS.pack(
+        species_id, *(wild_stats[name] for name in STAT_NAMES))
+
+
+def pack_pvp(seed: int, combatants) -> bytes:
+    """Pack a PvP battle's seed and both starting snapshots (Combatant objects)"""
+    return HEADER.pack(VERSION, PVP) + PVP_SEED.pack(seed) + b"".join(
+        COMBATANT.pack(c.monster_id, c.player_id, c.species_id, c.level,
+                       c.hp, c.max_hp, c.attack, c.defense, c.speed)
+        for c in combatants)
+
+
+def unpack(blob: bytes, species_by_id: Optional[Dict] = None) -> Dict:
+    """
+    Turn packed bytes back into the dict the game used to store as JSON.
+    With species_by_id (the game data lookup) names and types are filled in.
+    """
+    version, kind = HEADER.unpack_from(blob)
+    if version != VERSION:
+        raise ValueError(f"Unknown battle record version {version}")
+    if kind == WILD:
+        species_id, *stats = WILD_STATS.unpack_from(blob, HEADER.size)
+        return {"species_id": species_id, **_named(species_id, species_by_id), **dict(zip(STAT_NAMES, stats))}
+    if kind == PVP:
+        (seed,) = PVP_SEED.unpack_from(blob, HEADER.size)
+        combatants = []
+        for offset in range(HEADER.size + PVP_SEED.size, len(blob), COMBATANT.size):
+            monster_id, player_id, species_id, *stats = COMBATANT.unpack_from(blob, offset)
+            combatants.append({"monster_id": monster_id, "player_id": player_id, "species_id": species_id,
+                               **_named(species_id, species_by_id), **dict(zip(STAT_NAMES, stats))})
+        return {"seed": seed, "combatants": combatants}
+    raise ValueError(f"Unknown battle record kind {kind}")
+
+
+def _named(species_id: int, species_by_id: Optional[Dict]) -> Dict:
+    species = species_by_id.get(species_id) if species_by_id else None
+    if species is None:
+        return {}
+    return {"name": species.name, "type": species.type, "type_id": species.type_id}
+
+
+# Old JSON rows
+def pack_legacy(battle_type: str, text: str, species_by_name: Dict) -> Optional[bytes]:
+    """Pack an old JSON battle_data value, or None if it can't be (empty, unknown species...)"""
+    try:
+        data = json.loads(text)
+        if battle_type == "player" and "seed" in data:
+            rows = data["combatants"]
+            # Snapshots were stored as Combatant field lists (monster_id, player_id, species_id, type_id, name, stats...)
+            packed = b"".join(COMBATANT.pack(row[0], row[1], row[2], *row[5:11]) for row in rows)
+            return HEADER.pack(VERSION, PVP) + PVP_SEED.pack(data["seed"]) + packed
+        species = species_by_name.get(data["name"])
+        if species is None:
+            return None
+        return pack_wild(data, species.id)
+    except (ValueError, KeyError, TypeError, IndexError, struct.error):
+        return None
+
+
+def repack_battles(engine: Engine, species_by_name: Dict, chunk_size: int = 5000) -> Dict:
+    """
+    Convert every JSON battle_data row to the packed format, chunk_size rows
+    per transaction (walking the id index, so each chunk is one range
+    read). Rows that can't be converted are left alone and counted.
+    """
+    table = Battle.__table__
+    converted = skipped = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(table.c.id, table.c.battle_type, table.c.battle_data)
+                .where(table.c.id > last_id, table.c.battle_blob.is_(None), table.c.battle_data.isnot(None))
+                .order_by(table.c.id).limit(chunk_size)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            updates = []
+            for battle_id, battle_type, text in rows:
+                blob = pack_legacy(battle_type, text, species_by_name)
+                if blob is None:
+                    skipped += 1
+                else:
+                    updates.append({"bid": battle_id, "battle_blob": blob, "battle_data": None})
+            if updates:
+                conn.execute(update(table).where(table.c.id == bindparam("bid")), updates)
+            converted += len(updates)
+    return {"converted": converted, "skipped": skipped}
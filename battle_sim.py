@@ -0,0 +1,146 @@
+"""
+Headless Battle Simulator - Partner B's training ground!
+Runs thousands of wild battles at the same time with NumPy, with no
+database writes and no battle log. Used for balance checks and bots.
+
+Every battle follows the same rules as GameEngine.battle_wild_monster:
+the same damage formula, faster monster attacks first, wild monsters
+hit back for 10-25 damage, and battles stop after 20 turns.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from encounters import EncounterTable, get_encounter_table
+from game_data import get_game_data
+from type_chart import effectiveness_array
+
+MAX_TURNS = 20          # Same cap as battle_wild_monster
+MOVE_POWER = 40         # Default move power in calculate_damage
+CHUNK_SIZE = 250_000    # Battles resolved per NumPy pass (keeps memory flat)
+
+
+def simulate_wild_battles(monsters: Sequence, n: int, seed: Optional[int] = None,
+                          encounter_table: Optional[EncounterTable] = None,
+                          chunk_size: int = CHUNK_SIZE) -> Dict[str, np.ndarray]:
+    """
+    Fight n wild battles for every monster in `monsters` and return the results.
+
+    `monsters` are PlayerMonster objects (or anything with the same stat
+    attributes and a `species_id`). Nothing is written to the database and
+    the monsters themselves are not changed.
+
+    Returns a dict of arrays, one entry per battle:
+        monster_index, wild_species_id, wild_level, won, turns, player_hp
+    plus `win_rate`, one entry per monster.
+    """
+    if n < 0:
+        raise ValueError("n must not be negative")
+    rng = np.random.default_rng(seed)
+    from database import SessionLocal
+    db = SessionLocal()
+    try:
+        game_data = get_game_data(db)
+        if encounter_table is None:
+            encounter_table = get_encounter_table(db)
+    finally:
+        db.close()
+
+    # Attacker stats, one entry per monster
+    level = np.array([m.level for m in monsters], dtype=np.int64)
+    hp = np.array([m.current_hp for m in monsters], dtype=np.int64)
+    attack = np.array([m.attack for m in monsters], dtype=np.float64)
+    speed = np.array([m.speed for m in monsters], dtype=np.int64)
+
+    # Wild stats for every (encounterable species, level) straight from the stat curves
+    wild = encounter_table.species
+    species_id = np.array([s.id for s in wild], dtype=np.int64)
+    top_level = int(level.max()) + 2 if len(level) else 1
+    curves = np.array([[game_data.stat_curves[s.id].at(lvl) if lvl else (0, 0, 0, 0)
+                        for lvl in range(top_level + 1)] for s in wild],
+                      dtype=np.int64).reshape(len(wild), top_level + 1, 4)
+    prob = np.array(encounter_table.table.prob, dtype=np.float64)
+    alias = np.array(encounter_table.table.alias, dtype=np.int64)
+
+    # Type ids, so effectiveness is gathered from the compiled chart in one go
+    monster_type = np.array([game_data.species_by_id[m.species_id].type_id for m in monsters],
+                            dtype=np.int64)
+    wild_type = np.array([s.type_id for s in wild], dtype=np.int64)
+    chart = effectiveness_array()
+
+    total = len(monsters) * n
+    results = {
+        "monster_index": np.repeat(np.arange(len(monsters), dtype=np.int64), n),
+        "wild_species_id": np.empty(total, dtype=np.int64),
+        "wild_level": np.empty(total, dtype=np.int64),
+        "won": np.empty(total, dtype=bool),
+        "turns": np.empty(total, dtype=np.int64),
+        "player_hp": np.empty(total, dtype=np.int64),
+    }
+
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        idx = results["monster_index"][start:stop]
+
+        # Pick wild species with the same alias table the engine uses
+        u = rng.random(stop - start) * len(prob)
+        column = u.astype(np.int64)
+        wild_idx = np.where(u - column < prob[column], column, alias[column])
+
+        chunk = _fight(rng, level[idx], hp[idx], attack[idx], speed[idx],
+                       curves, wild_idx, chart[monster_type[idx], wild_type[wild_idx]])
+        results["wild_species_id"][start:stop] = species_id[wild_idx]
+        for key, value in chunk.items():
+            results[key][start:stop] = value
+
+    wins = np.bincount(results["monster_index"], weights=results["won"], minlength=len(monsters))
+    results["win_rate"] = wins / n if n else np.zeros(len(monsters))
+    return results
+
+
+def _fight(rng: np.random.Generator, level, player_hp, attack, speed, curves, wild_idx, effectiveness):
+    """Resolve one chunk of battles turn-by-turn in lockstep"""
+    count = len(level)
+    wild_level = np.maximum(1, level + rng.integers(-2, 3, size=count))
+
+    # Wild stats looked up from the same stat curves battle_wild_monster uses
+    wild_stats = curves[wild_idx, wild_level]
+    wild_hp = wild_stats[:, 0].copy()
+    wild_defense = wild_stats[:, 2]
+    wild_speed = wild_stats[:, 3]
+
+    # Everything in the damage formula except the random factor is fixed per battle
+    base_damage = ((2 * level + 10) / 250.0) * (attack / wild_defense) * MOVE_POWER + 2
+    base_damage = base_damage * effectiveness
+    level_factor = level / 50.0
+    player_first = speed >= wild_speed
+
+    player_hp = player_hp.copy()
+    turns = np.zeros(count, dtype=np.int64)
+    for _ in range(MAX_TURNS):
+        active = (player_hp > 0) & (wild_hp > 0)
+        if not active.any():
+            break
+        turns += active
+
+        player_damage = np.maximum(
+            1, (base_damage * rng.uniform(0.85, 1.0, size=count) * level_factor).astype(np.int64))
+        wild_damage = rng.integers(10, 26, size=count)
+
+        # Faster player hits first, wild monster answers if it is still standing
+        hit = active & player_first
+        wild_hp -= np.where(hit, player_damage, 0)
+        player_hp -= np.where(hit & (wild_hp > 0), wild_damage, 0)
+
+        # Faster wild monster hits first, player answers if still standing
+        hit = active & ~player_first
+        player_hp -= np.where(hit, wild_damage, 0)
+        wild_hp -= np.where(hit & (player_hp > 0), player_damage, 0)
+
+    return {
+        "wild_level": wild_level,
+        "won": (player_hp > 0) & (wild_hp <= 0),
+        "turns": turns,
+        "player_hp": np.maximum(0, player_hp),
+    }
@@ -0,0 +1,222 @@
+"""
+Engine Benchmark - how fast are the game's hot paths, and did that change?
+For each database size it generates a synthetic world (worldgen.py) into a
+file-backed SQLite database, then measures:
+
+    encounters     encounter_wild_monster calls per second
+    catches        attempt_catch calls per second (each one committed)
+    battles        battle_wild_monster calls per second (one transaction each)
+    achievements   check_achievements latency
+    player_stats   get_player_stats latency
+    leaderboard    get_leaderboard(10) latency
+    cold_start     wall time of `monster_game.py leaderboard` in a new process
+
+Every size runs in its own process (the game binds its database when it is
+first imported). Results come out as JSON; save one run as the baseline and
+later runs are compared against it, failing (exit code 1) when any metric
+got worse by more than the threshold.
+
+    python benchmarks/bench_engine.py --sizes 1000,10000 --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_engine.py --sizes 1000,10000 --baseline benchmarks/baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+# name -> (unit, which way is better)
+METRICS = {
+    "encounters": ("ops/s", "higher"),
+    "catches": ("ops/s", "higher"),
+    "battles": ("ops/s", "higher"),
+    "achievements": ("ms", "lower"),
+    "player_stats": ("ms", "lower"),
+    "leaderboard": ("ms", "lower"),
+    "cold_start": ("ms", "lower"),
+}
+
+
+def _throughput(operation, count: int) -> dict:
+    start = time.perf_counter()
+    for _ in range(count):
+        operation()
+    seconds = time.perf_counter() - start
+    return {"value": count / seconds, "ops": count, "seconds": seconds}
+
+
+def _latency(operation, count: int, before=None) -> dict:
+    """p50 latency in ms as the value; `before` runs untimed ahead of every call"""
+    timings = []
+    for _ in range(count):
+        if before:
+            before()
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {"value": statistics.median(timings), "mean_ms": statistics.mean(timings),
+            "p95_ms": timings[max(0, int(len(timings) * 0.95) - 1)], "ops": count}
+
+
+def run_size(players: int, args) -> dict:
+    """Build one world and measure it (runs inside the child process)"""
+    from config import DATABASE_URL
+    from database import ensure_database, make_engine
+    from game_engine import GameEngine
+    from models import PlayerMonster
+    from worldgen import generate_world
+
+    ensure_database()
+    engine = GameEngine()
+    bulk_engine = make_engine(DATABASE_URL, "bulk")
+    world = generate_world(bulk_engine, engine.game_data, players, args.monsters_per_player,
+                           args.battles_per_player, args.trades_per_player, args.seed)
+    bulk_engine.dispose()
+
+    random.seed(args.seed)
+    rng = random.Random(args.seed)
+    player_ids = list(range(1, players + 1))
+    monster_ids = [row[0] for row in engine.db.query(PlayerMonster.id).order_by(PlayerMonster.id)]
+    species = engine.game_data.species
+    db = engine.db
+
+    metrics = {"encounters": _throughput(engine.encounter_wild_monster, args.encounters)}
+
+    def catch():
+        engine.attempt_catch(rng.choice(player_ids), rng.choice(species))
+    metrics["catches"] = _throughput(catch, args.ops)
+
+    def battle():
+        with engine.transaction():
+            engine.battle_wild_monster(db.get(PlayerMonster, rng.choice(monster_ids)))
+    metrics["battles"] = _throughput(battle, args.ops)
+
+    # Each call starts from an empty session, like a new command would
+    metrics["achievements"] = _latency(lambda: engine.check_achievements(rng.choice(player_ids)),
+                                       args.ops, db.expunge_all)
+    metrics["player_stats"] = _latency(lambda: engine.get_player_stats(rng.choice(player_ids)),
+                                       args.ops, db.expunge_all)
+    metrics["leaderboard"] = _latency(lambda: engine.get_leaderboard(10), args.ops, db.expunge_all)
+
+    command = [sys.executable, os.path.join(ROOT, "monster_game.py"), "leaderboard"]
+    metrics["cold_start"] = _latency(
+        lambda: subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True),
+        args.cold_starts)
+    db.close()
+
+    return {"world": world._asdict() | {"rows_per_second": world.rows_per_second}, "metrics": metrics}
+
+
+def run_all(args) -> dict:
+    """Run every size in a fresh process against its own database file"""
+    sizes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for players in args.sizes:
+            path = os.path.join(args.keep_dir or tmp, f"bench-{players}.db")
+            if os.path.exists(path):
+                os.remove(path)
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+            child = [sys.executable, os.path.abspath(__file__), "--child", str(players)] + _passthrough(args)
+            print(f"⏳ {players} trainers...", file=sys.stderr)
+            output = subprocess.run(child, env=env, capture_output=True, text=True, check=True).stdout
+            sizes[str(players)] = json.loads(output)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "per_player": {"monsters": args.monsters_per_player, "battles": args.battles_per_player,
+                           "trades": args.trades_per_player},
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "sizes": sizes,
+    }
+
+
+def _passthrough(args) -> list:
+    return ["--seed", str(args.seed), "--ops", str(args.ops), "--encounters", str(args.encounters),
+            "--cold-starts", str(args.cold_starts), "--monsters-per-player", str(args.monsters_per_player),
+            "--battles-per-player", str(args.battles_per_player), "--trades-per-player", str(args.trades_per_player)]
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """(size, metric, baseline, current, change, regressed) for every metric both runs have"""
+    rows = []
+    for size, result in current["sizes"].items():
+        old = baseline.get("sizes", {}).get(size)
+        if not old:
+            continue
+        for name, (_, better) in METRICS.items():
+            if name not in result["metrics"] or name not in old["metrics"]:
+                continue
+            before, after = old["metrics"][name]["value"], result["metrics"][name]["value"]
+            change = (after - before) / before if before else 0.0
+            regressed = change < -threshold if better == "higher" else change > threshold
+            rows.append((size, name, before, after, change, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda text: [int(s) for s in text.split(",")], default=[1000, 10000],
+                        help="comma-separated trainer counts, one database each")
+    parser.add_argument("--monsters-per-player", type=int, default=20)
+    parser.add_argument("--battles-per-player", type=int, default=30)
+    parser.add_argument("--trades-per-player", type=int, default=2)
+    parser.add_argument("--ops", type=int, default=300, help="timed calls per database operation")
+    parser.add_argument("--encounters", type=int, default=50_000, help="timed encounter draws")
+    parser.add_argument("--cold-starts", type=int, default=5, help="timed CLI launches")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="compare against this earlier JSON result")
+    parser.add_argument("--save-baseline", help="also write the results here as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown as a fraction before it counts as a regression")
+    parser.add_argument("--keep-dir", help="keep the generated databases in this directory")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_size(args.child, args)))
+        return
+
+    results = run_all(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as out:
+            out.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as out:
+            out.write(text + "\n")
+
+    print(f"\n{'size':>8} {'metric':<14}{'value':>14}", file=sys.stderr)
+    for size, result in results["sizes"].items():
+        for name, (unit, _) in METRICS.items():
+            print(f"{size:>8} {name:<14}{result['metrics'][name]['value']:>12.2f} {unit}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as source:
+            rows = compare(results, json.load(source), args.threshold)
+        print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):", file=sys.stderr)
+        print(f"{'size':>8} {'metric':<14}{'baseline':>12}{'now':>12}{'change':>9}", file=sys.stderr)
+        for size, name, before, after, change, regressed in rows:
+            flag = "  ❌ REGRESSION" if regressed else ""
+            print(f"{size:>8} {name:<14}{before:>12.2f}{after:>12.2f}{change:>+8.1%}{flag}", file=sys.stderr)
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Index Benchmark - how much do the migration indexes help?
+Builds a large synthetic database that looks like an old save file (no
+indexes), times the game's hot queries and shows their query plans,
+then runs the migrations and does it all again.
+
+    python benchmarks/bench_indexes.py --players 20000 --monsters 200000 --battles 500000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+
+from models import Base
+from migrations import MIGRATIONS, run_migrations
+
+# The hot queries the game runs, keyed by a short name (":pid" is a random player id)
+QUERIES = {
+    "collection": "SELECT * FROM player_monsters WHERE player_id = :pid",
+    "collection_page": "SELECT * FROM player_monsters WHERE player_id = :pid ORDER BY level DESC, id DESC LIMIT 20",
+    "battle_wins": "SELECT COUNT(*) FROM battles WHERE winner_id = :pid",
+    "battle_history": "SELECT COUNT(*) FROM battles WHERE player1_id = :pid OR player2_id = :pid",
+    "pending_trades": "SELECT * FROM trades WHERE to_player_id = :pid AND status = 'pending'",
+    "achievements": "SELECT achievement_id FROM player_achievements WHERE player_id = :pid",
+}
+
+CHUNK = 50_000
+
+
+def build_legacy_database(url: str, players: int, monsters: int, battles: int, seed: int):
+    """Create a big database with the same shape as a file from before any migration"""
+    rng = random.Random(seed)
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Take away every index the migrations add, so this looks like an old save
+        for migration in MIGRATIONS:
+            for statement in migration.steps:
+                if isinstance(statement, str) and statement.startswith("CREATE INDEX"):
+                    name = statement.split()[5]
+                    conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        conn.exec_driver_sql("DELETE FROM schema_version")
+
+        conn.exec_driver_sql(
+            "INSERT INTO players (id, username, level, experience, money) VALUES (?, ?, ?, ?, ?)",
+            [(i, f"trainer{i}", rng.randint(1, 30), rng.randint(0, 5000), 500) for i in range(1, players + 1)])
+        _insert_chunked(conn,
+            "INSERT INTO player_monsters (player_id, species_id, level, experience, hp, max_hp, attack, defense, speed) "
+            "VALUES (?, ?, ?, 0, 50, 50, 50, 50, 50)",
+            ((rng.randint(1, players), rng.randint(1, 22), rng.randint(1, 50)) for _ in range(monsters)))
+        _insert_chunked(conn,
+            "INSERT INTO battles (player1_id, player2_id, winner_id, battle_type, battle_data) VALUES (?, ?, ?, ?, '')",
+            _battle_rows(rng, players, battles))
+        _insert_chunked(conn,
+            "INSERT INTO trades (from_player_id, to_player_id, offered_monster_id, requested_monster_id, status) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((rng.randint(1, players), rng.randint(1, players), rng.randint(1, monsters or 1),
+              rng.randint(1, monsters or 1), rng.choice(["pending", "completed", "rejected"]))
+             for _ in range(battles // 10)))
+        _insert_chunked(conn,
+            "INSERT INTO player_achievements (player_id, achievement_id) VALUES (?, ?)",
+            ((rng.randint(1, players), rng.randint(1, 11)) for _ in range(players * 3)))
+    return engine
+
+
+def _battle_rows(rng, players, count):
+    for _ in range(count):
+        player1 = rng.randint(1, players)
+        if rng.random() < 0.8:
+            yield player1, None, player1 if rng.random() < 0.5 else None, "wild"
+        else:
+            player2 = rng.randint(1, players)
+            yield player1, player2, rng.choice([player1, player2]), "player"
+
+
+def _insert_chunked(conn, sql, rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK:
+            conn.exec_driver_sql(sql, chunk)
+            chunk = []
+    if chunk:
+        conn.exec_driver_sql(sql, chunk)
+
+
+def measure(engine, players: int, repeats: int, seed: int) -> dict:
+    """Query plan and latency (ms) for every hot query"""
+    rng = random.Random(seed)
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            plan = [row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), {"pid": 1})]
+            timings = []
+            for _ in range(repeats):
+                pid = rng.randint(1, players)
+                start = time.perf_counter()
+                conn.execute(text(sql), {"pid": pid}).fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = {
+                "plan": plan,
+                "mean_ms": statistics.mean(timings),
+                "p95_ms": sorted(timings)[int(len(timings) * 0.95) - 1],
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=20_000)
+    parser.add_argument("--monsters", type=int, default=200_000)
+    parser.add_argument("--battles", type=int, default=500_000)
+    parser.add_argument("--repeats", type=int, default=50, help="timed runs per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        start = time.perf_counter()
+        engine = build_legacy_database(url, args.players, args.monsters, args.battles, args.seed)
+        build_seconds = time.perf_counter() - start
+
+        before = measure(engine, args.players, args.repeats, args.seed)
+        start = time.perf_counter()
+        run_migrations(engine)
+        migrate_seconds = time.perf_counter() - start
+        after = measure(engine, args.players, args.repeats, args.seed)
+        engine.dispose()
+
+    if args.json:
+        print(json.dumps({
+            "sizes": {"players": args.players, "monsters": args.monsters, "battles": args.battles},
+            "build_seconds": build_seconds,
+            "migrate_seconds": migrate_seconds,
+            "before": before,
+            "after": after,
+        }, indent=2))
+        return
+
+    print(f"Built synthetic DB in {build_seconds:.1f}s, migrations took {migrate_seconds:.2f}s\n")
+    print(f"{'query':<16}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name in QUERIES:
+        b, a = before[name]["mean_ms"], after[name]["mean_ms"]
+        print(f"{name:<16}{b:>12.3f}{a:>12.3f}{b / a if a else float('inf'):>9.1f}x")
+    print("\nQuery plans (before -> after):")
+    for name in QUERIES:
+        print(f"  {name}:")
+        print(f"    before: {' | '.join(before[name]['plan'])}")
+        print(f"    after:  {' | '.join(after[name]['plan'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import random
+import time
 from typing import Optional
 import click
 from rich.console import Console
@@ -10,11 +11,39 @@ from rich import print as rprint
 
 #getting the game brain interface now##
 from game_engine import GameEngine
-from database import init_database
 from models import Player, PlayerMonster, MonsterSpecies
 from config import HEAL_COST
 
 console= Console()
+
+# How many healthy monsters the battle menu offers
+BATTLE_CHOICES = 20
+
+
+def parse_collection_filters(filters: list) -> dict:
+    """Turn --filter values like 'type=Fire', 'level=5-10' or 'hp=injured' into get_collection arguments"""
+    parsed = {}
+    for item in filters:
+        key, sep, value = item.partition("=")
+        key, value = key.strip().lower(), value.strip()
+        if not sep or not value:
+            raise ValueError(f"Bad filter '{item}', use key=value")
+        if key in ("species", "type", "rarity"):
+            parsed[key] = value
+        elif key == "hp":
+            parsed["hp_status"] = value.lower()
+        elif key == "level":
+            low, dash, high = value.partition("-")
+            try:
+                parsed["min_level"] = int(low) if low else None
+                parsed["max_level"] = (int(high) if high else None) if dash else parsed["min_level"]
+            except ValueError:
+                raise ValueError(f"Bad level filter '{value}', use 7, 5-10, 5- or -10") from None
+        else:
+            raise ValueError(f"Unknown filter '{key}' (use species, type, rarity, level or hp)")
+    return parsed
+
+
 class CLIInterface:
     def __init__(self):
         self.game_engine = GameEngine()
@@ -50,7 +79,8 @@ class CLIInterface:
         if existing_player:
             console.print("❌ username already exists! Try logging in instead.", style="red")
             return
-        player = self.game_engine.create_player(username_name)
+        with self.game_engine.transaction():
+            player = self.game_engine.create_player(username_name)
         console.print(f"🎉 Player '{player.username}' created successfully!", style="green")
         console.print("💖You've been given a starter monster!", style="yellow")
 
@@ -96,12 +126,13 @@ class CLIInterface:
             self._attempt_catch(player_obj, wild_species)
         elif action == "fight":
             # The _fight_monster method does not exist, so simulate battle with first monster
-            monsters = self.game_engine.db.query(PlayerMonster).filter(PlayerMonster.player_id == player_obj.id).all()
+            monsters = self.game_engine.get_collection(player_obj.id, limit=1).monsters
             if not monsters:
                 console.print("❌ You have no monsters to fight with!", style="red")
                 return
             chosen_monster = monsters[0]
-            battle_result = self.game_engine.battle_wild_monster(chosen_monster)
+            with self.game_engine.transaction():
+                battle_result = self.game_engine.battle_wild_monster(chosen_monster)
             self._display_battle_result(battle_result)
         else:
             console.print("🏃‍♂️ You ran away safely!", style="green")
@@ -112,15 +143,15 @@ class CLIInterface:
 
         ##lets show the player coool catch animation##
         for i in track(range(3), description="Throwing Monsterball..."):
-            import time
             time.sleep(0.5)   ##lets wait for some time we make it realistic##
-        success = self.game_engine.attempt_catch(player_obj.id, wild_species.id)
+        with self.game_engine.transaction():
+            success = self.game_engine.attempt_catch(player_obj.id, wild_species.id)
+            new_achievements = self.game_engine.check_achievements(player_obj.id)
         if success:
             console.print(f"🎉 You caught {wild_species.name}!", style="green")
             console.print(f"💫 +50 Experience gained!", style="cyan")
 
             #checking for achievements##
-        new_achievements = self.game_engine.check_achievements(player_obj.id)
         for achievement in new_achievements:
             console.print(f"🏆 New achievement unlocked: {achievement.name}!", style="bold magenta")
             console.print(f"💰 Received ${achievement.reward_money}!", style="yellow")
@@ -131,19 +162,30 @@ class CLIInterface:
     
     
     
-    def handle_collection(self, Player:str):
-        """Display the player's monster collection."""
+    def handle_collection(self, Player:str, page: Optional[str] = None, filters: Optional[list] = None,
+                          sort: str = "id", limit: int = 20):
+        """Display one page of the player's monster collection."""
         player_obj = self.game_engine.login_player(Player)
         if not player_obj:
             console.print("❌ Trainer not found! Please create a new account.", style="red")
             return
-        ##checking all the monsters##
-        monsters= self.game_engine.db.query(PlayerMonster).filter(PlayerMonster.player_id==player_obj.id).all()
-        if not monsters:
-            console.print("📭Your collection is empty! Go explore to catch some monsters!.", style="yellow")
+        ##only the page we show is loaded, species come along in the same query##
+        try:
+            collection_page = self.game_engine.get_collection(
+                player_obj.id, limit=limit, cursor=page, sort=sort, **parse_collection_filters(filters or []))
+        except ValueError as error:
+            console.print(f"❌ {error}", style="red")
+            return
+        if not collection_page.monsters:
+            if page or filters:
+                console.print("📭 No monsters match that page/filter.", style="yellow")
+            else:
+                console.print("📭Your collection is empty! Go explore to catch some monsters!.", style="yellow")
             return
 
-        self._display_collection(player_obj, monsters)
+        self._display_collection(player_obj, collection_page.monsters)
+        if collection_page.next_cursor:
+            console.print(f"➡️  Next page: --page {collection_page.next_cursor}", style="cyan")
     def _display_collection(self, player:str, monsters: list):
         """Display the player's monster collection."""
         console.print(f"\n📚 {player.username}'s Monster Collection:", style="bold magenta")
@@ -164,7 +206,7 @@ class CLIInterface:
              ##lets add the monsters to the table##
 
         for monster in monsters:
-          hp_display= f"{monster.hp}/{monster.max_hp}"
+          hp_display= f"{monster.current_hp}/{monster.max_hp}"
           table.add_row(
               str(monster.id),
               monster.species.name,
@@ -177,7 +219,7 @@ class CLIInterface:
               monster.species.rarity
           )
         console.print(table)
-        console.print(f"\n📊 Total monsters: {len(monsters)}", style="blue")
+        console.print(f"\n📊 Monsters shown: {len(monsters)}", style="blue")
     def handle_battle(self, player_name: str):
         """Start a battle with a wild monster."""
         player_obj = self.game_engine.login_player(player_name)
@@ -185,11 +227,9 @@ class CLIInterface:
             console.print("❌ Trainer not found! Please create a new account.", style="red")
             return
         
-        ##get the player's monsters##
-        monsters= self.game_engine.db.query(PlayerMonster).filter(PlayerMonster.player_id == player_obj.id).all()
-        for m in monsters:
-            console.print(f"Monster {m.species.name} HP: {m.hp}/{m.max_hp}")
-        healthy_monsters = [m for m in monsters if m.hp > m.max_hp*0.1]
+        ##the strongest healthy monsters to pick from##
+        healthy_monsters = self.game_engine.get_collection(
+            player_obj.id, limit=BATTLE_CHOICES, sort="-level", hp_status="healthy").monsters
         if not healthy_monsters:
             console.print("💔 You have no healthy monsters to battle with!", style="red")
             console.print(f"🏥 use 'heal' command to restore your monsters!", style="yellow")
@@ -204,11 +244,13 @@ class CLIInterface:
         console.print("\n🥊🥊 ${chosen_monster.species.name} enters the battle arena!", style="green")
 
         ##now lets find a wild monster to battle with##start the battle##
-        battle_result=self.game_engine.battle_wild_monster(chosen_monster)
+        ##whole battle (rewards, level ups, achievements) is saved in one go##
+        with self.game_engine.transaction():
+            battle_result=self.game_engine.battle_wild_monster(chosen_monster)
+            new_archivement = self.game_engine.check_achievements(player_obj.id)
         #lets show now what happens in thebattle##
         self._display_battle_result(battle_result,)
         ##check for new archivements##
-        new_archivement = self.game_engine.check_achievements(player_obj.id)
         for achievement in new_archivement:
             console.print(f"🏆 New achievement unlocked: {achievement.name}!", style="bold magenta")
             console.print(f"💰 Received ${achievement.reward_money}!", style="yellow")
@@ -230,7 +272,7 @@ class CLIInterface:
         table.add_column("Status")
 
         for i, monster in enumerate(monsters,1):
-            hp_percent=monster.hp/monster.max_hp 
+            hp_percent=monster.current_hp/monster.max_hp 
             satus="Excellent" if hp_percent > 0.7 else "Good" if hp_percent > 0.4 else "Injured"
             status_style = "green" if hp_percent  > 0.7 else "yellow" if hp_percent > 0.4 else "red"
             table.add_row(
@@ -238,7 +280,7 @@ class CLIInterface:
                 monster.species.name,
                 monster.species.type,
                 str(monster.level),
-                f"{monster.hp}/{monster.max_hp}",
+                f"{monster.current_hp}/{monster.max_hp}",
                 f"[{status_style}]{satus}[/{status_style}]"
             )
         console.print(table)
@@ -266,6 +308,8 @@ class CLIInterface:
                 console.print(f"💔 {log_entry}", style="bold red")
             elif "Level Up" in log_entry:
                 console.print(f"🎉 {log_entry}", style="bold yellow")
+            elif "evolved into" in log_entry:
+                console.print(log_entry, style="bold magenta")
             elif "Turn" in log_entry:
                 console.print(f"🔄 {log_entry}", style="bold cyan")
             elif "HP" in log_entry:
@@ -306,8 +350,10 @@ class CLIInterface:
             console.print("❌ You cannot battle yourself! Please choose another trainer.", style="red")
             return
         
-        p1_monsters=[m for m in player1.monsters if m.hp > m.max_hp * 0.1]
-        p2_monsters=[m for m in player2.monsters if m.hp > m.max_hp * 0.1]
+        p1_monsters = self.game_engine.get_collection(
+            player1.id, limit=BATTLE_CHOICES, sort="-level", hp_status="healthy").monsters
+        p2_monsters = self.game_engine.get_collection(
+            player2.id, limit=BATTLE_CHOICES, sort="-level", hp_status="healthy").monsters
         if not p1_monsters or not p2_monsters:
             console.print("💔 One or both trainers have no healthy monsters to battle with!", style="red")
             return
@@ -326,19 +372,86 @@ class CLIInterface:
         if not p2_choice:
             return
         
-        ###buttle coce now##
-        # The GameEngine class does not have a pvp_battle method, so we need to implement or fix this call
-        # For now, let's just simulate a simple battle result dictionary to avoid error
-        battle_result = {
-            'battle_log': [
-                f"{p1_choice.species.name} attacks {p2_choice.species.name}!",
-                f"{p2_choice.species.name} attacks {p1_choice.species.name}!",
-                "Battle ended in a draw (simulation)."
-            ],
-            'can_catch': False
-        }
+        ###battle time! the whole fight and its rewards are saved in one go##
+        with self.game_engine.transaction():
+            battle_result = self.game_engine.pvp_battle(p1_choice, p2_choice)
+            new_achievements = self.game_engine.check_achievements(player1.id) + \
+                self.game_engine.check_achievements(player2.id)
         self._display_battle_result(battle_result)
-        
+        console.print(f"🎬 Battle #{battle_result['battle_id']} (seed {battle_result['seed']}) "
+                      f"- replay it with 'replay-battle --battle-id {battle_result['battle_id']}'", style="dim")
+        for achievement in new_achievements:
+            console.print(f"🏆 New achievement unlocked: {achievement.name}!", style="bold magenta")
+            console.print(f"💰 Received ${achievement.reward_money}!", style="yellow")
+
+    def handle_replay_battle(self, battle_id: int):
+        """Replay a recorded PvP battle turn by turn."""
+        try:
+            replay = self.game_engine.replay_pvp_battle(battle_id)
+        except ValueError as error:
+            console.print(f"❌ {error}", style="red")
+            return
+        console.print(f"\n🎬 Replaying battle #{battle_id} (seed {replay['seed']})", style="bold cyan")
+        self._display_battle_result(replay)
+        if not replay['matches_record']:
+            console.print("⚠️ The replay's winner differs from the recorded one (game data changed?)", style="yellow")
+
+    def handle_tournament(self, fmt: str = "round-robin", players: tuple = (), per_player: Optional[int] = None,
+                          workers: Optional[int] = None, chunk_size: int = 2000, seed: Optional[int] = None,
+                          record: bool = True, top: int = 20):
+        """Run a tournament between trainers' monsters and show the standings."""
+        from tournament import Tournament, load_entrants
+        player_ids = []
+        for name in players:
+            player_obj = self.game_engine.login_player(name)
+            if not player_obj:
+                console.print(f"❌ Trainer '{name}' not found!", style="red")
+                return
+            player_ids.append(player_obj.id)
+
+        entrants = load_entrants(self.game_engine, player_ids, per_player)
+        try:
+            tournament = Tournament(entrants, fmt, seed, workers, chunk_size)
+        except ValueError as error:
+            console.print(f"❌ {error}", style="red")
+            return
+        console.print(f"\n🏟️ {fmt.title()} tournament: {len(entrants)} monsters, "
+                      f"{tournament.workers} worker{'s' if tournament.workers != 1 else ''}, seed {tournament.seed}", style="bold cyan")
+        started = time.perf_counter()
+        played = tournament.run(self.game_engine if record else None)
+        elapsed = time.perf_counter() - started
+        console.print(f"⚔️ {played} matches in {elapsed:.2f}s "
+                      f"({played / elapsed if elapsed else 0:.0f} matches/s)", style="cyan")
+
+        usernames = dict(self.game_engine.db.query(Player.id, Player.username)
+                         .filter(Player.id.in_({e.player_id for e in entrants})).all())
+        table = Table(show_header=True, header_style="bold yellow")
+        table.add_column("Rank", justify="center", style="bold")
+        table.add_column("Monster", style="bold cyan")
+        table.add_column("Trainer")
+        table.add_column("Level", justify="center")
+        table.add_column("W", justify="center", style="green")
+        table.add_column("L", justify="center", style="red")
+        table.add_column("D", justify="center")
+        table.add_column("Damage", justify="center")
+        table.add_column("Points", justify="center", style="bold")
+        for rank, line in enumerate(tournament.standings()[:top], 1):
+            table.add_row(str(rank), f"{line.name} #{line.monster_id}", usernames.get(line.player_id, "?"),
+                          str(line.level), str(line.wins), str(line.losses), str(line.draws),
+                          str(line.damage), str(line.points))
+        console.print(table)
+        if tournament.champion is not None:
+            champion = tournament.entrants[tournament.champion]
+            console.print(f"🏆 Champion: {champion[4]} #{champion[0]} ({usernames.get(champion[1], '?')})",
+                          style="bold yellow")
+
+        if record:
+            console.print(f"💾 Recorded {tournament.recorded} battles (replay any with replay-battle)", style="dim")
+            # Reported here as a count, so they don't turn up later in a shell session
+            self.game_engine.pop_pending_achievements()
+            if tournament.unlocked:
+                console.print(f"🏅 The wins unlocked {tournament.unlocked} achievements", style="bold green")
+
     def handle_heal(self, player: str):   
         """Heal a player's monsters.""" 
         player_obj = self.game_engine.login_player(player)
@@ -355,11 +468,10 @@ class CLIInterface:
 
 
 
-            ##take their money and heal monsters"##
-        player_obj.money -= HEAL_COST
-        self.game_engine.db.commit()
-
-        self.game_engine.heal_all_monsters(player_obj.id)
+            ##take their money and heal monsters in one go##
+        if not self.game_engine.heal_for_money(player_obj.id, HEAL_COST):
+            console.print(f"💰 Insufficient funds! Healing costs ${HEAL_COST} but you only have ${player_obj.money}.", style="red")
+            return
         console.print(f"🏥 All your monsters have been healed to full HP!", style="green")
         console.print(f"💰 Paid ${HEAL_COST}. Remaining money: ${player_obj.money}",style="yellow")
 
@@ -579,8 +691,8 @@ class CLIInterface:
                                 status="completed",
                                 completed_at=datetime.utcnow()
                                 )
-            self.game_engine.db.add(trade_record)
-            self.game_engine.db.commit()
+            with self.game_engine.transaction():
+                self.game_engine.db.add(trade_record)
 
             console.print("🎉 Trade successful!", style="bold green")
             console.print(f"📤 You gave: {offered_Monster.species.name} (Level {offered_Monster.level})", style="cyan")
@@ -590,7 +702,7 @@ class CLIInterface:
 
     def handle_leaderboard(self):
         #show the to[ players##
-        top_players=self.game_engine.db.query(Player).order_by(Player.level.desc(), Player.experience.desc()).limit(10).all()
+        top_players=self.game_engine.get_leaderboard(10)
         if not top_players:
             console.print("📭 No trainers found!", style="yellow")
             return
@@ -607,12 +719,7 @@ class CLIInterface:
         table.add_column("Monsters", justify="center")
         table.add_column("Battles Won", justify="center")
         
-        from models import Battle
-        
         for i, player in enumerate(top_players, 1):
-            monster_count = len(player.monsters)
-            battle_wins = self.game_engine.db.query(Battle).filter(Battle.winner_id == player.id).count()
-            
             # Make top 3 players special colors
             rank_style = "gold" if i == 1 else "silver" if i == 2 else "orange" if i == 3 else "white"
             rank_symbol = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else str(i)
@@ -622,8 +729,8 @@ class CLIInterface:
                 player.username,
                 str(player.level),
                 str(player.experience),
-                str(monster_count),
-                str(battle_wins)
+                str(player.monster_count),
+                str(player.battle_wins)
             )
         
         console.print(table)
\ No newline at end of file
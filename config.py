@@ -9,9 +9,61 @@ import os
 # Database configuration
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///monster_game.db')
 
+# SQLite storage profile - which PRAGMAs every new connection gets.
+# The PRAGMAs are set once per connection, so SQLite file databases get an
+# explicit QueuePool (SQLITE_POOL_SIZE connections kept open, each set up
+# once, and WAL lets them read while one writes). A :memory: database is a
+# different empty database on every connection, so it gets a
+# SingletonThreadPool instead: one connection per thread, for the whole run.
+DB_PROFILE = os.getenv('DB_PROFILE', 'concurrent')
+DB_PROFILES = {
+    # WAL lets many game processes read while one writes; NORMAL sync is safe in WAL mode
+    "concurrent": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,      # 256 MB memory-mapped reads
+        "cache_size": -65536,        # 64 MB page cache (negative = KiB)
+        "busy_timeout": 5000,        # Wait up to 5s for a lock instead of failing
+        "temp_store": "MEMORY",
+    },
+    # Same as concurrent, but every commit is fully synced to disk
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -65536,
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+    # For big one-off loads (imports, generators) - fast but not crash-safe
+    "bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 268435456,
+        "cache_size": -262144,       # 256 MB page cache
+        "busy_timeout": 30000,
+        "temp_store": "MEMORY",
+    },
+    # Plain SQLite defaults, only with a busy timeout
+    "legacy": {
+        "busy_timeout": 5000,
+    },
+}
+
+# Connection pool sizing (SQLite files, see DB_PROFILE above)
+SQLITE_POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', '5'))
+SQLITE_MAX_OVERFLOW = int(os.getenv('SQLITE_MAX_OVERFLOW', '5'))
+
+# Connection pool sizing (server databases)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))       # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))     # Seconds before a server connection is replaced
+
 # Game balance settings (Partner A decides these!)
 STARTER_MONEY = 500                    # How much money new players start with
 HEAL_COST = 50                        # How much it costs to heal monsters
+# Passive healing: share of max HP monsters get back per minute (0 turns it off)
+HP_REGEN_PER_MINUTE = float(os.getenv('HP_REGEN_PER_MINUTE', '0'))
 BASE_CATCH_RATE_BONUS = 0.02          # Catch rate improves by 2% per player level
 BATTLE_EXP_MULTIPLIER = 25            # Base experience from battles
 BATTLE_MONEY_MULTIPLIER = 10          # Base money from battles
@@ -59,10 +111,12 @@ RARITY_WEIGHTS = {
     "Uncommon": 30,    # Somewhat rare
     "Rare": 15,        # Pretty rare
     "Epic": 4,         # Very rare
-    "Legendary": 1     # Extremely rare!
+    "Legendary": 1,    # Extremely rare!
+    "Evolved": 0       # Never wild, only reached by evolving
 }
 
 # Monster level progression (Partner A designs this!)
 EXP_PER_LEVEL = 100              
 PLAYER_EXP_PER_LEVEL = 200       # How much exp players need to level up
-STAT_GROWTH_PER_LEVEL = 0.1      # Stats grow by 10% per level
\ No newline at end of file
+STAT_GROWTH_PER_LEVEL = 0.1      # Stats grow by 10% per level
+MAX_LEVEL = 100                  # Stat curves are precomputed up to this level
\ No newline at end of file
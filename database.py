@@ -4,37 +4,238 @@ This file creates the database and fills it with all the monsters.
 Like creating the entire Pokedex!
 """
 
-from sqlalchemy import create_engine
+import re
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker
-from models import Base, MonsterSpecies, Achievement
-from config import DATABASE_URL
+from sqlalchemy.pool import QueuePool, SingletonThreadPool
+from models import Base, MonsterSpecies, Achievement, Evolution, DatabaseStamp
+from config import (DATABASE_URL, DB_PROFILE, DB_PROFILES, DB_POOL_SIZE, DB_MAX_OVERFLOW,
+                    DB_POOL_TIMEOUT, DB_POOL_RECYCLE, SQLITE_POOL_SIZE, SQLITE_MAX_OVERFLOW)
+from game_data import invalidate_game_data
+from migrations import LATEST_VERSION, run_migrations
+
+# Bump this whenever the seed data below changes
+SEED_VERSION = 2
+
+
+def make_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE) -> Engine:
+    """Create an engine with the right pool settings and (for SQLite) the storage profile"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        # Server databases get an explicitly sized pool
+        return create_engine(
+            url,
+            echo=False,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+
+    if profile not in DB_PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE '{profile}', choose from: {', '.join(DB_PROFILES)}")
+    if parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory":
+        # Every :memory: connection is a new empty database, so each thread keeps exactly one
+        new_engine = create_engine(url, echo=False, poolclass=SingletonThreadPool)
+    else:
+        # Small fixed pool, so each connection's PRAGMAs are paid for once
+        new_engine = create_engine(
+            url,
+            echo=False,
+            poolclass=QueuePool,
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=SQLITE_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            connect_args={"check_same_thread": False},
+        )
+    apply_sqlite_profile(new_engine, DB_PROFILES[profile])
+    return new_engine
+
+
+def apply_sqlite_profile(sqlite_engine: Engine, pragmas: dict):
+    """Run the profile's PRAGMAs on every new SQLite connection"""
+    @event.listens_for(sqlite_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 
 # Create the database connection
-engine = create_engine(DATABASE_URL, echo=False)
+engine = make_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# SQL tracing (the --trace-sql option)
+# Numbers, quoted strings and IN (...) lists become "?", so the same query
+# with different values has the same fingerprint
+_FINGERPRINT_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?...)"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def fingerprint(statement: str) -> str:
+    """The statement with its values stripped out"""
+    for pattern, replacement in _FINGERPRINT_PATTERNS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+class SQLTrace:
+    """
+    What the engine ran while tracing: statement count, total and slowest
+    time, and how often each fingerprint came up. A SELECT fingerprint
+    that runs `repeat_threshold` times or more in one command is almost
+    always a lazy load inside a loop (an N+1).
+    """
+
+    def __init__(self, repeat_threshold: int = 5):
+        self.repeat_threshold = repeat_threshold
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.batched_rows = 0      # Parameter sets sent with executemany
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+        self.by_fingerprint: Dict[str, list] = {}   # fingerprint -> [count, seconds]
+
+    def record(self, statement: str, seconds: float, executemany: bool, rows: int):
+        self.statements += 1
+        self.batched_rows += rows if executemany else 0
+        self.total_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds, self.slowest_statement = seconds, statement
+        entry = self.by_fingerprint.setdefault(fingerprint(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def suspects(self) -> List[dict]:
+        """Repeated SELECTs, most repeated first"""
+        found = [{"statement": text, "count": count, "total_ms": round(seconds * 1000, 3)}
+                 for text, (count, seconds) in self.by_fingerprint.items()
+                 if count >= self.repeat_threshold and text.upper().startswith("SELECT")]
+        return sorted(found, key=lambda s: (-s["count"], -s["total_ms"]))
+
+    def summary(self, command: Optional[str] = None) -> dict:
+        """Everything recorded so far as a JSON-ready dict"""
+        return {
+            "command": command,
+            "statements": self.statements,
+            "distinct_statements": len(self.by_fingerprint),
+            "batched_rows": self.batched_rows,
+            "sql_ms": round(self.total_seconds * 1000, 3),
+            "wall_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "slowest_ms": round(self.slowest_seconds * 1000, 3),
+            "slowest_statement": fingerprint(self.slowest_statement) if self.slowest_statement else None,
+            "n_plus_one": self.suspects(),
+        }
+
+
+_active_traces: List[SQLTrace] = []
+
+
+def start_sql_trace(repeat_threshold: int = 5, target: Engine = None) -> SQLTrace:
+    """
+    Start a new trace of every statement `target` (the game's engine by
+    default) runs. Traces can overlap: the shell keeps one per command
+    inside the one for the whole session.
+    """
+    target = target or engine
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    trace = SQLTrace(repeat_threshold)
+    _active_traces.append(trace)
+    return trace
+
+
+def stop_sql_trace(trace: SQLTrace) -> SQLTrace:
+    """Stop recording into `trace` (the listeners stay, they're free with nothing to record into)"""
+    if trace in _active_traces:
+        _active_traces.remove(trace)
+    return trace
+
+
+def sql_tracing() -> bool:
+    """True while any trace is recording (--trace-sql is on)"""
+    return bool(_active_traces)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.trace_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "trace_started", None)
+    if _active_traces and started is not None:
+        seconds = time.perf_counter() - started
+        rows = len(parameters) if executemany else 1
+        for trace in _active_traces:
+            trace.record(statement, seconds, executemany, rows)
+
+
+def ensure_database():
+    """
+    Cheap startup check: read the stamp and only run init_database()
+    when the file is new or behind on schema or seed data.
+    """
+    try:
+        with engine.connect() as conn:
+            stamp = conn.execute(
+                select(DatabaseStamp.schema_version, DatabaseStamp.seed_version)
+            ).first()
+    except DBAPIError:
+        stamp = None   # No stamp table yet (new or old database file)
+    if stamp is None or tuple(stamp) != (LATEST_VERSION, SEED_VERSION):
+        init_database()
+
 def init_database():
     """Initialize database with tables and seed data - Partner A's main function!"""
     # Create all the tables
     Base.metadata.create_all(bind=engine)
+
+    # Upgrade older database files (new indexes etc.)
+    run_migrations(engine)
     
     db = SessionLocal()
     
     # Check if we already have monsters (don't create duplicates)
-    if db.query(MonsterSpecies).count() > 0:
-        db.close()
-        return
-    
-    # Create all the monsters! (Partner A's creative work)
-    _seed_monster_species(db)
-    
-    # Create all the achievements
-    _seed_achievements(db)
+    needs_seed = db.query(MonsterSpecies).count() == 0
+    if needs_seed:
+        # Create all the monsters! (Partner A's creative work)
+        _seed_monster_species(db)
+        
+        # Create all the achievements
+        _seed_achievements(db)
+
+    # Evolved forms and evolution steps (also added to files made before they existed)
+    if _seed_evolutions(db):
+        needs_seed = True
     
+    # Remember that this file is up to date, so the next startup can skip all this
+    db.merge(DatabaseStamp(id=1, schema_version=LATEST_VERSION, seed_version=SEED_VERSION))
+
     # Save everything
     db.commit()
     db.close()
 
+    if needs_seed:
+        # The seed data changed, so everything cached from it must be reloaded
+        invalidate_game_data()
+
 def _seed_monster_species(db):
     """
     Create all the monster species - Partner A's creative work!
@@ -301,6 +502,72 @@ def _seed_monster_species(db):
         species = MonsterSpecies(**data)
         db.add(species)
 
+# Evolved forms: never found in the wild (rarity "Evolved" has weight 0)
+EVOLVED_SPECIES = [
+    {
+        "name": "Flarelord",
+        "type": "Fire",
+        "base_hp": 65,
+        "base_attack": 80,
+        "base_defense": 60,
+        "base_speed": 70,
+        "rarity": "Evolved",
+        "catch_rate": 0.2,
+        "description": "Flamewyrm all grown up. Its wings leave trails of fire across the sky."
+    },
+    {
+        "name": "Aquarion",
+        "type": "Water",
+        "base_hp": 75,
+        "base_attack": 65,
+        "base_defense": 75,
+        "base_speed": 60,
+        "rarity": "Evolved",
+        "catch_rate": 0.2,
+        "description": "Aquafin's final form. It can call the tide in or send it out."
+    },
+    {
+        "name": "Vinetitan",
+        "type": "Grass",
+        "base_hp": 85,
+        "base_attack": 60,
+        "base_defense": 85,
+        "base_speed": 50,
+        "rarity": "Evolved",
+        "catch_rate": 0.2,
+        "description": "Vinewhip grown into a walking forest. Old trees bow when it passes."
+    },
+]
+
+# Which species evolve, at what level and into what (by name)
+EVOLUTIONS = [
+    {"species": "Flamewyrm", "level": 10, "evolves_to": "Flarelord"},
+    {"species": "Aquafin", "level": 10, "evolves_to": "Aquarion"},
+    {"species": "Vinewhip", "level": 10, "evolves_to": "Vinetitan"},
+    # Add more evolutions as needed (chains like A -> B -> C work too)
+]
+
+def _seed_evolutions(db) -> bool:
+    """Add any evolved species and evolution steps the database is missing, return True if it added some"""
+    db.flush()
+    species_ids = dict(db.query(MonsterSpecies.name, MonsterSpecies.id).all())
+    added = False
+    for data in EVOLVED_SPECIES:
+        if data["name"] not in species_ids:
+            species = MonsterSpecies(**data)
+            db.add(species)
+            db.flush()
+            species_ids[species.name] = species.id
+            added = True
+
+    existing = {species_id for (species_id,) in db.query(Evolution.species_id)}
+    for step in EVOLUTIONS:
+        source, target = species_ids.get(step["species"]), species_ids.get(step["evolves_to"])
+        if source and target and source not in existing:
+            db.add(Evolution(species_id=source, evolves_to_id=target, level=step["level"]))
+            added = True
+    return added
+
 def _seed_achievements(db):
     """Create all the achievements players can unlock"""
     achievements_data = [
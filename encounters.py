@@ -0,0 +1,95 @@
+"""
+Wild Encounter Table - Partner A's tall grass!
+Decides which monster jumps out when a trainer goes exploring.
+
+The table is built once from the cached species list (game_data.py) and
+RARITY_WEIGHTS as a Walker/Vose alias table, so every encounter after
+that is an O(1) draw with no trip to the database.
+"""
+
+import random
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from config import RARITY_WEIGHTS
+from game_data import GameData, SpeciesRecord, get_game_data
+
+
+class AliasTable:
+    """Walker/Vose alias table - pick a weighted index in O(1)"""
+    __slots__ = ("prob", "alias", "size")
+
+    def __init__(self, weights: Sequence[float]):
+        size = len(weights)
+        if size == 0:
+            raise ValueError("alias table needs at least one weight")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("alias table needs a positive total weight")
+
+        # Scale so the average column is exactly 1.0
+        scaled = [w * size / total for w in weights]
+        prob = [0.0] * size
+        alias = [0] * size
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            # The big column donates what the small one was missing
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left over is (up to rounding) a full column
+        for i in large + small:
+            prob[i] = 1.0
+            alias[i] = i
+
+        self.prob = prob
+        self.alias = alias
+        self.size = size
+
+    def sample(self, rng=random) -> int:
+        """Draw one index using a single random number"""
+        u = rng.random() * self.size
+        column = int(u)
+        if u - column < self.prob[column]:
+            return column
+        return self.alias[column]
+
+
+class EncounterTable:
+    """All encounterable species plus the alias table that picks between them"""
+    __slots__ = ("species", "table", "weights")
+
+    def __init__(self, species: List[SpeciesRecord], weights: Dict[str, int]):
+        # Species with no weight can never show up in the wild
+        self.species = [s for s in species if weights.get(s.rarity, 1) > 0]
+        self.weights = dict(weights)
+        self.table = AliasTable([weights.get(s.rarity, 1) for s in self.species])
+
+    def draw(self, rng=random) -> SpeciesRecord:
+        return self.species[self.table.sample(rng)]
+
+
+# Rebuilt whenever the game data is reloaded or the weights change
+_cached_data: Optional[GameData] = None
+_cached_table: Optional[EncounterTable] = None
+
+
+def get_encounter_table(db: Session) -> EncounterTable:
+    """Return the cached encounter table, building it only when it is stale"""
+    global _cached_data, _cached_table
+    game_data = get_game_data(db)
+    if (_cached_table is None or _cached_data is not game_data
+            or _cached_table.weights != RARITY_WEIGHTS):
+        _cached_table = EncounterTable(game_data.species, RARITY_WEIGHTS)
+        _cached_data = game_data
+    return _cached_table
@@ -0,0 +1,209 @@
+"""
+Static Game Data - Partner A's Pokedex, kept in memory!
+Species and achievements are seed data that never change while the game
+runs, so they are loaded once per process into small read-only records
+(looked up by id or by name) instead of being queried over and over.
+Each species also gets a precomputed stat curve, so working out a
+monster's stats at any level is a table lookup, and its whole evolution
+chain, so finding the form a monster should be at any level is too.
+
+Call invalidate_game_data() after changing the seed data, and the next
+get_game_data() call loads it fresh.
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models import MonsterSpecies, Achievement, Evolution
+from config import MAX_LEVEL, STAT_GROWTH_PER_LEVEL
+from type_chart import type_id
+
+
+class SpeciesRecord(NamedTuple):
+    """Read-only copy of a MonsterSpecies row (safe to keep between sessions)"""
+    id: int
+    name: str
+    type: str
+    base_hp: int
+    base_attack: int
+    base_defense: int
+    base_speed: int
+    rarity: str
+    description: str
+    catch_rate: float
+    type_id: int
+
+    @classmethod
+    def from_model(cls, species: MonsterSpecies) -> "SpeciesRecord":
+        return cls(
+            id=species.id,
+            name=species.name,
+            type=species.type,
+            base_hp=species.base_hp,
+            base_attack=species.base_attack,
+            base_defense=species.base_defense,
+            base_speed=species.base_speed,
+            rarity=species.rarity,
+            description=species.description,
+            catch_rate=species.catch_rate,
+            type_id=type_id(species.type),
+        )
+
+
+class AchievementRecord(NamedTuple):
+    """Read-only copy of an Achievement row"""
+    id: int
+    name: str
+    description: str
+    requirement_type: str
+    requirement_value: int
+    reward_money: int
+
+    @classmethod
+    def from_model(cls, achievement: Achievement) -> "AchievementRecord":
+        return cls(
+            id=achievement.id,
+            name=achievement.name,
+            description=achievement.description,
+            requirement_type=achievement.requirement_type,
+            requirement_value=achievement.requirement_value,
+            reward_money=achievement.reward_money or 0,
+        )
+
+
+class Stats(NamedTuple):
+    """A monster's stats at one level"""
+    hp: int
+    attack: int
+    defense: int
+    speed: int
+
+
+class StatCurve:
+    """
+    One species' stats at every level from 1 to max_level, packed into a
+    single int array (hp, attack, defense, speed for level 1, then level 2...).
+    Each stat is base * (1 + (level - 1) * STAT_GROWTH_PER_LEVEL).
+    """
+    __slots__ = ("base", "growth", "max_level", "values")
+
+    def __init__(self, species: SpeciesRecord, max_level: int = MAX_LEVEL,
+                 growth: float = STAT_GROWTH_PER_LEVEL):
+        self.base = (species.base_hp, species.base_attack, species.base_defense, species.base_speed)
+        self.growth = growth
+        self.max_level = max_level
+        self.values = array("i")
+        for level in range(1, max_level + 1):
+            self.values.extend(self._compute(level))
+
+    def _compute(self, level: int) -> Stats:
+        level_multiplier = 1 + (level - 1) * self.growth
+        return Stats(*(int(stat * level_multiplier) for stat in self.base))
+
+    def at(self, level: int) -> Stats:
+        """Stats at `level` (a table lookup, worked out on the spot past max_level)"""
+        if 1 <= level <= self.max_level:
+            start = (level - 1) * 4
+            return Stats(*self.values[start:start + 4])
+        return self._compute(level)
+
+
+class EvolutionRecord(NamedTuple):
+    """One evolution step: species_id turns into evolves_to_id at `level`"""
+    species_id: int
+    level: int
+    evolves_to_id: int
+
+
+class EvolutionChain(NamedTuple):
+    """
+    Every form after a species, in order. thresholds[i] is the level that
+    reaches forms[i]; a later step never needs a lower level than the one
+    before it, because a monster can't skip a stage.
+    """
+    thresholds: List[int]
+    forms: List[int]
+
+
+class EvolutionIndex:
+    """Evolution steps by species id, with each species' full chain worked out up front"""
+
+    def __init__(self, records: List[EvolutionRecord]):
+        self.by_species_id: Dict[int, EvolutionRecord] = {r.species_id: r for r in records}
+        self.chains: Dict[int, EvolutionChain] = {}
+        for species_id in self.by_species_id:
+            thresholds, forms, seen = [], [], {species_id}
+            step = self.by_species_id.get(species_id)
+            while step and step.evolves_to_id not in seen:   # stop on a loop in bad data
+                thresholds.append(max(step.level, thresholds[-1] if thresholds else step.level))
+                forms.append(step.evolves_to_id)
+                seen.add(step.evolves_to_id)
+                step = self.by_species_id.get(step.evolves_to_id)
+            self.chains[species_id] = EvolutionChain(thresholds, forms)
+
+    def final_form(self, species_id: int, level: int) -> Optional[int]:
+        """The furthest form a species reaches by `level` (None if it doesn't evolve yet)"""
+        chain = self.chains.get(species_id)
+        if not chain:
+            return None
+        stage = bisect_right(chain.thresholds, level)
+        return chain.forms[stage - 1] if stage else None
+
+    def path(self, species_id: int, level: int) -> Tuple[int, ...]:
+        """Every form passed through on the way to final_form, in order"""
+        chain = self.chains.get(species_id)
+        if not chain:
+            return ()
+        return tuple(chain.forms[:bisect_right(chain.thresholds, level)])
+
+
+class GameData:
+    """Everything static about the game, indexed by id and by name"""
+
+    def __init__(self, species: List[SpeciesRecord], achievements: List[AchievementRecord],
+                 evolutions: List[EvolutionRecord] = ()):
+        self.species = species
+        self.species_by_id: Dict[int, SpeciesRecord] = {s.id: s for s in species}
+        self.species_by_name: Dict[str, SpeciesRecord] = {s.name: s for s in species}
+        self.stat_curves: Dict[int, StatCurve] = {s.id: StatCurve(s) for s in species}
+
+        self.achievements = achievements
+        self.achievements_by_id: Dict[int, AchievementRecord] = {a.id: a for a in achievements}
+        self.achievements_by_name: Dict[str, AchievementRecord] = {a.name: a for a in achievements}
+
+        # Evolutions whose species (or target) isn't in the Pokedex are skipped
+        self.evolutions = EvolutionIndex([e for e in evolutions
+                                          if e.species_id in self.species_by_id
+                                          and e.evolves_to_id in self.species_by_id])
+        self.evolutions_by_species_id = self.evolutions.by_species_id
+
+    @classmethod
+    def load(cls, db: Session) -> "GameData":
+        species = [SpeciesRecord.from_model(s)
+                   for s in db.query(MonsterSpecies).order_by(MonsterSpecies.id).all()]
+        achievements = [AchievementRecord.from_model(a)
+                        for a in db.query(Achievement).order_by(Achievement.id).all()]
+        evolutions = [EvolutionRecord(species_id, level, evolves_to_id)
+                      for species_id, level, evolves_to_id in db.query(
+                          Evolution.species_id, Evolution.level, Evolution.evolves_to_id).order_by(Evolution.id)]
+        return cls(species, achievements, evolutions)
+
+
+_cached: Optional[GameData] = None
+
+
+def invalidate_game_data():
+    """Forget the cached seed data - call this after changing species, achievements or evolutions"""
+    global _cached
+    _cached = None
+
+
+def get_game_data(db: Session) -> GameData:
+    """Return the cached game data, loading it with `db` the first time"""
+    global _cached
+    if _cached is None:
+        _cached = GameData.load(db)
+    return _cached
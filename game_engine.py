@@ -1,16 +1,138 @@
 import random
 import json
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional,Tuple
-from sqlalchemy.orm import Session
-from models import Player, MonsterSpecies, PlayerMonster, Battle, Trade, Achievement, PlayerAchievement
-from config import TYPE_EFFECTIVENESS, RARITY_WEIGHTS, BASE_CATCH_RATE_BONUS, BATTLE_EXP_MULTIPLIER, BATTLE_MONEY_MULTIPLIER
+from typing import List, Dict, NamedTuple, Optional,Tuple
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.util import identity_key
+from models import (Player, PlayerMonster, Battle, Trade, PlayerAchievement,
+                    PlayerCounter, LeaderboardEntry, regenerated_hp)
+from config import (BASE_CATCH_RATE_BONUS, BATTLE_EXP_MULTIPLIER, BATTLE_MONEY_MULTIPLIER,
+                    EXP_PER_LEVEL, PLAYER_EXP_PER_LEVEL, HEAL_COST)
 
 from database import SessionLocal
+from game_data import AchievementRecord, GameData, SpeciesRecord, get_game_data
+from encounters import get_encounter_table
+from type_chart import EFFECTIVENESS, type_id
+from achievements import get_achievement_index
+from leveling import level_for_experience
+from battle_codec import pack_pvp, pack_wild
+
+# Bulk updates look rows up this many ids at a time
+ID_CHUNK = 500
+
+# Columns the collection can be sorted by ("-level" sorts high to low)
+COLLECTION_SORTS = {
+    "id": PlayerMonster.id,
+    "level": PlayerMonster.level,
+    "hp": PlayerMonster.hp,
+    "attack": PlayerMonster.attack,
+    "defense": PlayerMonster.defense,
+    "speed": PlayerMonster.speed,
+}
+
+# HP filters, given the current HP expression ("healthy" is the same 10% rule battles use)
+HP_STATUSES = {
+    "full": lambda hp: hp >= PlayerMonster.max_hp,
+    "injured": lambda hp: hp < PlayerMonster.max_hp,
+    "healthy": lambda hp: hp > PlayerMonster.max_hp * 0.1,
+    "fainted": lambda hp: hp <= PlayerMonster.max_hp * 0.1,
+}
+
+
+class CollectionPage(NamedTuple):
+    """One page of a player's monsters and the cursor for the next one (None on the last page)"""
+    monsters: List[PlayerMonster]
+    next_cursor: Optional[str]
+
+
+class EvolutionEvent(NamedTuple):
+    """A monster evolved (straight to its final form if it crossed several thresholds at once)"""
+    monster_id: int
+    player_id: int
+    from_species: str
+    to_species: str
+    level: int
+
+
+class Combatant:
+    """
+    One monster's battle state for PvP: plain numbers only, no ORM, so a
+    battle is cheap to run and can be rebuilt from a saved snapshot.
+    """
+    __slots__ = ("monster_id", "player_id", "species_id", "type_id", "name",
+                 "level", "hp", "max_hp", "attack", "defense", "speed")
+
+    def __init__(self, monster_id: int, player_id: int, species_id: int, type_id: int, name: str,
+                 level: int, hp: int, max_hp: int, attack: int, defense: int, speed: int):
+        self.monster_id = monster_id
+        self.player_id = player_id
+        self.species_id = species_id
+        self.type_id = type_id
+        self.name = name
+        self.level = level
+        self.hp = hp
+        self.max_hp = max_hp
+        self.attack = attack
+        self.defense = defense
+        self.speed = speed
+
+    @classmethod
+    def from_monster(cls, monster: PlayerMonster, species: SpeciesRecord) -> "Combatant":
+        return cls(monster.id, monster.player_id, species.id, species.type_id, species.name,
+                   monster.level, monster.current_hp, monster.max_hp,
+                   monster.attack, monster.defense, monster.speed)
+
+    def snapshot(self) -> list:
+        """Every field in order; Combatant(*snapshot) rebuilds it"""
+        return [getattr(self, name) for name in self.__slots__]
+
+    def get(self, key: str, default=None):
+        # Lets a Combatant stand in for the defender_stats dict calculate_damage takes
+        return getattr(self, key, default)
+
+
 class GameEngine:
     def __init__(self):
         self.db: Session = SessionLocal()
         self.current_player: Optional[Player] = None
+        self._transaction_depth = 0
+        # Achievements unlocked by events, waiting for check_achievements to hand them out
+        self._pending_achievements: Dict[int, List[AchievementRecord]] = {}
+        # Evolutions waiting for pop_evolution_events (battles take their own)
+        self._pending_evolutions: List[EvolutionEvent] = []
+
+    @property
+    def game_data(self) -> GameData:
+        """Cached species/achievement/evolution data (loaded once per process)"""
+        return get_game_data(self.db)
+
+    @contextmanager
+    def transaction(self):
+        """Unit of work: everything done inside the block is saved in ONE commit"""
+        self._transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.db.rollback()
+                # Unlocks and evolutions from the rolled back work never happened
+                self._pending_achievements.clear()
+                self._pending_evolutions.clear()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.db.commit()
+
+    def _commit(self):
+        """Commit now, or only flush when we're inside a transaction() block"""
+        if self._transaction_depth:
+            self.db.flush()
+        else:
+            self.db.commit()
 
      ##player management##
     def __delattr__(self):
@@ -21,8 +143,9 @@ class GameEngine:
 
         player=Player(username=username)
         self.db.add(player)
-        self.db.commit()
-        self.db.refresh(player)
+        self.db.flush()
+        self.db.add(PlayerCounter(player_id=player.id, catch_count=0, battle_wins=0))
+        self._commit()
      #give a starter a monster
         self.give_starter_monster(player.id)
         return player
@@ -34,52 +157,113 @@ class GameEngine:
         return player
     def give_starter_monster(self, player_id: int) -> PlayerMonster:
         ##give player their first monster##
-        starter_species = self.db.query(MonsterSpecies).filter(MonsterSpecies.name.in_(["Flamewyrn", "Aquafin", "Vinewhip"])).all() 
+        species_by_name = self.game_data.species_by_name
+        starter_species = [species_by_name[name] for name in ["Flamewyrm", "Aquafin", "Vinewhip"] if name in species_by_name]
         if starter_species:
             chosen=random.choice(starter_species)
             self.create_player_monster(player_id, chosen.id, level=5,)
 
             # monster managment
     def create_player_monster(self, player_id: int, species_id: int, level: int =  1) -> PlayerMonster:
-        species= self.db.query(MonsterSpecies).filter(MonsterSpecies.id == species_id).first()
+        species = self.game_data.species_by_id.get(species_id)
         if not species:
-            raise None
-        level_multiplier = 1 + (level - 1) * 0.1
-        max_hp = int(species.base_hp * level_multiplier)
-        attack= int(species.base_attack * level_multiplier)
-        defense = int(species.base_defense * level_multiplier)
-        speed = int(species.base_speed * level_multiplier)
+            raise ValueError(f"Unknown species id: {species_id}")
+        stats = self.game_data.stat_curves[species_id].at(level)
         monster = PlayerMonster(
             player_id=player_id,
             species_id=species_id,
             level=level,
-            max_hp=max_hp,
-            attack=attack,
-            defense=defense,
-            speed=speed,
+            max_hp=stats.hp,
+            attack=stats.attack,
+            defense=stats.defense,
+            speed=stats.speed,
             experience=0,
-            hp=max_hp,  # Initialize current HP to max HP
+            hp=stats.hp,  # Initialize current HP to max HP
         )
+        self._bump_counter(player_id, "catch_count")
         self.db.add(monster)
-        self.db.commit()
-        self.db.refresh(monster)
+        self._commit()
         return monster
-    def encounter_wild_monster(self) -> MonsterSpecies:
-        #encounter a wild monster
-        all_species = self.db.query(MonsterSpecies).all()
-        weigheted_species = []
-        for species in all_species:
-            weight = RARITY_WEIGHTS.get(species.rarity, 1)
-            weigheted_species.extend([species] * weight)
-        return random.choice(weigheted_species)
+    def get_collection(self, player_id: int, limit: int = 20, cursor: Optional[str] = None,
+                       sort: str = "id", species: Optional[str] = None, type: Optional[str] = None,
+                       rarity: Optional[str] = None, min_level: Optional[int] = None,
+                       max_level: Optional[int] = None, hp_status: Optional[str] = None) -> CollectionPage:
+        """
+        One page of a player's monsters, filtered and sorted by the database.
+        Pages are keyset based: the cursor holds the sort value and id of the
+        last monster shown, so page 500 is as cheap as page 1.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        sort_key = sort.lstrip("-")
+        column = COLLECTION_SORTS.get(sort_key)
+        if column is None:
+            raise ValueError(f"Unknown sort '{sort}' (choose from {', '.join(COLLECTION_SORTS)})")
+        descending = sort.startswith("-")
+
+        query = self.db.query(PlayerMonster).options(joinedload(PlayerMonster.species)) \
+            .filter(PlayerMonster.player_id == player_id)
+
+        # Species, type and rarity come from the cached Pokedex, so they filter on species_id
+        if species or type or rarity:
+            species_ids = [s.id for s in self.game_data.species
+                           if (not species or s.name.lower() == species.lower())
+                           and (not type or s.type.lower() == type.lower())
+                           and (not rarity or s.rarity.lower() == rarity.lower())]
+            query = query.filter(PlayerMonster.species_id.in_(species_ids))
+        if min_level is not None:
+            query = query.filter(PlayerMonster.level >= min_level)
+        if max_level is not None:
+            query = query.filter(PlayerMonster.level <= max_level)
+        if hp_status:
+            if hp_status not in HP_STATUSES:
+                raise ValueError(f"Unknown HP status '{hp_status}' (choose from {', '.join(HP_STATUSES)})")
+            query = query.filter(HP_STATUSES[hp_status](PlayerMonster.current_hp_expr()))
+
+        # Ties on the sort column are broken by id, in the same direction
+        after = (lambda a, b: a < b) if descending else (lambda a, b: a > b)
+        if cursor:
+            value, last_id = self._decode_cursor(cursor, sort)
+            if sort_key == "id":
+                query = query.filter(after(PlayerMonster.id, last_id))
+            else:
+                query = query.filter(or_(after(column, value),
+                                         and_(column == value, after(PlayerMonster.id, last_id))))
+        order = [column, PlayerMonster.id] if sort_key != "id" else [PlayerMonster.id]
+        query = query.order_by(*(c.desc() if descending else c for c in order))
+
+        # One extra row tells us whether there is another page
+        monsters = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(monsters) > limit:
+            monsters = monsters[:limit]
+            last = monsters[-1]
+            next_cursor = f"{sort}:{getattr(last, sort_key)}:{last.id}"
+        return CollectionPage(monsters, next_cursor)
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: str) -> Tuple[int, int]:
+        """Split a cursor from get_collection back into (sort value, monster id)"""
+        try:
+            cursor_sort, value, last_id = cursor.rsplit(":", 2)
+            value, last_id = int(value), int(last_id)
+        except ValueError:
+            raise ValueError(f"Bad page cursor '{cursor}'") from None
+        if cursor_sort != sort:
+            raise ValueError(f"Page cursor '{cursor}' belongs to sort '{cursor_sort}', not '{sort}'")
+        return value, last_id
+
+    def encounter_wild_monster(self) -> SpeciesRecord:
+        #encounter a wild monster (O(1) draw from the cached alias table)
+        return get_encounter_table(self.db).draw()
     
     def attempt_catch(self, player_id: int, species) -> bool:
         """Attempt to catch a wild monster"""
-        player = self.db.query(Player).filter(Player.id == player_id).first()
+        player = self.db.get(Player, player_id)
         
-        # If species is an int (species id), fetch the MonsterSpecies object
+        # If species is an int (species id), look it up in the game data cache
         if isinstance(species, int):
-            species = self.db.query(MonsterSpecies).filter(MonsterSpecies.id == species).first()
+            species = self.game_data.species_by_id.get(species)
             if not species:
                 return False
         
@@ -95,15 +279,15 @@ class GameEngine:
             wild_level = max(1, player.level + random.randint(-2, 3))
             self.create_player_monster(player_id, species.id, wild_level)
             
-            # Award experience and check achievements
+            # Award experience (the catch itself already counted towards achievements)
             self.award_experience(player_id, 50)
-            self.check_achievements(player_id)
         
         return success
     
     # Battle System
-    def calculate_damage(self, attacker: PlayerMonster, defender_stats: Dict, move_power: int = 40) -> int:
-        """Calculate battle damage"""
+    def calculate_damage(self, attacker: PlayerMonster, defender_stats: Dict, move_power: int = 40,
+                         rng: Optional[random.Random] = None) -> int:
+        """Calculate battle damage (pass `rng` to make the random factor replayable)"""
         # Base damage calculation
         attack_stat = attacker.attack
         defense_stat = defender_stats.get('defense', 30)
@@ -111,13 +295,17 @@ class GameEngine:
         
         base_damage = ((2 * attacker.level + 10) / 250.0) * (attack_stat / defense_stat) * move_power + 2
         
-        # Type effectiveness
-        attacker_type = attacker.species.type
-        defender_type = defender_stats.get('type', 'Normal')
-        effectiveness = TYPE_EFFECTIVENESS.get(attacker_type, {}).get(defender_type, 1.0)
+        # Type effectiveness (one lookup in the compiled type chart)
+        attacker_type = getattr(attacker, 'type_id', None)
+        if attacker_type is None:
+            attacker_type = self.game_data.species_by_id[attacker.species_id].type_id
+        defender_type = defender_stats.get('type_id')
+        if defender_type is None:
+            defender_type = type_id(defender_stats.get('type', 'Normal'))
+        effectiveness = EFFECTIVENESS[attacker_type][defender_type]
         
         # Random factor
-        random_factor = random.uniform(0.85, 1.0)
+        random_factor = (rng or random).uniform(0.85, 1.0)
         
         final_damage = int(base_damage * effectiveness * random_factor * level_factor)
         return max(1, final_damage)
@@ -128,22 +316,24 @@ class GameEngine:
         wild_level = max(1, player_monster.level + random.randint(-2, 2))
         
         # Create temporary wild monster stats
-        level_multiplier = 1 + (wild_level - 1) * 0.1
+        stats = self.game_data.stat_curves[wild_species.id].at(wild_level)
         wild_stats = {
             'name': wild_species.name,
             'type': wild_species.type,
+            'type_id': wild_species.type_id,
             'level': wild_level,
-            'hp': int(wild_species.base_hp * level_multiplier),
-            'max_hp': int(wild_species.base_hp * level_multiplier),
-            'attack': int(wild_species.base_attack * level_multiplier),
-            'defense': int(wild_species.base_defense * level_multiplier),
-            'speed': int(wild_species.base_speed * level_multiplier),
+            'hp': stats.hp,
+            'max_hp': stats.hp,
+            'attack': stats.attack,
+            'defense': stats.defense,
+            'speed': stats.speed,
         }
         
+        player_species = self.game_data.species_by_id[player_monster.species_id]
         battle_log = []
         battle_log.append(f"A wild {wild_species.name} (Level {wild_level}) appears!")
         
-        player_hp = player_monster.hp
+        player_hp = player_monster.current_hp   # includes any passive healing
         wild_hp = wild_stats['hp']
         
         turn = 1
@@ -155,7 +345,7 @@ class GameEngine:
                 # Player goes first
                 damage = self.calculate_damage(player_monster, wild_stats)
                 wild_hp -= damage
-                battle_log.append(f"{player_monster.species.name} attacks for {damage} damage!")
+                battle_log.append(f"{player_species.name} attacks for {damage} damage!")
                 
                 if wild_hp > 0:
                     # Wild monster counter-attacks
@@ -171,9 +361,9 @@ class GameEngine:
                 if player_hp > 0:
                     damage = self.calculate_damage(player_monster, wild_stats)
                     wild_hp -= damage
-                    battle_log.append(f"{player_monster.species.name} attacks for {damage} damage!")
+                    battle_log.append(f"{player_species.name} attacks for {damage} damage!")
             
-            battle_log.append(f"{player_monster.species.name} HP: {max(0, player_hp)}/{player_monster.max_hp}")
+            battle_log.append(f"{player_species.name} HP: {max(0, player_hp)}/{player_monster.max_hp}")
             battle_log.append(f"Wild {wild_species.name} HP: {max(0, wild_hp)}/{wild_stats['max_hp']}")
             
             turn += 1
@@ -185,6 +375,7 @@ class GameEngine:
         
         # Determine winner and rewards
         won = player_hp > 0 and wild_hp <= 0
+        evolutions: List[EvolutionEvent] = []
         
         if won:
             exp_gained = wild_level * BATTLE_EXP_MULTIPLIER + random.randint(10, 30)
@@ -200,33 +391,150 @@ class GameEngine:
             
             # Check for level up
             if self.check_monster_level_up(player_monster):
-                battle_log.append(f"🆙 {player_monster.species.name} leveled up to {player_monster.level}!")
+                battle_log.append(f"🆙 {player_species.name} leveled up to {player_monster.level}!")
+            evolutions = self.pop_evolution_events(player_monster.id)
+            for event in evolutions:
+                battle_log.append(f"✨ {event.from_species} evolved into {event.to_species}!")
             
             # Update monster HP
             player_monster.hp = max(1, player_hp)
             
             # Record battle
             self.record_battle(player_monster.player_id, None, player_monster.player_id, "wild", 
-                             exp_gained, money_gained, json.dumps(wild_stats))
+                             exp_gained, money_gained, pack_wild(wild_stats, wild_species.id))
         else:
-            battle_log.append(f"\n💔 Defeat! {player_monster.species.name} was defeated!")
+            battle_log.append(f"\n💔 Defeat! {player_species.name} was defeated!")
             player_monster.hp = 1  # Don't let monsters faint completely
             
             # Record battle
-            self.record_battle(player_monster.player_id, None, None, "wild", 0, 0, json.dumps(wild_stats))
+            self.record_battle(player_monster.player_id, None, None, "wild", 0, 0,
+                               pack_wild(wild_stats, wild_species.id))
         
-        self.db.commit()
+        self._commit()
         
         return {
             'won': won,
             'battle_log': battle_log,
             'wild_monster': wild_stats,
+            'evolutions': evolutions,
             'can_catch': won and random.random() < 0.3  # 30% chance to catch after winning
         }
     
+    # Player vs Player
+    def pvp_battle(self, monster1: PlayerMonster, monster2: PlayerMonster, seed: Optional[int] = None) -> Dict:
+        """
+        Fight two players' monsters and record it. Every random roll comes
+        from one seeded generator, so the Battle row only keeps the seed and
+        both starting snapshots and replay_pvp_battle can re-run it exactly.
+        """
+        if monster1.player_id == monster2.player_id:
+            raise ValueError("A trainer can't battle themselves")
+        if seed is None:
+            seed = random.getrandbits(32)
+        species = self.game_data.species_by_id
+        fighters = [Combatant.from_monster(monster1, species[monster1.species_id]),
+                    Combatant.from_monster(monster2, species[monster2.species_id])]
+        battle_data = pack_pvp(seed, fighters)
+        winner, turns, battle_log = self.resolve_pvp(fighters[0], fighters[1], seed)
+
+        exp_gained = money_gained = 0
+        evolutions: List[EvolutionEvent] = []
+        if winner is not None:
+            loser = fighters[1] if winner is fighters[0] else fighters[0]
+            winner_monster = monster1 if winner is fighters[0] else monster2
+            exp_gained = loser.level * BATTLE_EXP_MULTIPLIER
+            money_gained = loser.level * BATTLE_MONEY_MULTIPLIER
+            battle_log.append(f"Gained {exp_gained} experience and ${money_gained}!")
+            winner_monster.experience += exp_gained
+            self.award_experience(winner.player_id, exp_gained // 2)
+            self.award_money(winner.player_id, money_gained)
+            if self.check_monster_level_up(winner_monster):
+                battle_log.append(f"🆙 {winner.name} leveled up to {winner_monster.level}!")
+            evolutions = self.pop_evolution_events(winner_monster.id)
+            for event in evolutions:
+                battle_log.append(f"✨ {event.from_species} evolved into {event.to_species}!")
+
+        # Nobody faints completely
+        monster1.hp = max(1, fighters[0].hp)
+        monster2.hp = max(1, fighters[1].hp)
+        battle = self.record_battle(monster1.player_id, monster2.player_id,
+                                    winner.player_id if winner else None, "player",
+                                    exp_gained, money_gained, battle_data)
+        self._commit()
+        return {
+            'battle_id': battle.id,
+            'seed': seed,
+            'winner_id': winner.player_id if winner else None,
+            'turns': turns,
+            'battle_log': battle_log,
+            'evolutions': evolutions,
+            'can_catch': False,
+        }
+
+    def replay_pvp_battle(self, battle_id: int) -> Dict:
+        """Re-run a recorded PvP battle from its seed and snapshots (the log comes out identical)"""
+        battle = self.db.get(Battle, battle_id)
+        if battle is None or battle.battle_type != "player":
+            raise ValueError(f"No PvP battle with id {battle_id}")
+        data = battle.data
+        first, second = (self._combatant_from_record(c) for c in data["combatants"])
+        winner, turns, battle_log = self.resolve_pvp(first, second, data["seed"])
+        return {
+            'battle_id': battle.id,
+            'seed': data["seed"],
+            'winner_id': winner.player_id if winner else None,
+            'turns': turns,
+            'battle_log': battle_log,
+            'matches_record': (winner.player_id if winner else None) == battle.winner_id,
+        }
+
+    def _combatant_from_record(self, record) -> Combatant:
+        """Combatant from a stored snapshot: a packed-record dict, or a field list from older JSON rows"""
+        if isinstance(record, list):
+            return Combatant(*record)
+        species = self.game_data.species_by_id[record["species_id"]]
+        return Combatant(record["monster_id"], record["player_id"], species.id, species.type_id, species.name,
+                         record["level"], record["hp"], record["max_hp"],
+                         record["attack"], record["defense"], record["speed"])
+
+    def resolve_pvp(self, first: Combatant, second: Combatant, seed: int,
+                    max_turns: int = 20, log: bool = True) -> Tuple[Optional[Combatant], int, List[str]]:
+        """
+        Turn loop shared by pvp_battle, replays and tournaments: (winner or
+        None for a draw, turns, log). Only touches the two Combatants, never
+        the database, so it also runs in worker processes.
+        """
+        rng = random.Random(seed)
+        battle_log = [f"{first.name} (Lv {first.level}) vs {second.name} (Lv {second.level})!"] if log else []
+        # The faster monster attacks first every turn (monster 1 on a tie)
+        order = (first, second) if first.speed >= second.speed else (second, first)
+        turn = 0
+        while first.hp > 0 and second.hp > 0 and turn < max_turns:
+            turn += 1
+            if log:
+                battle_log.append(f"\n--- Turn {turn} ---")
+            for attacker, defender in (order, order[::-1]):
+                damage = self.calculate_damage(attacker, defender, rng=rng)
+                defender.hp = max(0, defender.hp - damage)
+                if log:
+                    battle_log.append(f"{attacker.name} attacks for {damage} damage!")
+                if defender.hp == 0:
+                    break
+            if log:
+                battle_log.append(f"{first.name} HP: {first.hp}/{first.max_hp}")
+                battle_log.append(f"{second.name} HP: {second.hp}/{second.max_hp}")
+
+        winner = first if second.hp == 0 else second if first.hp == 0 else None
+        if log:
+            if winner:
+                battle_log.append(f"\n🏆 {winner.name} wins the battle!")
+            else:
+                battle_log.append("\nThe battle lasted too long and ended in a draw!")
+        return winner, turn, battle_log
+
     def record_battle(self, player1_id: int, player2_id: Optional[int], winner_id: Optional[int], 
-                     battle_type: str, exp_gained: int, money_gained: int, battle_data: str):
-        """Record battle in database"""
+                     battle_type: str, exp_gained: int, money_gained: int, battle_data) -> Battle:
+        """Record battle in database (battle_data: bytes from battle_codec, or old-style JSON text)"""
         battle = Battle(
             player1_id=player1_id,
             player2_id=player2_id,
@@ -234,159 +542,402 @@ class GameEngine:
             battle_type=battle_type,
             experience_gained=exp_gained,
             money_gained=money_gained,
-            battle_data=battle_data
+            battle_blob=battle_data if isinstance(battle_data, bytes) else None,
+            battle_data=battle_data if isinstance(battle_data, str) else None,
         )
+        if winner_id is not None:
+            self._bump_counter(winner_id, "battle_wins")
         self.db.add(battle)
-        self.db.commit()
+        self._commit()
+        return battle
     
     # Progression System
     def check_monster_level_up(self, monster: PlayerMonster) -> bool:
-        """Check if monster should level up"""
-        exp_needed = monster.level * 100
-        
-        if monster.experience >= exp_needed:
-            monster.level += 1
-            monster.experience -= exp_needed
-            
-            # Increase stats
-            stat_increase = random.randint(2, 5)
-            monster.max_hp += stat_increase
-            monster.hp += stat_increase  # Heal when leveling up
-            monster.attack += random.randint(1, 3)
-            monster.defense += random.randint(1, 3)
-            monster.speed += random.randint(1, 3)
-            
-            # Check for evolution after level up
-            self.check_monster_evolution(monster)
-            
-            return True
-        return False
-
-    def check_monster_evolution(self, monster: PlayerMonster):
-        """Check if the monster can evolve at its current level"""
-        # Define evolution levels and evolved species mapping
-        evolution_map = {
-            "Flamewyrm": {"level": 10, "evolves_to": "Flarelord"},
-            "Aquafin": {"level": 10, "evolves_to": "Aquarion"},
-            "Vinewhip": {"level": 10, "evolves_to": "Vinetitan"},
-            # Add more species evolutions as needed
-        }
-        species_name = monster.species.name
-        if species_name in evolution_map:
-            evo_info = evolution_map[species_name]
-            if monster.level >= evo_info["level"]:
-                # Evolve monster
-                new_species = self.db.query(MonsterSpecies).filter(MonsterSpecies.name == evo_info["evolves_to"]).first()
-                if new_species:
-                    monster.species_id = new_species.id
-                    monster.species = new_species
-                    # Update stats to new species base stats scaled by level
-                    level_multiplier = 1 + (monster.level - 1) * 0.1
-                    monster.max_hp = int(new_species.base_hp * level_multiplier)
-                    monster.hp = monster.max_hp
-                    monster.attack = int(new_species.base_attack * level_multiplier)
-                    monster.defense = int(new_species.base_defense * level_multiplier)
-                    monster.speed = int(new_species.base_speed * level_multiplier)
-                    self.db.commit()
-                    print(f"{species_name} evolved into {new_species.name}!")
+        """Level the monster up as many times as its experience pays for"""
+        new_level, experience = level_for_experience(monster.level, monster.experience, EXP_PER_LEVEL)
+        if new_level == monster.level:
+            return False
+        gains = self._roll_level_up_gains(new_level - monster.level)
+        monster.level = new_level
+        monster.experience = experience
+
+        # Increase stats (and heal by the HP gained, on top of the passive healing so far,
+        # since setting hp restarts the healing clock)
+        hp = monster.current_hp
+        monster.max_hp += gains[0]
+        monster.hp = min(hp + gains[0], monster.max_hp)
+        monster.attack += gains[1]
+        monster.defense += gains[2]
+        monster.speed += gains[3]
+
+        # Check for evolution after level up
+        self.check_monster_evolution(monster)
+        return True
+
+    @staticmethod
+    def _roll_level_up_gains(levels: int) -> Tuple[int, int, int, int]:
+        """Random stat growth for `levels` level ups: +2-5 HP and +1-3 attack/defense/speed each"""
+        hp = sum(random.randint(2, 5) for _ in range(levels))
+        attack, defense, speed = (sum(random.randint(1, 3) for _ in range(levels)) for _ in range(3))
+        return hp, attack, defense, speed
+
+    def _evolution_for(self, species_id: int, level: int) -> Optional[SpeciesRecord]:
+        """The furthest form this species reaches by `level`, if it evolves at all"""
+        final_form = self.game_data.evolutions.final_form(species_id, level)
+        return self.game_data.species_by_id[final_form] if final_form else None
+
+    def check_monster_evolution(self, monster: PlayerMonster) -> Optional[EvolutionEvent]:
+        """Evolve the monster if its level is high enough (saved with the caller's commit)"""
+        # Chains come precomputed from the game data cache, so A -> B -> C is one step
+        new_species = self._evolution_for(monster.species_id, monster.level)
+        if not new_species:
+            return None
+        event = EvolutionEvent(monster.id, monster.player_id,
+                               self.game_data.species_by_id[monster.species_id].name,
+                               new_species.name, monster.level)
+        monster.species_id = new_species.id
+        # The species relationship reloads from the new id when next used
+        self.db.expire(monster, ["species"])
+        # Update stats to new species base stats scaled by level
+        stats = self.game_data.stat_curves[new_species.id].at(monster.level)
+        monster.max_hp = stats.hp
+        monster.hp = monster.max_hp
+        monster.attack = stats.attack
+        monster.defense = stats.defense
+        monster.speed = stats.speed
+        self._pending_evolutions.append(event)
+        return event
+
+    def pop_evolution_events(self, monster_id: Optional[int] = None) -> List[EvolutionEvent]:
+        """Hand out (and forget) the evolutions since the last call, optionally just one monster's"""
+        taken = [e for e in self._pending_evolutions if monster_id is None or e.monster_id == monster_id]
+        self._pending_evolutions = [e for e in self._pending_evolutions if e not in taken]
+        return taken
     
     def export_collection_to_json(self, player_id: int, filepath: str) -> bool:
-        """Export player's monster collection to a JSON file"""
-        import json
-        player = self.db.query(Player).filter(Player.id == player_id).first()
-        if not player:
+        """Export player's monster collection to a JSON file (streamed, species joined in)"""
+        from transfer import iter_monster_rows
+        if not self.db.get(Player, player_id):
             return False
-        collection = []
-        for monster in player.monsters:
-            collection.append({
-                "id": monster.id,
-                "species": monster.species.name,
-                "nickname": monster.nickname,
-                "level": monster.level,
-                "hp": monster.hp,
-                "max_hp": monster.max_hp,
-                "attack": monster.attack,
-                "defense": monster.defense,
-                "speed": monster.speed,
-                "caught_at": monster.caught_at.isoformat()
-            })
         try:
             with open(filepath, "w") as f:
-                json.dump(collection, f, indent=4)
+                f.write("[")
+                for number, row in enumerate(iter_monster_rows(self.db, player_id)):
+                    f.write(("," if number else "") + "\n" + json.dumps(row, indent=4))
+                f.write("\n]\n")
             return True
         except Exception as e:
             print(f"Error exporting collection: {e}")
             return False
     
     def award_experience(self, player_id: int, amount: int):
-        """Award experience to player"""
-        player = self.db.query(Player).filter(Player.id == player_id).first()
-        player.experience += amount
-        
-        # Check for player level up
-        exp_needed = player.level * 200
-        if player.experience >= exp_needed:
-            player.level += 1
-            player.experience -= exp_needed
-        
-        self.db.commit()
+        """Award experience to player (levelling up as many times as it pays for)"""
+        player = self.db.get(Player, player_id)
+        old_level = player.level
+        player.level, player.experience = level_for_experience(
+            player.level, player.experience + amount, PLAYER_EXP_PER_LEVEL)
+        self._unlock_crossed(player, "player_level", old_level, player.level)
+        self._sync_leaderboard(player)
+        
+        self._commit()
+
+    # Bulk experience (seasonal rewards and other events)
+    def award_experience_bulk(self, player_ids: List[int], amount: int) -> Dict:
+        """
+        Give every listed player `amount` experience with a few set-based
+        UPDATEs. Only players who level up are read back, and their new
+        levels, achievement unlocks and leaderboard rows are written in
+        executemany batches.
+        """
+        player_ids = sorted(set(player_ids))
+        leveled = []
+        with self.transaction():
+            self.db.flush()
+            for chunk in self._id_chunks(player_ids):
+                self.db.execute(update(Player).where(Player.id.in_(chunk))
+                                .values(experience=Player.experience + amount)
+                                .execution_options(synchronize_session=False))
+                self.db.execute(update(LeaderboardEntry).where(LeaderboardEntry.player_id.in_(chunk))
+                                .values(experience=LeaderboardEntry.experience + amount)
+                                .execution_options(synchronize_session=False))
+                leveled.extend(self.db.execute(
+                    select(Player.id, Player.level, Player.experience)
+                    .where(Player.id.in_(chunk), Player.experience >= Player.level * PLAYER_EXP_PER_LEVEL)).all())
+
+            levels, unlocks, rewards = [], [], {}
+            index = get_achievement_index(self.db)
+            for player_id, level, experience in leveled:
+                new_level, left = level_for_experience(level, experience, PLAYER_EXP_PER_LEVEL)
+                levels.append({"pid": player_id, "level": new_level, "experience": left})
+                for achievement in index.crossed("player_level", level, new_level):
+                    unlocks.append({"player_id": player_id, "achievement_id": achievement.id})
+                    rewards[player_id] = rewards.get(player_id, 0) + achievement.reward_money
+                    self._pending_achievements.setdefault(player_id, []).append(achievement)
+            if levels:
+                # executemany: the WHERE is keyed on "pid", the other keys are the columns to SET
+                self.db.execute(update(Player.__table__).where(Player.__table__.c.id == bindparam("pid")), levels)
+                self.db.execute(update(LeaderboardEntry.__table__)
+                                .where(LeaderboardEntry.__table__.c.player_id == bindparam("pid")), levels)
+            if unlocks:
+                self.db.execute(insert(PlayerAchievement), unlocks)
+                self.db.execute(update(Player.__table__).where(Player.__table__.c.id == bindparam("pid"))
+                                .values(money=Player.__table__.c.money + bindparam("reward")),
+                                [{"pid": pid, "reward": reward} for pid, reward in rewards.items()])
+            self._expire_loaded(Player, player_ids)
+            self._expire_loaded(LeaderboardEntry, player_ids)
+        return {"players": len(player_ids), "leveled_up": len(levels), "achievements": len(unlocks)}
+
+    def award_monster_experience_bulk(self, monster_ids: List[int], amount: int) -> Dict:
+        """
+        Give every listed monster `amount` experience. One set-based UPDATE
+        per chunk adds it; monsters with enough to level up are then
+        levelled (and evolved) in memory and written back in one executemany.
+        """
+        monster_ids = sorted(set(monster_ids))
+        changes = []
+        evolved = 0
+        curves = self.game_data.stat_curves
+        with self.transaction():
+            self.db.flush()
+            for chunk in self._id_chunks(monster_ids):
+                self.db.execute(update(PlayerMonster).where(PlayerMonster.id.in_(chunk))
+                                .values(experience=PlayerMonster.experience + amount)
+                                .execution_options(synchronize_session=False))
+                ready = self.db.execute(
+                    select(PlayerMonster.id, PlayerMonster.species_id, PlayerMonster.level,
+                           PlayerMonster.experience, PlayerMonster.hp, PlayerMonster.max_hp,
+                           PlayerMonster.attack, PlayerMonster.defense, PlayerMonster.speed,
+                           PlayerMonster.hp_updated_at)
+                    .where(PlayerMonster.id.in_(chunk),
+                           PlayerMonster.experience >= PlayerMonster.level * EXP_PER_LEVEL)).all()
+                now = int(time.time())
+                for monster_id, species_id, level, experience, hp, max_hp, attack, defense, speed, hp_at in ready:
+                    new_level, left = level_for_experience(level, experience, EXP_PER_LEVEL)
+                    gains = self._roll_level_up_gains(new_level - level)
+                    hp = regenerated_hp(hp, max_hp, hp_at, now)
+                    row = {"mid": monster_id, "species_id": species_id, "level": new_level, "experience": left,
+                           "hp_updated_at": now,
+                           "hp": hp + gains[0], "max_hp": max_hp + gains[0], "attack": attack + gains[1],
+                           "defense": defense + gains[2], "speed": speed + gains[3]}
+                    new_species = self._evolution_for(species_id, new_level)
+                    if new_species:
+                        stats = curves[new_species.id].at(new_level)
+                        row.update(species_id=new_species.id, hp=stats.hp, max_hp=stats.hp,
+                                   attack=stats.attack, defense=stats.defense, speed=stats.speed)
+                        evolved += 1
+                    changes.append(row)
+            if changes:
+                table = PlayerMonster.__table__
+                self.db.execute(update(table).where(table.c.id == bindparam("mid")), changes)
+            self._expire_loaded(PlayerMonster, monster_ids)
+        return {"monsters": len(monster_ids), "leveled_up": len(changes), "evolved": evolved}
+
+    @staticmethod
+    def _id_chunks(ids: List[int]):
+        for start in range(0, len(ids), ID_CHUNK):
+            yield ids[start:start + ID_CHUNK]
+
+    def _expire_loaded(self, model, ids: List[int]):
+        """Make any of these rows already in the session reload after a bulk UPDATE"""
+        for pk in ids:
+            instance = self.db.identity_map.get(identity_key(model, pk))
+            if instance is not None:
+                self.db.expire(instance)
     
     def award_money(self, player_id: int, amount: int):
         """Award money to player"""
-        player = self.db.query(Player).filter(Player.id == player_id).first()
+        player = self.db.get(Player, player_id)
         player.money += amount
-        self.db.commit()
+        self._commit()
     
-    def heal_all_monsters(self, player_id: int):
-        """Heal all of player's monsters to full HP"""
-        monsters = self.db.query(PlayerMonster).filter(PlayerMonster.player_id == player_id).all()
-        for monster in monsters:
-            monster.hp = monster.max_hp
-        self.db.commit()
+    def heal_all_monsters(self, player_id: int) -> int:
+        """Heal all of player's monsters to full HP with one UPDATE, return how many needed it"""
+        healed = self.db.execute(
+            update(PlayerMonster)
+            .where(PlayerMonster.player_id == player_id, PlayerMonster.hp < PlayerMonster.max_hp)
+            .values(hp=PlayerMonster.max_hp, hp_updated_at=int(time.time()))
+            .execution_options(synchronize_session=False)).rowcount
+        # Monsters already in the session pick up their new HP when next read
+        for instance in list(self.db.identity_map.values()):
+            if isinstance(instance, PlayerMonster) and instance.player_id == player_id:
+                self.db.expire(instance, ["hp", "hp_updated_at"])
+        self._commit()
+        return healed
+
+    def heal_for_money(self, player_id: int, cost: int = HEAL_COST) -> bool:
+        """
+        Take the healing fee and heal every monster in one transaction.
+        The fee only comes out if the player can afford it (checked by the
+        UPDATE itself), so two heals at once can't overdraw. False if they can't pay.
+        """
+        with self.transaction():
+            self.db.flush()
+            paid = self.db.execute(
+                update(Player).where(Player.id == player_id, Player.money >= cost)
+                .values(money=Player.money - cost)
+                .execution_options(synchronize_session=False)).rowcount
+            self._expire_loaded(Player, [player_id])
+            if not paid:
+                return False
+            self.heal_all_monsters(player_id)
+        return True
     
     # Achievement System
-    def check_achievements(self, player_id: int) -> List[Achievement]:
-        """Check and unlock achievements, return newly unlocked ones"""
-        player = self.db.query(Player).filter(Player.id == player_id).first()
-        unlocked_achievements = [pa.achievement_id for pa in player.achievements]
-        
-        achievements = self.db.query(Achievement).all()
-        newly_unlocked = []
-        
+    def check_achievements(self, player_id: int) -> List[AchievementRecord]:
+        """Return achievements unlocked since the last check (they unlock as events happen)"""
+        if self.db.get(PlayerCounter, player_id) is None:
+            self._get_counters(player_id)
+            self._commit()
+        return self._pending_achievements.pop(player_id, [])
+
+    def pop_pending_achievements(self) -> Dict[int, List[AchievementRecord]]:
+        """Hand out (and forget) every player's unlocks since the last check, by player id"""
+        pending, self._pending_achievements = self._pending_achievements, {}
+        return pending
+
+    def _get_counters(self, player_id: int) -> PlayerCounter:
+        """Player's running totals, built once from the tables for players who don't have them yet"""
+        counters = self.db.get(PlayerCounter, player_id)
+        if counters is not None:
+            return counters
+
+        counters = PlayerCounter(
+            player_id=player_id,
+            catch_count=self.db.query(PlayerMonster).filter(PlayerMonster.player_id == player_id).count(),
+            battle_wins=self.db.query(Battle).filter(Battle.winner_id == player_id).count(),
+        )
+        self.db.add(counters)
+        self.db.flush()
+
+        # Catch up on anything earned before counters existed
+        player = self.db.get(Player, player_id)
+        unlocked = {pa.achievement_id for pa in player.achievements}
+        index = get_achievement_index(self.db)
+        for requirement_type, value in (("catch_count", counters.catch_count),
+                                        ("battle_wins", counters.battle_wins),
+                                        ("player_level", player.level)):
+            earned = [a for a in index.reached(requirement_type, value) if a.id not in unlocked]
+            self._unlock(player, earned)
+        return counters
+
+    def _bump_counter(self, player_id: int, counter: str, amount: int = 1):
+        """Move one of the player's counters and unlock whatever thresholds it crossed"""
+        counters = self._get_counters(player_id)
+        old_value = getattr(counters, counter)
+        setattr(counters, counter, old_value + amount)
+        player = self.db.get(Player, player_id)
+        self._unlock_crossed(player, counter, old_value, old_value + amount)
+        self._sync_leaderboard(player, counters)
+
+    def add_to_counters(self, counter: str, amounts: Dict[int, int]) -> int:
+        """
+        _bump_counter for many players at once (bulk imports, recorded
+        tournaments): amounts maps player id -> how much to add. Counters
+        are written with one executemany, crossed thresholds unlock (and
+        wait in the pending list as usual) and only these players'
+        leaderboard rows are resynced, all in the caller's transaction.
+        Call it before inserting the rows being counted: players with no
+        counters yet are counted from the tables first. Returns how many
+        achievements unlocked.
+        """
+        player_ids = sorted(player_id for player_id, amount in amounts.items() if amount)
+        column = getattr(PlayerCounter.__table__.c, counter)
+        index = get_achievement_index(self.db)
+        unlocks, rewards = [], {}
+        self.db.flush()
+        for chunk in self._id_chunks(player_ids):
+            old = dict(self.db.execute(select(PlayerCounter.player_id, column)
+                                       .where(PlayerCounter.player_id.in_(chunk))).all())
+            for player_id in chunk:
+                if player_id not in old:
+                    old[player_id] = getattr(self._get_counters(player_id), counter)
+            self.db.flush()
+            self.db.execute(update(PlayerCounter.__table__)
+                            .where(PlayerCounter.__table__.c.player_id == bindparam("pid"))
+                            .values({counter: bindparam("total")}),
+                            [{"pid": player_id, "total": old[player_id] + amounts[player_id]} for player_id in chunk])
+            for player_id in chunk:
+                for achievement in index.crossed(counter, old[player_id], old[player_id] + amounts[player_id]):
+                    unlocks.append({"player_id": player_id, "achievement_id": achievement.id})
+                    rewards[player_id] = rewards.get(player_id, 0) + achievement.reward_money
+                    self._pending_achievements.setdefault(player_id, []).append(achievement)
+            self._expire_loaded(PlayerCounter, chunk)
+        if unlocks:
+            self.db.execute(insert(PlayerAchievement), unlocks)
+            self.db.execute(update(Player.__table__).where(Player.__table__.c.id == bindparam("pid"))
+                            .values(money=Player.__table__.c.money + bindparam("reward")),
+                            [{"pid": pid, "reward": reward} for pid, reward in rewards.items()])
+            self._expire_loaded(Player, list(rewards))
+        self._sync_leaderboards(player_ids)
+        return len(unlocks)
+
+    def _unlock_crossed(self, player: Player, requirement_type: str, old_value: int, new_value: int):
+        self._unlock(player, get_achievement_index(self.db).crossed(requirement_type, old_value, new_value))
+
+    def _unlock(self, player: Player, achievements: List[AchievementRecord]):
         for achievement in achievements:
-            if achievement.id in unlocked_achievements:
-                continue
-            
-            should_unlock = False
-            
-            if achievement.requirement_type == "catch_count":
-                catch_count = len(player.monsters)
-                should_unlock = catch_count >= achievement.requirement_value
-            elif achievement.requirement_type == "battle_wins":
-                wins = self.db.query(Battle).filter(Battle.winner_id == player_id).count()
-                should_unlock = wins >= achievement.requirement_value
-            elif achievement.requirement_type == "player_level":
-                should_unlock = player.level >= achievement.requirement_value
-            
-            if should_unlock:
-                # Unlock achievement
-                player_achievement = PlayerAchievement(
-                    player_id=player_id,
-                    achievement_id=achievement.id
-                )
-                self.db.add(player_achievement)
-                
-                # Award money
-                player.money += achievement.reward_money
-                newly_unlocked.append(achievement)
-        
-        self.db.commit()
-        return newly_unlocked
-    
+            self.db.add(PlayerAchievement(player_id=player.id, achievement_id=achievement.id))
+            player.money += achievement.reward_money
+            self._pending_achievements.setdefault(player.id, []).append(achievement)
+
+    # Leaderboard
+    def _sync_leaderboard(self, player: Player, counters: Optional[PlayerCounter] = None):
+        """Copy the player's latest level, experience, catches and wins into their leaderboard row"""
+        if counters is None:
+            counters = self._get_counters(player.id)
+        entry = self.db.get(LeaderboardEntry, player.id)
+        if entry is None:
+            entry = LeaderboardEntry(player_id=player.id)
+            self.db.add(entry)
+        entry.username = player.username
+        entry.level = player.level
+        entry.experience = player.experience
+        # Monsters are never released, so everything caught is still in the collection
+        entry.monster_count = counters.catch_count
+        entry.battle_wins = counters.battle_wins
+        self.db.flush()
+
+    def _sync_leaderboards(self, player_ids: List[int]):
+        """_sync_leaderboard for many players: their rows are rewritten from players and player_counters"""
+        self.db.flush()
+        for chunk in self._id_chunks(sorted(player_ids)):
+            self.db.execute(delete(LeaderboardEntry).where(LeaderboardEntry.player_id.in_(chunk))
+                            .execution_options(synchronize_session=False))
+            self.db.execute(insert(LeaderboardEntry).from_select(
+                ["player_id", "username", "level", "experience", "monster_count", "battle_wins"],
+                select(Player.id, Player.username, Player.level, Player.experience,
+                       PlayerCounter.catch_count, PlayerCounter.battle_wins)
+                .join(PlayerCounter, PlayerCounter.player_id == Player.id).where(Player.id.in_(chunk))))
+            self._expire_loaded(LeaderboardEntry, chunk)
+
+    def get_leaderboard(self, limit: int = 10) -> List[LeaderboardEntry]:
+        """Top trainers by level then experience, oldest account first on a tie (one read of the leaderboard index)"""
+        return self.db.query(LeaderboardEntry).order_by(
+            LeaderboardEntry.level.desc(), LeaderboardEntry.experience.desc(), LeaderboardEntry.player_id
+        ).limit(limit).all()
+
+    def rebuild_leaderboard(self) -> int:
+        """Recompute every leaderboard row from the real tables, return how many rows were written"""
+        monster_counts = select(PlayerMonster.player_id, func.count().label("total")) \
+            .group_by(PlayerMonster.player_id).subquery()
+        win_counts = select(Battle.winner_id, func.count().label("total")) \
+            .where(Battle.winner_id.isnot(None)).group_by(Battle.winner_id).subquery()
+        rows = select(
+            Player.id, Player.username, Player.level, Player.experience,
+            func.coalesce(monster_counts.c.total, 0), func.coalesce(win_counts.c.total, 0),
+        ).outerjoin(monster_counts, monster_counts.c.player_id == Player.id) \
+         .outerjoin(win_counts, win_counts.c.winner_id == Player.id)
+
+        with self.transaction():
+            self.db.execute(delete(LeaderboardEntry))
+            self.db.execute(insert(LeaderboardEntry).from_select(
+                ["player_id", "username", "level", "experience", "monster_count", "battle_wins"], rows))
+        return self.db.query(LeaderboardEntry).count()
+
     # Statistics and Data
     def get_player_stats(self, player_id: int) -> Dict:
         """Get comprehensive player statistics"""
-        player = self.db.query(Player).filter(Player.id == player_id).first()
+        player = self.db.get(Player, player_id)
         
         total_monsters = len(player.monsters)
         total_battles = self.db.query(Battle).filter(
@@ -419,8 +970,7 @@ class GameEngine:
             status="pending"
         )
         self.db.add(trade)
-        self.db.commit()
-        self.db.refresh(trade)
+        self._commit()
         return trade
     
     def execute_trade(self, trade_id: int) -> bool:
@@ -448,5 +998,5 @@ class GameEngine:
         trade.status = "completed"
         trade.completed_at = datetime.utcnow()
         
-        self.db.commit()
+        self._commit()
         return True
\ No newline at end of file
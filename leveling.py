@@ -0,0 +1,26 @@
+"""
+Leveling Math - Partner A's experience calculator!
+Going from level L to L + 1 costs L * per_level experience, so reaching
+level N from level 1 costs per_level * N * (N - 1) / 2 in total. That
+sum can be turned around to find the level any amount of experience
+reaches straight away, however many levels it is worth.
+"""
+
+from math import isqrt
+from typing import Tuple
+
+
+def total_experience(level: int, experience: int, per_level: int) -> int:
+    """All the experience ever earned to be at `level` with `experience` left over"""
+    return per_level * level * (level - 1) // 2 + experience
+
+
+def level_for_experience(level: int, experience: int, per_level: int) -> Tuple[int, int]:
+    """(new level, leftover experience) once every level `experience` pays for is taken"""
+    if experience < level * per_level:
+        return level, experience
+    total = total_experience(level, experience, per_level)
+    # Biggest N with N * (N - 1) <= 2 * total / per_level
+    limit = 2 * total // per_level
+    new_level = (1 + isqrt(1 + 4 * limit)) // 2
+    return new_level, total - per_level * new_level * (new_level - 1) // 2
@@ -0,0 +1,107 @@
+"""
+Database Migrations - Partner A's way of upgrading old save files!
+create_all() only makes tables that are missing, it never changes a
+table that already exists. Every change to an existing table goes here
+as a numbered step, and the schema_version table remembers which steps a
+database file has already had.
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from models import SchemaVersion
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    steps: List[Union[str, Callable[[Connection], None]]]   # SQL strings or functions
+
+
+def add_column(table: str, column: str, ddl: str) -> Callable[[Connection], None]:
+    """Step that adds a column, unless create_all already made the table with it"""
+    def step(conn: Connection):
+        if column not in {c["name"] for c in inspect(conn).get_columns(table)}:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return step
+
+
+def _start_hp_clocks(conn: Connection):
+    # Existing monsters start healing passively from the moment of the upgrade
+    conn.execute(text("UPDATE player_monsters SET hp_updated_at = :now WHERE hp_updated_at IS NULL"),
+                 {"now": int(time.time())})
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Indexes for hot filters", [
+        "CREATE INDEX IF NOT EXISTS ix_player_monsters_player_id ON player_monsters (player_id)",
+        "CREATE INDEX IF NOT EXISTS ix_battles_winner_id ON battles (winner_id)",
+        "CREATE INDEX IF NOT EXISTS ix_battles_player1_id ON battles (player1_id)",
+        "CREATE INDEX IF NOT EXISTS ix_battles_player2_id ON battles (player2_id)",
+        "CREATE INDEX IF NOT EXISTS ix_trades_to_player_status ON trades (to_player_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_trades_from_player_status ON trades (from_player_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_trades_status ON trades (status)",
+        "CREATE INDEX IF NOT EXISTS ix_player_achievements_player ON player_achievements (player_id, achievement_id)",
+        "ANALYZE",
+    ]),
+    Migration(2, "Indexes for collection pages", [
+        "CREATE INDEX IF NOT EXISTS ix_player_monsters_player_level ON player_monsters (player_id, level, id)",
+        "CREATE INDEX IF NOT EXISTS ix_player_monsters_player_species ON player_monsters (player_id, species_id)",
+        "ANALYZE",
+    ]),
+    Migration(3, "HP timestamp for passive healing", [
+        add_column("player_monsters", "hp_updated_at", "INTEGER"),
+        _start_hp_clocks,
+    ]),
+    Migration(4, "Packed battle records", [
+        add_column("battles", "battle_blob", "BLOB"),
+    ]),
+    # Same numbers as GameEngine.rebuild_leaderboard, for saves from before the leaderboard table
+    Migration(5, "Fill the leaderboard", [
+        "DELETE FROM leaderboard",
+        """INSERT INTO leaderboard (player_id, username, level, experience, monster_count, battle_wins)
+           SELECT p.id, p.username, p.level, p.experience,
+                  COALESCE(m.total, 0), COALESCE(w.total, 0)
+           FROM players p
+           LEFT JOIN (SELECT player_id, COUNT(*) AS total FROM player_monsters
+                      GROUP BY player_id) m ON m.player_id = p.id
+           LEFT JOIN (SELECT winner_id, COUNT(*) AS total FROM battles
+                      WHERE winner_id IS NOT NULL GROUP BY winner_id) w ON w.winner_id = p.id""",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn: Connection) -> int:
+    """Highest migration applied to this database (0 for a brand new or very old file)"""
+    SchemaVersion.__table__.create(conn, checkfirst=True)
+    return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar()
+
+
+def run_migrations(engine: Engine) -> List[Migration]:
+    """Apply every migration the database hasn't had yet, in order, return the ones applied"""
+    applied = []
+    with engine.begin() as conn:
+        version = current_version(conn)
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        # One transaction per migration, so a failed step leaves the version untouched
+        with engine.begin() as conn:
+            for step in migration.steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(text(step))
+            conn.execute(SchemaVersion.__table__.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.utcnow(),
+            ))
+        applied.append(migration)
+    return applied
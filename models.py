@@ -4,10 +4,15 @@ This file defines what our monsters, players, and other game objects look like.
 Think of this like creating the blueprint for Pokemon cards!
 """
 
+import json
+import time
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import (Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Text, Index, LargeBinary,
+                        case, event, func)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import object_session, relationship
+
+from config import HP_REGEN_PER_MINUTE
 
 # This is like the master template for all our database tables
 Base = declarative_base()
@@ -64,12 +69,35 @@ class MonsterSpecies(Base):
     def __repr__(self):
         return f"<MonsterSpecies(name='{self.name}', type='{self.type}', rarity='{self.rarity}')>"
 
+class Evolution(Base):
+    """
+    One evolution step: a species turns into another at a level.
+    Like Charmander becoming Charmeleon at level 16!
+    """
+    __tablename__ = "evolutions"
+
+    id = Column(Integer, primary_key=True)
+    species_id = Column(Integer, ForeignKey("monster_species.id"), unique=True, nullable=False)  # Who evolves
+    evolves_to_id = Column(Integer, ForeignKey("monster_species.id"), nullable=False)          # Into what
+    level = Column(Integer, nullable=False)                                                     # At what level
+
+    species = relationship("MonsterSpecies", foreign_keys=[species_id])
+    evolves_to = relationship("MonsterSpecies", foreign_keys=[evolves_to_id])
+
+    def __repr__(self):
+        return f"<Evolution(species_id={self.species_id}, evolves_to_id={self.evolves_to_id}, level={self.level})>"
+
 class PlayerMonster(Base):
     """
     This represents an individual monster that a player owns.
     Like YOUR specific Pikachu that you caught and trained.
     """
     __tablename__ = "player_monsters"
+    __table_args__ = (
+        Index("ix_player_monsters_player_id", "player_id"),
+        Index("ix_player_monsters_player_level", "player_id", "level", "id"),
+        Index("ix_player_monsters_player_species", "player_id", "species_id"),
+    )
     
     # Basic monster info
     id = Column(Integer, primary_key=True, index=True)          # Unique monster ID
@@ -85,6 +113,8 @@ class PlayerMonster(Base):
     attack = Column(Integer)         # Current attack stat
     defense = Column(Integer)        # Current defense stat
     speed = Column(Integer)          # Current speed stat
+    # hp is the HP at this moment (unix seconds); passive healing counts from here
+    hp_updated_at = Column(Integer, default=lambda: int(time.time()))
     
     caught_at = Column(DateTime, default=datetime.utcnow)  # When you caught it
     
@@ -92,21 +122,55 @@ class PlayerMonster(Base):
     owner = relationship("Player", back_populates="monsters")
     species = relationship("MonsterSpecies", back_populates="player_monsters")
 
+    @property
+    def current_hp(self) -> int:
+        """HP right now, counting passive healing since hp was last changed"""
+        return regenerated_hp(self.hp, self.max_hp, self.hp_updated_at)
+
+    @classmethod
+    def current_hp_expr(cls, now: int = None):
+        """current_hp as a SQL expression, for filtering in the database"""
+        if not HP_REGEN_PER_MINUTE:
+            return cls.hp
+        now = int(time.time()) if now is None else now
+        healed = cls.hp + (now - func.coalesce(cls.hp_updated_at, now)) * HP_REGEN_PER_MINUTE / 60 * cls.max_hp
+        return case((healed >= cls.max_hp, cls.max_hp), else_=healed)
+
     def __repr__(self):
         return f"<PlayerMonster(species='{self.species.name}', level={self.level}, owner='{self.owner.username}')>"
 
 
 
+def regenerated_hp(hp: int, max_hp: int, updated_at: int, now: int = None) -> int:
+    """HP after passive healing since `updated_at` (never above max_hp)"""
+    if not HP_REGEN_PER_MINUTE or updated_at is None or hp >= max_hp:
+        return hp
+    now = int(time.time()) if now is None else now
+    healed = int(max(0, now - updated_at) * HP_REGEN_PER_MINUTE / 60 * max_hp)
+    return min(max_hp, hp + healed)
+
+
+@event.listens_for(PlayerMonster.hp, "set")
+def _stamp_hp_change(monster, value, old_value, initiator):
+    # Every HP change restarts the passive healing clock
+    monster.hp_updated_at = int(time.time())
+
 class Battle(Base):
     """Battle history tracking"""
     __tablename__ = "battles"
+    __table_args__ = (
+        Index("ix_battles_winner_id", "winner_id"),
+        Index("ix_battles_player1_id", "player1_id"),
+        Index("ix_battles_player2_id", "player2_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     player1_id = Column(Integer, ForeignKey("players.id"))
     player2_id = Column(Integer, ForeignKey("players.id"), nullable=True)  # Null for wild battles
     winner_id = Column(Integer, ForeignKey("players.id"), nullable=True)
     battle_type = Column(String)  # "wild", "player", "gym"
-    battle_data = Column(Text)    # JSON data about the battle
+    battle_data = Column(Text)    # JSON data about the battle (older rows)
+    battle_blob = Column(LargeBinary)  # The same, packed by battle_codec (new rows)
     experience_gained = Column(Integer, default=0)
     money_gained = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -115,12 +179,27 @@ class Battle(Base):
     player1 = relationship("Player", foreign_keys=[player1_id], back_populates="battles_as_player1")
     player2 = relationship("Player", foreign_keys=[player2_id], back_populates="battles_as_player2")
 
+    @property
+    def data(self) -> dict:
+        """The battle's details as a dict, whichever way the row stores them"""
+        if self.battle_blob is not None:
+            from battle_codec import unpack
+            from game_data import get_game_data
+            session = object_session(self)
+            return unpack(self.battle_blob, get_game_data(session).species_by_id if session else None)
+        return json.loads(self.battle_data) if self.battle_data else {}
+
     def __repr__(self):
         return f"<Battle(type='{self.battle_type}', winner_id={self.winner_id})>"
 
 class Trade(Base):
     """Trading system between players"""
     __tablename__ = "trades"
+    __table_args__ = (
+        Index("ix_trades_to_player_status", "to_player_id", "status"),
+        Index("ix_trades_from_player_status", "from_player_id", "status"),
+        Index("ix_trades_status", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     from_player_id = Column(Integer, ForeignKey("players.id"))
@@ -158,6 +237,7 @@ class Achievement(Base):
 class PlayerAchievement(Base):
     """Junction table for player achievements"""
     __tablename__ = "player_achievements"
+    __table_args__ = (Index("ix_player_achievements_player", "player_id", "achievement_id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"))
@@ -169,4 +249,62 @@ class PlayerAchievement(Base):
     achievement = relationship("Achievement", back_populates="player_achievements")
 
     def __repr__(self):
-        return f"<PlayerAchievement(player='{self.player.username}', achievement='{self.achievement.name}')>"
\ No newline at end of file
+        return f"<PlayerAchievement(player='{self.player.username}', achievement='{self.achievement.name}')>"
+
+class PlayerCounter(Base):
+    """
+    Running totals for each player, kept up to date as things happen.
+    Achievement checks read these instead of counting whole tables.
+    """
+    __tablename__ = "player_counters"
+
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    catch_count = Column(Integer, default=0, nullable=False)   # Monsters ever added to the collection
+    battle_wins = Column(Integer, default=0, nullable=False)   # Battles won
+
+    def __repr__(self):
+        return f"<PlayerCounter(player_id={self.player_id}, catches={self.catch_count}, wins={self.battle_wins})>"
+
+class LeaderboardEntry(Base):
+    """
+    Ready-made leaderboard row for each player.
+    Kept current by the game engine whenever levels, catches or wins change,
+    so showing the top trainers is one indexed read.
+    """
+    __tablename__ = "leaderboard"
+    __table_args__ = (Index("ix_leaderboard_rank", "level", "experience"),)
+
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    username = Column(String)
+    level = Column(Integer, default=1, nullable=False)
+    experience = Column(Integer, default=0, nullable=False)
+    monster_count = Column(Integer, default=0, nullable=False)
+    battle_wins = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<LeaderboardEntry(username='{self.username}', level={self.level})>"
+
+class SchemaVersion(Base):
+    """Which database migrations have been applied (see migrations.py)"""
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+    description = Column(String)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SchemaVersion(version={self.version})>"
+
+class DatabaseStamp(Base):
+    """
+    One-row table saying which schema and seed data this file is up to date with.
+    Reading it is the only database work the CLI does on startup.
+    """
+    __tablename__ = "db_stamp"
+
+    id = Column(Integer, primary_key=True)
+    schema_version = Column(Integer, nullable=False)
+    seed_version = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<DatabaseStamp(schema={self.schema_version}, seed={self.seed_version})>"
@@ -3,57 +3,220 @@ import os
 import sys
 import click
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from cli import CLIInterface
-from database import init_database
 
-# Create an instance of CLIInterface
-cli_interface = CLIInterface()
+##the game (rich, sqlalchemy, the database) is only loaded when a command really runs,##
+##so --help and typos come back instantly##
+_cli_interface = None
+
+def get_cli():
+    """Load the game and check the database the first time a command needs it."""
+    global _cli_interface
+    if _cli_interface is None:
+        from database import ensure_database
+        from cli import CLIInterface
+        ensure_database()
+        _cli_interface = CLIInterface()
+    return _cli_interface
+
+def report_sql_trace(trace, command, show: bool = True, json_path: str = None):
+    """Print a trace summary to stderr and/or append it as one JSON line to json_path."""
+    import json
+    summary = trace.summary(command)
+    if json_path:
+        with open(json_path, "a", encoding="utf-8") as out:
+            out.write(json.dumps(summary) + "\n")
+    if not show:
+        return
+    click.echo(f"🔎 SQL for '{command}': {summary['statements']} statements "
+               f"({summary['distinct_statements']} distinct), {summary['sql_ms']:.1f} ms in SQL "
+               f"of {summary['wall_ms']:.1f} ms, slowest {summary['slowest_ms']:.1f} ms", err=True)
+    if summary['slowest_statement']:
+        click.echo(f"   slowest: {summary['slowest_statement'][:160]}", err=True)
+    for suspect in summary['n_plus_one'][:5]:
+        click.echo(f"   ⚠️ N+1? {suspect['count']}x ({suspect['total_ms']:.1f} ms): {suspect['statement'][:140]}", err=True)
+
+def report_profile(profiler, command):
+    """Stop the profiler, save its files and print the summary to stderr."""
+    profiler.stop()
+    paths = profiler.save(command or "cli")
+    for line in profiler.report(command):
+        click.echo(line, err=True)
+    click.echo(f"   saved {', '.join(paths.values())}  (python -m pstats {paths['pstats']})", err=True)
 
 ##cli helper##
 @click.group()
-def cli():
-     init_database()
+@click.option('--trace-sql', is_flag=True, help='Count and time every SQL statement, flag N+1 query patterns.')
+@click.option('--trace-sql-json', default=None, envvar='TRACE_SQL_JSON', metavar='FILE',
+              help='Append the SQL summary as one JSON line to FILE (also via $TRACE_SQL_JSON).')
+@click.option('--profile', is_flag=True, help='Run the command under cProfile and show where the time went.')
+@click.option('--profile-memory', is_flag=True, help='With --profile, also trace allocations (tracemalloc).')
+@click.option('--profile-dir', default='profiles', show_default=True, help='Where .pstats files are written.')
+@click.option('--profile-top', default=15, show_default=True, help='Functions/allocation sites listed.')
+@click.pass_context
+def cli(ctx, trace_sql, trace_sql_json, profile, profile_memory, profile_dir, profile_top):
+    """🐉 Monster Collection Game"""
+    if trace_sql or trace_sql_json:
+        from database import start_sql_trace
+        trace = start_sql_trace()
+        ctx.obj = {"trace_sql": trace_sql}
+        ##the report comes out once the command has finished##
+        ctx.call_on_close(lambda: report_sql_trace(trace, ctx.invoked_subcommand, trace_sql, trace_sql_json))
+    if profile or profile_memory:
+        from profiling import CommandProfiler
+        profiler = CommandProfiler(profile_dir, memory=profile_memory, top=profile_top)
+        ##registered last so it stops first and the reports aren't in the profile##
+        ctx.call_on_close(lambda: report_profile(profiler, ctx.invoked_subcommand))
+        profiler.start()
 @cli.command()
 def start():
     """Start the Monster Game."""
-    cli_interface.handle_start()
+    get_cli().handle_start()
 
 @cli.command()
 @click.option('--player', prompt='Trainer name', help='your trainer name.')
 def explore(player):
     """Explore the world and encounter wild monsters."""
-    cli_interface.handle_explore(player)
+    get_cli().handle_explore(player)
 @cli.command()
 @click.option('--player', prompt='Trainer name', help='your trainer name.')
-def collection(player):
-    """View your monster collection."""
-    cli_interface.handle_collection(player)
+@click.option('--page', default=None, help='cursor printed at the bottom of the previous page.')
+@click.option('--filter', 'filters', multiple=True,
+              help='species=NAME, type=TYPE, rarity=RARITY, level=5-10 or hp=full|injured|healthy|fainted (repeatable).')
+@click.option('--sort', default='id', show_default=True,
+              help='id, level, hp, attack, defense or speed; prefix with - for highest first.')
+@click.option('--limit', default=20, show_default=True, help='monsters per page.')
+def collection(player, page, filters, sort, limit):
+    """View your monster collection, one page at a time."""
+    get_cli().handle_collection(player, page=page, filters=list(filters), sort=sort, limit=limit)
 @cli.command()
 @click.option('--player', prompt='Trainer name', help='your trainer name.')
 def battle(player):
     """Engage in battles with wild monsters."""
-    cli_interface.handle_battle(player)
+    get_cli().handle_battle(player)
 @cli.command()
 @click.option('--player', prompt='Trainer name', help='your trainer name.')
 def heal(player):
     """Heal your monsters at the Pokémon Center."""
-    cli_interface.handle_heal(player)
+    get_cli().handle_heal(player)
 @cli.command()
 @click.option('--player', prompt='Trainer name', help='your trainer name.')
 def achievements(player):
     """View your achievements."""
-    cli_interface.handle_achievements(player)
+    get_cli().handle_achievements(player)
 @cli.command()
 @click.option('--from_player', prompt='From trainer name', help='Name of the player offering the trade.')
 @click.option('--to_player', prompt='To trainer name', help='Name of the player receiving the trade.')
 def trade(from_player, to_player):
     """Trade monsters with other players."""
-    cli_interface.handle_trade(from_player, to_player)
+    get_cli().handle_trade(from_player, to_player)
 
 @cli.command()
 def leaderboard():
     """View the leaderboard of top players."""
-    cli_interface.handle_leaderboard()
+    get_cli().handle_leaderboard()
+
+@cli.command()
+def rebuild_leaderboard():
+    """Rebuild the leaderboard from scratch (offline maintenance)."""
+    rows = get_cli().game_engine.rebuild_leaderboard()
+    click.echo(f"Leaderboard rebuilt: {rows} trainers ranked.")
+
+@cli.command()
+@click.option('--player', default=None, help='Trainer to use when a command leaves the name out.')
+@click.option('--timing', is_flag=True, help='Show how long each command takes.')
+@click.pass_context
+def shell(ctx, player, timing):
+    """Open an interactive shell that keeps the game loaded between commands."""
+    from shell import GameShell
+    trace_sql = bool(ctx.obj and ctx.obj.get("trace_sql"))
+    GameShell(get_cli(), player=player, timing=timing, trace_sql=trace_sql).cmdloop()
+
+@cli.command()
+@click.argument('action_file', type=click.File('r'))
+@click.option('--batch-size', default=100, show_default=True, help='Actions committed together in one transaction.')
+@click.option('--output', type=click.File('w'), default='-', help='Where to write JSON results (default: stdout).')
+def batch(action_file, batch_size, output):
+    """Run actions from a JSON Lines file (use - for stdin) without prompts."""
+    import json
+    from database import ensure_database
+    from batch_runner import run_batch_file
+    ensure_database()
+    summary = run_batch_file(action_file, output, batch_size=batch_size)
+    click.echo(json.dumps(summary), err=True)
+
+@cli.command()
+@click.option('--output', default='-', help='File to write (.csv for CSV, .gz to compress); - for stdout.')
+@click.option('--player', default=None, help='Only this trainer\'s monsters (default: everyone\'s).')
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'csv']), default=None,
+              help='Output format (default: from the file name, else ndjson).')
+@click.option('--gzip/--no-gzip', 'compress', default=None, help='Compress the output (default: if it ends in .gz).')
+@click.option('--chunk-size', default=1000, show_default=True, help='Monsters fetched per database round trip.')
+def export(output, player, fmt, compress, chunk_size):
+    """Stream monsters out as NDJSON or CSV for backups and moves."""
+    from database import ensure_database, SessionLocal
+    from models import Player
+    from transfer import detect_format, export_monsters, open_file
+    ensure_database()
+    db = SessionLocal()
+    player_id = None
+    if player:
+        player_id = db.query(Player.id).filter(Player.username == player).scalar()
+        if player_id is None:
+            raise click.ClickException(f"trainer '{player}' not found")
+    stream = open_file(output, "w", compress)
+    try:
+        count = export_monsters(db, stream, fmt or detect_format(output), player_id, chunk_size)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+        db.close()
+    click.echo(f"Exported {count} monsters", err=True)
+
+@cli.command(name='import')
+@click.argument('input_file')
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'csv']), default=None,
+              help='Input format (default: from the file name, else ndjson).')
+@click.option('--gzip/--no-gzip', 'compress', default=None, help='Input is compressed (default: if it ends in .gz).')
+@click.option('--chunk-size', default=1000, show_default=True, help='Monsters inserted per commit.')
+@click.option('--create-players/--no-create-players', default=True, show_default=True,
+              help='Create trainers named in the file that don\'t exist yet.')
+def import_(input_file, fmt, compress, chunk_size, create_players):
+    """Bulk load monsters from an export file (use - for stdin)."""
+    from database import ensure_database
+    from game_engine import GameEngine
+    from transfer import detect_format, import_monsters, open_file
+    ensure_database()
+    stream = open_file(input_file, "r", compress)
+    try:
+        report = import_monsters(GameEngine(), stream, fmt or detect_format(input_file), chunk_size, create_players)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    for line_number, reason in report.errors[:20]:
+        click.echo(f"line {line_number}: {reason}", err=True)
+    if len(report.errors) > 20:
+        click.echo(f"... and {len(report.errors) - 20} more skipped rows", err=True)
+    click.echo(f"Imported {report.imported} monsters, created {report.players_created} trainers, "
+               f"unlocked {report.achievements} achievements, skipped {len(report.errors)} rows", err=True)
+
+@cli.command()
+@click.option('--chunk-size', default=5000, show_default=True, help='Battles rewritten per transaction.')
+@click.option('--vacuum/--no-vacuum', default=False, help='Compact the database file afterwards (SQLite).')
+def repack_battles(chunk_size, vacuum):
+    """Convert old JSON battle history to the packed format."""
+    from database import ensure_database, engine, SessionLocal
+    from game_data import get_game_data
+    from battle_codec import repack_battles as repack
+    ensure_database()
+    db = SessionLocal()
+    species_by_name = get_game_data(db).species_by_name
+    db.close()
+    result = repack(engine, species_by_name, chunk_size)
+    click.echo(f"Packed {result['converted']} battles, left {result['skipped']} that couldn't be converted")
+    if vacuum and engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+        click.echo("Database file compacted")
 
     ##player vs player battle (my special addition)#
 @cli.command()
@@ -61,15 +224,63 @@ def leaderboard():
 @click.option('--player2', prompt='Trainer 2 name', help='Name of the second trainer.')
 def pvp_battle(player1, player2):
     """Engage in a player vs player battle."""
-    cli_interface.handle_pvp_battle(player1, player2)
+    get_cli().handle_pvp_battle(player1, player2)
+
+@cli.command()
+@click.option('--battle-id', type=int, prompt='Battle id', help='PvP battle to replay.')
+def replay_battle(battle_id):
+    """Replay a recorded PvP battle from its seed."""
+    get_cli().handle_replay_battle(battle_id)
+
+@cli.command()
+@click.option('--players', type=int, prompt='How many trainers', help='Trainers to add.')
+@click.option('--monsters-per-player', default=20, show_default=True, help='Average monsters caught per trainer.')
+@click.option('--battles-per-player', default=30, show_default=True, help='Average battles fought per trainer.')
+@click.option('--trades-per-player', default=2, show_default=True, help='Average trades offered per trainer.')
+@click.option('--seed', default=42, show_default=True, help='Same seed + same settings = same world.')
+@click.option('--chunk-size', default=2000, show_default=True, help='Trainers written per transaction.')
+@click.option('--prefix', default='trainer', show_default=True, help='Usernames are PREFIX + trainer id.')
+def generate_world(players, monsters_per_player, battles_per_player, trades_per_player, seed, chunk_size, prefix):
+    """Fill the database with a big synthetic world for load testing."""
+    from config import DATABASE_URL
+    from database import ensure_database, make_engine, SessionLocal
+    from game_data import get_game_data
+    from worldgen import generate_world as generate
+    ensure_database()
+    db = SessionLocal()
+    game_data = get_game_data(db)
+    db.close()
+    ##big loads get the fast (not crash-safe) sqlite settings##
+    bulk_engine = make_engine(DATABASE_URL, "bulk")
+    report = generate(bulk_engine, game_data, players, monsters_per_player, battles_per_player,
+                      trades_per_player, seed, chunk_size, prefix,
+                      progress=lambda done: click.echo(f"  {done}/{players} trainers", err=True))
+    bulk_engine.dispose()
+    click.echo(f"Generated {report.players} trainers, {report.monsters} monsters, {report.battles} battles, "
+               f"{report.trades} trades and {report.achievements} achievements in {report.seconds:.1f}s "
+               f"({report.rows_per_second:,.0f} rows/s)")
+
+@cli.command()
+@click.option('--format', 'fmt', type=click.Choice(['round-robin', 'bracket']), default='round-robin',
+              show_default=True, help='Everyone meets everyone, or a single-elimination bracket.')
+@click.option('--player', 'players', multiple=True, help='Trainer to enter (repeatable; default: everyone).')
+@click.option('--per-player', type=int, default=None, help='Enter only each trainer\'s best N monsters by level.')
+@click.option('--workers', type=int, default=None, help='Worker processes (default: one per CPU).')
+@click.option('--chunk-size', default=2000, show_default=True, help='Matches sent to a worker at a time.')
+@click.option('--seed', type=click.IntRange(0, 2**32 - 1), default=None,
+              help='Tournament seed (0 to 4294967295), for a repeatable tournament.')
+@click.option('--record/--no-record', default=True, show_default=True,
+              help='Save every match as a replayable battle.')
+@click.option('--top', default=20, show_default=True, help='Standings rows to show.')
+def tournament(fmt, players, per_player, workers, chunk_size, seed, record, top):
+    """Run a tournament between trainers' monsters on every CPU core."""
+    get_cli().handle_tournament(fmt, players, per_player, workers, chunk_size, seed, record, top)
 
     #now i want it to run when someone starts the game##
 if __name__ == '__main__':
-    try:
-        import click
-        import rich
-        import sqlalchemy
-    except ImportError:
+    ##only look for the packages, importing them here would slow every start##
+    from importlib.util import find_spec
+    if not all(find_spec(package) for package in ("click", "rich", "sqlalchemy")):
         print("⏳ Installing required packages...")
         os.system('pip install -r requirements.txt')
         print("✅ Packages installed successfully.")
@@ -0,0 +1,158 @@
+"""
+Command Profiler - Partner B's stopwatch for slow commands!
+Wraps one CLI command in cProfile (and tracemalloc if asked), saves the
+raw .pstats file for snakeviz/pstats, and prints where the time went:
+
+    rendering   rich tables and panels, and cli.py itself
+    engine      game_engine.py and the other game modules
+    SQL         the database driver actually running statements
+    ORM         SQLAlchemy building queries and loading objects
+    imports     finding, reading and compiling modules
+    other       everything else (click, the standard library...)
+
+Each function's own time (not counting what it calls) goes to exactly one
+bucket, so the buckets add up to the whole run.
+"""
+
+import ast
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# The command line itself (cli.py counts as rendering); the profiler doesn't profile itself
+FRONT_END_MODULES = ("cli.py", "shell.py", "monster_game.py")
+# Every other module of ours is engine work, new ones included
+ENGINE_MODULES = tuple(sorted(name for name in os.listdir(ROOT) if name.endswith(".py")
+                              and name not in FRONT_END_MODULES + ("profiling.py",)))
+# Database drivers: time spent inside these is the database doing the work
+DRIVER_NAMES = ("sqlite3", "psycopg", "pymysql", "mysqldb")
+# Builtins that do the work of an import (reading .pyc files, compiling, building classes)
+IMPORT_BUILTINS = ("<built-in method marshal.loads>", "<built-in method builtins.compile>",
+                   "<built-in method builtins.exec>", "<built-in method builtins.__build_class__>",
+                   "<built-in method posix.stat>", "<built-in method io.open_code>")
+BUCKETS = ("rendering", "engine", "SQL", "ORM", "imports", "other")
+
+
+def bucket_for(filename: str, function: str) -> str:
+    """Which part of the game a profiled function's own time belongs to"""
+    path = filename.replace("\\", "/").lower()
+    name = os.path.basename(path)
+    if any(driver in (path if path != "~" else function.lower()) for driver in DRIVER_NAMES):
+        return "SQL"
+    if "/rich/" in path or name == "cli.py":
+        return "rendering"
+    if name in ENGINE_MODULES:
+        return "engine"
+    if "/sqlalchemy/" in path:
+        return "ORM"
+    if "importlib" in path or path.startswith("<frozen") or function in IMPORT_BUILTINS \
+            or function.startswith("<built-in method _imp."):
+        return "imports"
+    return "other"
+
+
+@lru_cache(maxsize=None)
+def class_body_lines(filename: str) -> Set[int]:
+    """First lines of every class statement in a source file (where a class body's code starts)"""
+    try:
+        with open(filename, encoding="utf-8") as source:
+            tree = ast.parse(source.read())
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    lines = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            lines.add(node.lineno)
+            lines.update(decorator.lineno for decorator in node.decorator_list)
+    return lines
+
+
+class CommandProfiler:
+    """Profile everything between start() and stop(), then write and summarize it"""
+
+    def __init__(self, output_dir: str = "profiles", memory: bool = False, top: int = 15):
+        self.output_dir = output_dir
+        self.memory = memory
+        self.top = top
+        self.profile = cProfile.Profile()
+        self.started = 0.0
+        self.elapsed = 0.0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.peak_bytes = 0
+
+    def start(self):
+        if self.memory:
+            tracemalloc.start(10)
+        self.started = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.elapsed = time.perf_counter() - self.started
+        if self.memory:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def buckets(self) -> Dict[str, float]:
+        """Seconds of own time per bucket (see the module docstring)"""
+        totals = dict.fromkeys(BUCKETS, 0.0)
+        stats = pstats.Stats(self.profile).stats
+        for (filename, _, function), (_, _, own_time, _, _) in stats.items():
+            totals[bucket_for(filename, function)] += own_time
+        return totals
+
+    def top_functions(self) -> List[Tuple[str, int, float, float]]:
+        """(function, calls, own seconds, cumulative seconds) for the slowest game functions, by cumulative time"""
+        rows = []
+        for (filename, line, function), (_, calls, own_time, cumulative, _) in pstats.Stats(self.profile).stats.items():
+            # Module and class bodies only run at import time, they aren't functions
+            if os.path.basename(filename) in ENGINE_MODULES + FRONT_END_MODULES and function != "<module>" \
+                    and line not in class_body_lines(filename):
+                rows.append((f"{os.path.basename(filename)}:{line}({function})", calls, own_time, cumulative))
+        return sorted(rows, key=lambda row: -row[3])[:self.top]
+
+    def top_allocations(self) -> List[Tuple[str, int, int]]:
+        """(file:line, KiB still allocated, blocks) for the biggest allocation sites"""
+        if self.snapshot is None:
+            return []
+        stats = self.snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )).statistics("lineno")
+        return [(f"{s.traceback[0].filename}:{s.traceback[0].lineno}", s.size // 1024, s.count)
+                for s in stats[:self.top]]
+
+    def save(self, command: str) -> Dict[str, str]:
+        """Write the .pstats file (and the allocation report) and return their paths"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{command}-{time.strftime('%Y%m%d-%H%M%S')}")
+        paths = {"pstats": base + ".pstats"}
+        self.profile.dump_stats(paths["pstats"])
+        if self.snapshot is not None:
+            paths["memory"] = base + ".memory.txt"
+            with open(paths["memory"], "w", encoding="utf-8") as out:
+                out.write(f"peak traced memory: {self.peak_bytes / 1024:.0f} KiB\n")
+                for site, kib, blocks in self.top_allocations():
+                    out.write(f"{kib:>10} KiB {blocks:>8} blocks  {site}\n")
+        return paths
+
+    def report(self, command: str) -> List[str]:
+        """Human-readable summary lines"""
+        lines = [f"⏱️ Profile of '{command}': {self.elapsed * 1000:.1f} ms"]
+        buckets = self.buckets()
+        profiled = sum(buckets.values()) or 1.0
+        lines.append("   " + ", ".join(f"{name} {seconds * 1000:.1f} ms ({seconds / profiled:.0%})"
+                                       for name, seconds in buckets.items() if seconds))
+        for function, calls, own_time, cumulative in self.top_functions():
+            lines.append(f"   {cumulative * 1000:9.1f} ms cum {own_time * 1000:8.1f} ms own {calls:>7}x  {function}")
+        if self.snapshot is not None:
+            lines.append(f"   peak traced memory {self.peak_bytes / 1024:.0f} KiB; biggest allocation sites:")
+            for site, kib, blocks in self.top_allocations():
+                lines.append(f"   {kib:>9} KiB {blocks:>7} blocks  {site}")
+        return lines
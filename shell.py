@@ -0,0 +1,154 @@
+"""
+Interactive Shell - Partner B's game console that stays open!
+Keeps one CLIInterface (and so one GameEngine, its database connection
+and all the warm caches) alive for as many commands as you like, instead
+of starting a new process for every action.
+"""
+
+import cmd
+import shlex
+import time
+
+from cli import CLIInterface, console
+from database import start_sql_trace, stop_sql_trace
+
+
+class GameShell(cmd.Cmd):
+    """REPL over the same handlers the one-shot commands use"""
+    intro = "🐉 Monster Game shell - type 'help' for commands, 'quit' to leave."
+    prompt = "🐾 > "
+
+    def __init__(self, cli_interface: CLIInterface, player: str = None, timing: bool = False,
+                 trace_sql: bool = False):
+        super().__init__()
+        self.cli = cli_interface
+        self.player = player
+        self.timing = timing
+        self.trace_sql = trace_sql      # One SQL summary per command (--trace-sql)
+        self._started = 0.0
+        self._trace = None
+
+    # Timing and error handling around every command
+    def precmd(self, line):
+        self._started = time.perf_counter()
+        if self.trace_sql and line.strip():
+            self._trace = start_sql_trace()
+        return line
+
+    def postcmd(self, stop, line):
+        if self.timing and line.strip() and not stop:
+            elapsed = (time.perf_counter() - self._started) * 1000
+            console.print(f"⏱️  {line.split()[0]} took {elapsed:.1f} ms", style="dim")
+        if self._trace is not None:
+            summary = stop_sql_trace(self._trace).summary(line.split()[0])
+            self._trace = None
+            console.print(f"🔎 {summary['statements']} SQL statements, {summary['sql_ms']:.1f} ms "
+                          f"(slowest {summary['slowest_ms']:.1f} ms)", style="dim")
+            for suspect in summary['n_plus_one'][:3]:
+                console.print(f"   ⚠️ N+1? {suspect['count']}x: {suspect['statement'][:120]}", style="yellow")
+        return stop
+
+    def onecmd(self, line):
+        try:
+            return super().onecmd(line)
+        except Exception as error:
+            # Keep the shell alive and the session usable after a failed command
+            self.cli.game_engine.db.rollback()
+            console.print(f"❌ {error}", style="red")
+            return False
+
+    def emptyline(self):
+        return False
+
+    def default(self, line):
+        console.print(f"❓ Unknown command: {line.split()[0]} (type 'help')", style="yellow")
+
+    def _player_arg(self, arg: str):
+        """Trainer name from the command, or the one picked with 'player'"""
+        name = arg.strip() or self.player
+        if not name:
+            console.print("❗ Which trainer? Use 'player <name>' or pass a name.", style="yellow")
+        return name
+
+    # Shell settings
+    def do_player(self, arg):
+        """player <name> - use this trainer when a command leaves the name out"""
+        self.player = arg.strip() or None
+        console.print(f"👤 Current trainer: {self.player or '(none)'}", style="cyan")
+
+    def do_timing(self, arg):
+        """timing [on|off] - show how long each command takes"""
+        if arg.strip() in ("on", "off"):
+            self.timing = arg.strip() == "on"
+        else:
+            self.timing = not self.timing
+        console.print(f"⏱️  Timing {'on' if self.timing else 'off'}", style="cyan")
+
+    def do_quit(self, arg):
+        """quit - leave the shell"""
+        return True
+
+    do_exit = do_quit
+    do_EOF = do_quit
+
+    # Game commands
+    def do_explore(self, arg):
+        """explore [trainer] - encounter a wild monster"""
+        name = self._player_arg(arg)
+        if name:
+            self.cli.handle_explore(name)
+
+    def do_battle(self, arg):
+        """battle [trainer] - fight a wild monster"""
+        name = self._player_arg(arg)
+        if name:
+            self.cli.handle_battle(name)
+
+    def do_collection(self, arg):
+        """collection [trainer] [key=value ...] [sort=-level] [page=CURSOR] - show a page of the collection"""
+        words = shlex.split(arg)
+        options = dict(w.split("=", 1) for w in words if w.split("=", 1)[0] in ("sort", "page"))
+        filters = [w for w in words if "=" in w and w.split("=", 1)[0] not in options]
+        name = self._player_arg(" ".join(w for w in words if "=" not in w))
+        if name:
+            self.cli.handle_collection(name, page=options.get("page"), filters=filters,
+                                       sort=options.get("sort", "id"))
+
+    def do_heal(self, arg):
+        """heal [trainer] - heal every monster"""
+        name = self._player_arg(arg)
+        if name:
+            self.cli.handle_heal(name)
+
+    def do_achievements(self, arg):
+        """achievements [trainer] - show achievement progress"""
+        name = self._player_arg(arg)
+        if name:
+            self.cli.handle_achievements(name)
+
+    def do_leaderboard(self, arg):
+        """leaderboard - show the top trainers"""
+        self.cli.handle_leaderboard()
+
+    def do_trade(self, arg):
+        """trade <from_trainer> <to_trainer> - trade monsters"""
+        names = shlex.split(arg)
+        if len(names) != 2:
+            console.print("❗ Usage: trade <from_trainer> <to_trainer>", style="yellow")
+            return
+        self.cli.handle_trade(*names)
+
+    def do_pvp(self, arg):
+        """pvp <trainer1> <trainer2> - player vs player battle"""
+        names = shlex.split(arg)
+        if len(names) != 2:
+            console.print("❗ Usage: pvp <trainer1> <trainer2>", style="yellow")
+            return
+        self.cli.handle_pvp_battle(*names)
+
+    def do_replay(self, arg):
+        """replay <battle_id> - replay a recorded PvP battle"""
+        if not arg.strip().isdigit():
+            console.print("❗ Usage: replay <battle_id>", style="yellow")
+            return
+        self.cli.handle_replay_battle(int(arg))
@@ -0,0 +1,33 @@
+"""
+Test setup - every test run plays in its own throwaway database file.
+DATABASE_URL has to be set before config.py is first imported, so it is
+done here, ahead of any test module.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_db_dir = tempfile.mkdtemp(prefix="monster-game-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_db_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def engine():
+    from database import ensure_database
+    from game_engine import GameEngine
+
+    ensure_database()
+    game_engine = GameEngine()
+    yield game_engine
+    game_engine.db.close()
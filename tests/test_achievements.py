@@ -0,0 +1,60 @@
+"""Achievements unlocked event by event must be exactly what a full rescan of the tables finds"""
+
+import itertools
+import random
+
+from sqlalchemy import delete
+
+from models import Battle, Player, PlayerAchievement, PlayerCounter, PlayerMonster
+
+_names = itertools.count(1)
+
+
+def full_rescan(engine, player_id):
+    """Every achievement the player's tables qualify for (how check_achievements used to decide)"""
+    db = engine.db
+    player = db.get(Player, player_id)
+    values = {
+        "catch_count": db.query(PlayerMonster).filter(PlayerMonster.player_id == player_id).count(),
+        "battle_wins": db.query(Battle).filter(Battle.winner_id == player_id).count(),
+        "player_level": player.level,
+    }
+    return {a.id for a in engine.game_data.achievements if values.get(a.requirement_type, -1) >= a.requirement_value}
+
+
+def unlocked(engine, player_id):
+    return {row.achievement_id for row in engine.db.query(PlayerAchievement).filter_by(player_id=player_id)}
+
+
+def test_incremental_unlocks_match_a_rescan(engine):
+    player = engine.create_player(f"achiever{next(_names)}")
+    species = engine.game_data.species
+    rng = random.Random(3)
+    for _ in range(150):
+        event = rng.random()
+        if event < 0.4:
+            engine.create_player_monster(player.id, rng.choice(species).id)
+        elif event < 0.8:
+            engine.record_battle(player.id, None, player.id, "wild", 0, 0, b"")
+        else:
+            engine.award_experience(player.id, rng.randint(10, 400))
+        assert unlocked(engine, player.id) == full_rescan(engine, player.id)
+    reported = {a.id for a in engine.check_achievements(player.id)}
+    assert reported == unlocked(engine, player.id)
+    assert engine.check_achievements(player.id) == []
+
+
+def test_old_save_without_counters_catches_up(engine):
+    player = engine.create_player(f"oldsave{next(_names)}")
+    engine.check_achievements(player.id)   # Hand out the starter monster's unlock first
+    species = engine.game_data.species
+    # Rows written straight to the tables, as an old save would have them
+    engine.db.add_all(PlayerMonster(player_id=player.id, species_id=species[i % len(species)].id, level=1,
+                                    hp=10, max_hp=10, attack=5, defense=5, speed=5) for i in range(12))
+    engine.db.add_all(Battle(player1_id=player.id, winner_id=player.id, battle_type="wild") for _ in range(11))
+    engine.db.query(PlayerAchievement).filter_by(player_id=player.id).delete()
+    engine.db.execute(delete(PlayerCounter).where(PlayerCounter.player_id == player.id))
+    engine.db.commit()
+
+    reported = {a.id for a in engine.check_achievements(player.id)}
+    assert reported == unlocked(engine, player.id) == full_rescan(engine, player.id)
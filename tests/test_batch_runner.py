@@ -0,0 +1,42 @@
+"""Batch actions: bad arguments fail only their own action, and unlocks come back with the action that earned them"""
+
+import itertools
+
+from batch_runner import BatchRunner
+
+_names = itertools.count(1)
+
+
+def run(engine, actions):
+    return list(BatchRunner(engine, batch_size=50).run(actions))
+
+
+def test_unlocks_are_reported_with_their_action(engine):
+    name = f"bot{next(_names)}"
+    results = run(engine, [{"action": "create", "args": {"username": name}}] +
+                  [{"player": name, "action": "battle"} for _ in range(3)])
+    created = results[0]
+    assert created["ok"]
+    # The starter monster is the first catch
+    assert {"player_id": created["player_id"], "name": "First Catch"} in created["achievements_unlocked"]
+    reported = [u["name"] for r in results for u in r.get("achievements_unlocked", [])]
+    assert len(reported) == len(set(reported))
+    assert engine.pop_pending_achievements() == {}
+
+
+def test_bad_arguments_fail_alone(engine):
+    name, rival = f"bot{next(_names)}", f"bot{next(_names)}"
+    results = run(engine, [
+        {"action": "create", "args": {"username": name}},
+        {"action": "create", "args": {"username": rival}},
+        {"player": name, "action": "pvp", "args": {"opponent": rival, "seed": -1}},
+        {"player": name, "action": "pvp", "args": {"opponent": rival, "seed": 2 ** 64}},
+        {"action": "leaderboard", "args": {"limit": "x"}},
+        {"action": "leaderboard", "args": {"limit": 0}},
+        {"player": name, "action": "pvp", "args": {"opponent": rival, "seed": 5}},
+        {"action": "leaderboard", "args": {"limit": 3}},
+    ])
+    assert [r["ok"] for r in results] == [True, True, False, False, False, False, True, True]
+    assert "args.seed" in results[2]["error"] and "args.limit" in results[4]["error"]
+    assert results[6]["seed"] == 5
+    assert len(results[7]["top"]) == 3
@@ -0,0 +1,60 @@
+"""Packed battle records decode back to what was packed, old JSON rows included"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from battle_codec import pack_legacy, pack_pvp, pack_wild, unpack
+from game_engine import Combatant
+
+SPECIES = {7: SimpleNamespace(id=7, name="Flamewyrm", type="Fire", type_id=2),
+           9: SimpleNamespace(id=9, name="Aquafin", type="Water", type_id=3)}
+SPECIES_BY_NAME = {s.name: s for s in SPECIES.values()}
+WILD = {"level": 12, "hp": 0, "max_hp": 61, "attack": 30, "defense": 22, "speed": 18}
+FIGHTERS = [Combatant(101, 1, 7, 2, "Flamewyrm", 15, 40, 70, 33, 21, 25),
+            Combatant(202, 2, 9, 3, "Aquafin", 14, 66, 66, 28, 30, 19)]
+
+COMBATANT_FIELDS = ("monster_id", "player_id", "species_id", "level", "hp", "max_hp", "attack", "defense", "speed")
+
+
+def test_wild_round_trip():
+    data = unpack(pack_wild(WILD, 7))
+    assert data == {"species_id": 7, **WILD}
+
+
+def test_wild_names_come_from_game_data():
+    data = unpack(pack_wild(WILD, 7), SPECIES)
+    assert (data["name"], data["type"], data["type_id"]) == ("Flamewyrm", "Fire", 2)
+
+
+@pytest.mark.parametrize("seed", [0, 12345, 2 ** 32 - 1, 2 ** 64 - 1])
+def test_pvp_round_trip(seed):
+    data = unpack(pack_pvp(seed, FIGHTERS), SPECIES)
+    assert data["seed"] == seed
+    assert len(data["combatants"]) == 2
+    for fighter, row in zip(FIGHTERS, data["combatants"]):
+        assert {name: row[name] for name in COMBATANT_FIELDS} == {name: getattr(fighter, name) for name in COMBATANT_FIELDS}
+        assert row["name"] == fighter.name
+
+
+def test_legacy_pvp_json_packs_like_a_new_record():
+    text = json.dumps({"seed": 99, "combatants": [f.snapshot() for f in FIGHTERS]})
+    assert pack_legacy("player", text, SPECIES_BY_NAME) == pack_pvp(99, FIGHTERS)
+
+
+def test_legacy_wild_json_packs_like_a_new_record():
+    text = json.dumps({"name": "Aquafin", "type": "Water", **WILD})
+    blob = pack_legacy("wild", text, SPECIES_BY_NAME)
+    assert blob == pack_wild(WILD, 9)
+    assert unpack(blob, SPECIES)["name"] == "Aquafin"
+
+
+@pytest.mark.parametrize("battle_type, text", [
+    ("wild", "not json"),
+    ("wild", json.dumps({"name": "Nobodymon", **WILD})),
+    ("wild", json.dumps({"name": "Aquafin", "level": 3})),
+    ("player", json.dumps({"seed": -1, "combatants": [f.snapshot() for f in FIGHTERS]})),
+])
+def test_legacy_rows_that_cannot_be_packed(battle_type, text):
+    assert pack_legacy(battle_type, text, SPECIES_BY_NAME) is None
@@ -0,0 +1,52 @@
+"""Keyset collection pages: every monster shows up exactly once, in order, even with tied sort values"""
+
+import random
+
+import pytest
+
+from models import PlayerMonster
+
+
+@pytest.fixture
+def trainer(engine):
+    player = engine.create_player(f"keyset{random.getrandbits(32)}")
+    species = engine.game_data.species
+    rng = random.Random(5)
+    # Only three levels, so most monsters tie with many others on every stat
+    for _ in range(60):
+        engine.create_player_monster(player.id, rng.choice(species).id, level=rng.choice([3, 5, 8]))
+    return player
+
+
+def sort_key(sort):
+    name = sort.lstrip("-")
+    sign = -1 if sort.startswith("-") else 1
+    return lambda m: (sign * getattr(m, name), sign * m.id)
+
+
+@pytest.mark.parametrize("sort", ["id", "-id", "level", "-level", "attack", "-hp"])
+@pytest.mark.parametrize("limit", [1, 7, 20])
+def test_pages_cover_every_monster_once(engine, trainer, sort, limit):
+    everyone = engine.db.query(PlayerMonster).filter(PlayerMonster.player_id == trainer.id).all()
+    seen, cursor = [], None
+    while True:
+        page = engine.get_collection(trainer.id, limit=limit, cursor=cursor, sort=sort)
+        assert len(page.monsters) <= limit
+        seen.extend(page.monsters)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert [m.id for m in seen] == [m.id for m in sorted(everyone, key=sort_key(sort))]
+
+
+def test_pages_with_a_filter(engine, trainer):
+    wanted = sorted(m.id for m in engine.db.query(PlayerMonster)
+                    .filter(PlayerMonster.player_id == trainer.id, PlayerMonster.level == 5))
+    seen, cursor = [], None
+    while True:
+        page = engine.get_collection(trainer.id, limit=4, cursor=cursor, sort="level", min_level=5, max_level=5)
+        seen.extend(m.id for m in page.monsters)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == wanted
@@ -0,0 +1,28 @@
+"""make_engine picks an explicit pool for SQLite and runs the storage profile on every connection"""
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, SingletonThreadPool
+
+from config import SQLITE_POOL_SIZE
+from database import make_engine
+
+
+def test_file_database_gets_a_queue_pool_with_the_profile(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'pool.db'}", "concurrent")
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == SQLITE_POOL_SIZE
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
+
+
+def test_memory_database_keeps_one_connection_per_thread():
+    engine = make_engine("sqlite://", "legacy")
+    assert isinstance(engine.pool, SingletonThreadPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE kept (x INTEGER)"))
+    # A second checkout is the same connection, so the same in-memory database
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM kept")).scalar() == 0
+    engine.dispose()
@@ -0,0 +1,52 @@
+"""The alias table picks each index as often as its weight says"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from encounters import AliasTable, EncounterTable
+
+WEIGHTS = [50, 30, 15, 4, 1, 0]
+
+
+def exact_shares(table):
+    """Chance of each index, read straight off the prob/alias columns"""
+    shares = [0.0] * table.size
+    for column in range(table.size):
+        shares[column] += table.prob[column] / table.size
+        shares[table.alias[column]] += (1 - table.prob[column]) / table.size
+    return shares
+
+
+@pytest.mark.parametrize("weights", [WEIGHTS, [1], [3, 3, 3], [1, 1000], list(range(1, 40))])
+def test_columns_add_up_to_the_weights(weights):
+    total = sum(weights)
+    for share, weight in zip(exact_shares(AliasTable(weights)), weights):
+        assert share == pytest.approx(weight / total, abs=1e-9)
+
+
+def test_draw_frequencies_match_the_weights():
+    table = AliasTable(WEIGHTS)
+    rng = random.Random(42)
+    draws = 200_000
+    counts = Counter(table.sample(rng) for _ in range(draws))
+    total = sum(WEIGHTS)
+    for index, weight in enumerate(WEIGHTS):
+        assert counts[index] / draws == pytest.approx(weight / total, abs=0.005)
+    assert counts[WEIGHTS.index(0)] == 0
+
+
+@pytest.mark.parametrize("weights", [[], [0, 0]])
+def test_rejects_unusable_weights(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_zero_weight_rarities_never_appear(engine):
+    species = engine.game_data.species
+    rarities = {s.rarity for s in species}
+    banned = sorted(rarities)[0]
+    table = EncounterTable(species, {rarity: 0 if rarity == banned else 1 for rarity in rarities})
+    rng = random.Random(1)
+    assert all(table.draw(rng).rarity != banned for _ in range(5000))
@@ -0,0 +1,59 @@
+"""Evolution steps come from the evolutions table and whole chains resolve in one lookup"""
+
+import itertools
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from config import EXP_PER_LEVEL
+from game_data import GameData
+from models import Base, Evolution, MonsterSpecies, PlayerMonster
+
+_names = itertools.count(1)
+
+
+def game_data_with(tmp_path, steps):
+    """Load GameData from a fresh database holding species A-F and these (from, to, level) steps"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'evolutions.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for name in "ABCDEF":
+            db.add(MonsterSpecies(name=name, type="Normal", base_hp=40, base_attack=40, base_defense=40,
+                                  base_speed=40, rarity="common", description="", catch_rate=0.5))
+        db.flush()
+        ids = dict(db.query(MonsterSpecies.name, MonsterSpecies.id).all())
+        for source, target, level in steps:
+            db.add(Evolution(species_id=ids[source], evolves_to_id=ids[target], level=level))
+        db.commit()
+        return GameData.load(db), ids
+
+
+def test_chains_resolve_from_the_table(tmp_path):
+    data, ids = game_data_with(tmp_path, [("A", "B", 10), ("B", "C", 20), ("C", "D", 15)])
+    evolutions = data.evolutions
+    a, b, c, d = (ids[name] for name in "ABCD")
+    assert evolutions.final_form(a, 9) is None
+    assert evolutions.final_form(a, 10) == b
+    # C -> D is listed at 15, but nothing reaches C before 20
+    assert evolutions.final_form(a, 19) == b
+    assert evolutions.final_form(a, 20) == d
+    assert evolutions.path(a, 50) == (b, c, d)
+    assert evolutions.final_form(c, 15) == d
+    assert evolutions.final_form(d, 99) is None
+
+
+def test_loops_in_bad_data_stop(tmp_path):
+    data, ids = game_data_with(tmp_path, [("E", "F", 5), ("F", "E", 6)])
+    assert data.evolutions.path(ids["E"], 99) == (ids["F"],)
+
+
+def test_level_up_evolves_through_the_engine(engine):
+    player = engine.create_player(f"evolver{next(_names)}")
+    flamewyrm = engine.game_data.species_by_name["Flamewyrm"]
+    monster = engine.create_player_monster(player.id, flamewyrm.id, level=9)
+    monster.experience = 9 * EXP_PER_LEVEL + 50   # Enough for level 10 only
+    engine.check_monster_level_up(monster)
+    engine.db.commit()
+    assert engine.db.get(PlayerMonster, monster.id).species_id == engine.game_data.species_by_name["Flarelord"].id
+    events = engine.pop_evolution_events(monster.id)
+    assert [(e.from_species, e.to_species) for e in events] == [("Flamewyrm", "Flarelord")]
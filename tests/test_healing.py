@@ -0,0 +1,77 @@
+"""Paid heals can't overdraw, and passive healing is worked out lazily from hp_updated_at"""
+
+import itertools
+import time
+
+import pytest
+
+import models
+from config import EXP_PER_LEVEL
+from models import Player, PlayerMonster
+
+_names = itertools.count(1)
+
+
+@pytest.fixture
+def regen(monkeypatch):
+    """Passive healing on: 1% of max HP a minute"""
+    monkeypatch.setattr(models, "HP_REGEN_PER_MINUTE", 0.01)
+
+
+def hurt_monster(engine, hp=10, minutes_ago=0):
+    player = engine.create_player(f"healer{next(_names)}")
+    species = engine.game_data.species_by_name["Aquafin"]
+    monster = engine.create_player_monster(player.id, species.id, level=5)
+    monster.hp = hp
+    monster.hp_updated_at = int(time.time()) - minutes_ago * 60
+    engine.db.commit()
+    return player, monster
+
+
+def test_heal_for_money_rejects_an_overdraft(engine):
+    player, monster = hurt_monster(engine)
+    player.money = 49
+    engine.db.commit()
+    assert engine.heal_for_money(player.id, 50) is False
+    engine.db.expire_all()
+    assert engine.db.get(Player, player.id).money == 49
+    assert engine.db.get(PlayerMonster, monster.id).hp == 10
+
+
+def test_heal_for_money_takes_the_fee_once(engine):
+    player, monster = hurt_monster(engine)
+    player.money = 60
+    engine.db.commit()
+    assert engine.heal_for_money(player.id, 50) is True
+    assert engine.heal_for_money(player.id, 50) is False
+    engine.db.expire_all()
+    assert engine.db.get(Player, player.id).money == 10
+    healed = engine.db.get(PlayerMonster, monster.id)
+    assert healed.hp == healed.max_hp
+
+
+def test_current_hp_regenerates_lazily(engine, regen):
+    _, monster = hurt_monster(engine, hp=10, minutes_ago=30)
+    expected = min(monster.max_hp, 10 + int(30 * 60 * 0.01 / 60 * monster.max_hp))
+    assert monster.hp == 10   # Nothing is written until HP changes
+    assert monster.current_hp == expected
+    # The SQL version filters the same way
+    matching = engine.db.query(PlayerMonster.id).filter(
+        PlayerMonster.id == monster.id, PlayerMonster.current_hp_expr() >= expected).all()
+    assert matching == [(monster.id,)]
+
+
+def test_current_hp_stops_at_max(engine, regen):
+    _, monster = hurt_monster(engine, hp=1, minutes_ago=10_000)
+    assert monster.current_hp == monster.max_hp
+
+
+def test_level_up_keeps_passive_healing(engine, regen):
+    _, monster = hurt_monster(engine, hp=10, minutes_ago=30)
+    healed = monster.current_hp
+    old_max = monster.max_hp
+    monster.experience = monster.level * EXP_PER_LEVEL
+    assert engine.check_monster_level_up(monster)
+    gained = monster.max_hp - old_max
+    assert monster.hp == min(healed + gained, monster.max_hp)
+    assert monster.current_hp == monster.hp
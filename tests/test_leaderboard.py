@@ -0,0 +1,48 @@
+"""The incrementally kept leaderboard must agree with rebuild_leaderboard(), ties included"""
+
+import itertools
+import random
+
+from models import LeaderboardEntry
+
+_names = itertools.count(1)
+
+
+def rows(engine, player_ids):
+    """Our players' leaderboard lines, in get_leaderboard order"""
+    everyone = engine.get_leaderboard(engine.db.query(LeaderboardEntry).count())
+    return [(e.player_id, e.username, e.level, e.experience, e.monster_count, e.battle_wins)
+            for e in everyone if e.player_id in player_ids]
+
+
+def test_incremental_rows_match_a_rebuild(engine):
+    players = [engine.create_player(f"ranked{next(_names)}") for _ in range(8)]
+    ids = {p.id for p in players}
+    species = engine.game_data.species
+    rng = random.Random(11)
+    for _ in range(120):
+        player = rng.choice(players)
+        event = rng.random()
+        if event < 0.3:
+            engine.create_player_monster(player.id, rng.choice(species).id)
+        elif event < 0.6:
+            other = rng.choice(players)
+            engine.record_battle(player.id, other.id, rng.choice([player.id, other.id]), "player", 0, 0, b"")
+        elif event < 0.8:
+            engine.award_experience(player.id, rng.randint(1, 300))
+        else:
+            engine.award_experience_bulk([p.id for p in rng.sample(players, 3)], rng.randint(1, 300))
+    engine.db.expire_all()
+    incremental = rows(engine, ids)
+    engine.rebuild_leaderboard()
+    assert rows(engine, ids) == incremental
+
+
+def test_ties_go_to_the_oldest_account(engine):
+    players = [engine.create_player(f"tied{next(_names)}") for _ in range(5)]
+    ids = [p.id for p in players]
+    for player_id in reversed(ids):
+        engine.award_experience(player_id, 7)
+    assert [row[0] for row in rows(engine, set(ids))] == ids
+    engine.rebuild_leaderboard()
+    assert [row[0] for row in rows(engine, set(ids))] == ids
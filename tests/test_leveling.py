@@ -0,0 +1,37 @@
+"""The closed-form level math has to agree with the old one-level-at-a-time loop"""
+
+import random
+
+import pytest
+
+from leveling import level_for_experience, total_experience
+
+
+def level_up_loop(level, experience, per_level):
+    # How check_level_up used to do it
+    while experience >= level * per_level:
+        experience -= level * per_level
+        level += 1
+    return level, experience
+
+
+@pytest.mark.parametrize("per_level", [1, 7, 100, 250])
+def test_matches_loop_on_random_experience(per_level):
+    rng = random.Random(per_level)
+    for _ in range(2000):
+        level = rng.randint(1, 100)
+        experience = rng.randint(0, 200 * per_level * rng.randint(1, 50))
+        assert level_for_experience(level, experience, per_level) == level_up_loop(level, experience, per_level)
+
+
+@pytest.mark.parametrize("per_level", [1, 100])
+def test_exact_level_boundaries(per_level):
+    for level in range(1, 60):
+        cost = level * per_level
+        for experience in (cost - 1, cost, cost + 1, cost + (level + 1) * per_level):
+            assert level_for_experience(level, experience, per_level) == level_up_loop(level, experience, per_level)
+
+
+def test_total_experience_round_trips():
+    new_level, left = level_for_experience(3, 12345, 100)
+    assert total_experience(new_level, left, 100) == total_experience(3, 12345, 100)
@@ -0,0 +1,64 @@
+"""An old save file (tables from before any migration) upgrades to the current schema with its data intact"""
+
+import sqlite3
+
+from sqlalchemy import create_engine, inspect, text
+
+from migrations import LATEST_VERSION, MIGRATIONS, run_migrations
+from models import Base
+
+OLD_SCHEMA = """
+CREATE TABLE players (
+    id INTEGER NOT NULL, username VARCHAR, level INTEGER, experience INTEGER, money INTEGER,
+    created_at DATETIME, PRIMARY KEY (id));
+CREATE UNIQUE INDEX ix_players_username ON players (username);
+CREATE TABLE player_monsters (
+    id INTEGER NOT NULL, player_id INTEGER, species_id INTEGER, nickname VARCHAR, level INTEGER,
+    experience INTEGER, hp INTEGER, max_hp INTEGER, attack INTEGER, defense INTEGER, speed INTEGER,
+    caught_at DATETIME, PRIMARY KEY (id));
+CREATE TABLE battles (
+    id INTEGER NOT NULL, player1_id INTEGER, player2_id INTEGER, winner_id INTEGER, battle_type VARCHAR,
+    battle_data TEXT, experience_gained INTEGER, money_gained INTEGER, created_at DATETIME, PRIMARY KEY (id));
+INSERT INTO players VALUES (1, 'nasra', 3, 40, 500, NULL), (2, 'denis', 3, 40, 100, NULL), (3, 'cedo', 1, 0, 0, NULL);
+INSERT INTO player_monsters VALUES
+    (1, 1, 1, NULL, 5, 0, 10, 30, 8, 8, 8, NULL), (2, 1, 2, NULL, 3, 0, 20, 20, 6, 6, 6, NULL),
+    (3, 2, 1, NULL, 4, 0, 25, 25, 7, 7, 7, NULL);
+INSERT INTO battles VALUES
+    (1, 1, NULL, 1, 'wild', '{}', 10, 5, NULL), (2, 1, 2, 2, 'player', '{}', 0, 0, NULL),
+    (3, 2, NULL, 2, 'wild', '{}', 10, 5, NULL), (4, 3, NULL, NULL, 'wild', '{}', 0, 0, NULL);
+"""
+
+
+def old_save(tmp_path):
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(OLD_SCHEMA)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)   # init_database does this first: only the missing tables appear
+    return engine
+
+
+def test_old_save_upgrades(tmp_path):
+    engine = old_save(tmp_path)
+    applied = run_migrations(engine)
+    assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+
+    schema = inspect(engine)
+    assert "hp_updated_at" in {c["name"] for c in schema.get_columns("player_monsters")}
+    assert "battle_blob" in {c["name"] for c in schema.get_columns("battles")}
+    assert {"ix_player_monsters_player_level", "ix_battles_winner_id"} <= \
+        {i["name"] for t in ("player_monsters", "battles") for i in schema.get_indexes(t)}
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() == LATEST_VERSION
+        assert conn.execute(text("SELECT COUNT(*) FROM player_monsters WHERE hp_updated_at IS NULL")).scalar() == 0
+        assert conn.execute(text("SELECT hp FROM player_monsters WHERE id = 1")).scalar() == 10
+        board = conn.execute(text("SELECT player_id, level, experience, monster_count, battle_wins "
+                                  "FROM leaderboard ORDER BY player_id")).all()
+    assert [tuple(row) for row in board] == [(1, 3, 40, 2, 1), (2, 3, 40, 1, 2), (3, 1, 0, 0, 0)]
+
+
+def test_migrations_run_once(tmp_path):
+    engine = old_save(tmp_path)
+    run_migrations(engine)
+    assert run_migrations(engine) == []
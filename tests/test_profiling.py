@@ -0,0 +1,36 @@
+"""Every engine module lands in the engine bucket, and class bodies aren't listed as functions"""
+
+import os
+
+import game_data
+import profiling
+from profiling import CommandProfiler, bucket_for, class_body_lines
+
+
+def test_every_game_module_is_engine_work():
+    for name in ("encounters.py", "achievements.py", "type_chart.py", "battle_sim.py", "worldgen.py"):
+        assert bucket_for(os.path.join(profiling.ROOT, name), "f") == "engine"
+    assert bucket_for(os.path.join(profiling.ROOT, "cli.py"), "f") == "rendering"
+
+
+def test_class_lines_come_from_the_source():
+    with open(game_data.__file__, encoding="utf-8") as source:
+        lines = source.read().splitlines()
+    assert {lines[n - 1].split("(")[0].split(":")[0] for n in class_body_lines(game_data.__file__)} >= {
+        "class SpeciesRecord", "class StatCurve", "class GameData"}
+
+
+def test_class_bodies_are_not_functions():
+    with open(game_data.__file__, encoding="utf-8") as source:
+        code = compile(source.read(), game_data.__file__, "exec")
+    profiler = CommandProfiler(top=1000)
+    profiler.start()
+    # Running the module again in a scratch namespace runs every class body
+    namespace = {"__name__": "scratch_game_data"}
+    exec(code, namespace)
+    namespace["StatCurve"](namespace["SpeciesRecord"](1, "A", "fire", 10, 10, 10, 10, "common", "", 0.5, 0))
+    profiler.stop()
+
+    listed = [row[0] for row in profiler.top_functions()]
+    assert any("(__init__)" in row for row in listed)
+    assert not any("(SpeciesRecord)" in row or "(StatCurve)" in row or "(GameData)" in row for row in listed)
@@ -0,0 +1,46 @@
+"""A recorded PvP battle replays from its seed and snapshots to exactly what was fought"""
+
+import itertools
+
+import pytest
+
+from game_engine import Combatant
+from models import Battle
+
+_names = itertools.count(1)
+
+
+@pytest.fixture
+def rivals(engine):
+    monsters = []
+    for species in ("Flamewyrm", "Aquafin"):
+        player = engine.create_player(f"rival{next(_names)}")
+        monsters.append(engine.create_player_monster(player.id, engine.game_data.species_by_name[species].id, level=8))
+    return monsters
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42, 2 ** 32 - 1, 2 ** 64 - 1])
+def test_replay_equals_the_record(engine, rivals, seed):
+    engine.heal_all_monsters(rivals[0].player_id)
+    engine.heal_all_monsters(rivals[1].player_id)
+    fought = engine.pvp_battle(*rivals, seed=seed)
+    replay = engine.replay_pvp_battle(fought["battle_id"])
+    assert replay["matches_record"]
+    assert (replay["seed"], replay["winner_id"], replay["turns"]) == (seed, fought["winner_id"], fought["turns"])
+    # The live log only adds the rewards after the fight itself
+    assert fought["battle_log"][:len(replay["battle_log"])] == replay["battle_log"]
+    assert engine.db.get(Battle, fought["battle_id"]).winner_id == fought["winner_id"]
+
+
+def test_same_seed_same_fight(engine, rivals):
+    species = engine.game_data.species_by_id
+    snapshots = [Combatant.from_monster(m, species[m.species_id]).snapshot() for m in rivals]
+    runs = [engine.resolve_pvp(Combatant(*snapshots[0]), Combatant(*snapshots[1]), 1234) for _ in range(2)]
+    (winner_a, turns_a, log_a), (winner_b, turns_b, log_b) = runs
+    assert (getattr(winner_a, "player_id", None), turns_a, log_a) == (getattr(winner_b, "player_id", None), turns_b, log_b)
+
+
+def test_replay_rejects_wild_battles(engine, rivals):
+    battle = engine.record_battle(rivals[0].player_id, None, None, "wild", 0, 0, b"")
+    with pytest.raises(ValueError):
+        engine.replay_pvp_battle(battle.id)
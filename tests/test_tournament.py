@@ -0,0 +1,68 @@
+"""Tournaments give the same results however many workers play them, and record like real PvP battles"""
+
+import itertools
+
+import pytest
+from sqlalchemy import func
+
+from models import Battle, LeaderboardEntry, PlayerCounter
+from tournament import MAX_SEED, Tournament, load_entrants
+
+_names = itertools.count(1)
+
+
+@pytest.fixture
+def entrants(engine):
+    species = engine.game_data.species
+    player_ids = []
+    for p in range(5):
+        player = engine.create_player(f"league{next(_names)}")
+        for m in range(3):
+            engine.create_player_monster(player.id, species[(p * 3 + m) % len(species)].id, level=5 + (p + m) % 6)
+        player_ids.append(player.id)
+    return load_entrants(engine, player_ids)
+
+
+@pytest.mark.parametrize("fmt", ["round-robin", "bracket"])
+def test_same_result_with_one_or_many_workers(entrants, fmt):
+    runs = []
+    for workers in (1, 3):
+        tournament = Tournament(entrants, fmt, seed=99, workers=workers, chunk_size=7)
+        played = tournament.run()
+        runs.append((played, tournament.standings(), tournament.champion))
+    assert runs[0] == runs[1]
+    played, standings, _ = runs[0]
+    # 20 monsters (a starter and 3 more per trainer): each meets the 16 of other trainers
+    expected = 20 * 16 // 2 if fmt == "round-robin" else 19
+    assert played == expected
+    assert sum(line.wins for line in standings) + sum(line.draws for line in standings) // 2 == expected
+
+
+def test_recording_keeps_counters_and_leaderboard_in_step(engine, entrants):
+    player_ids = sorted({e.player_id for e in entrants})
+    engine.pop_pending_achievements()   # The fixture's catches
+    tournament = Tournament(entrants, seed=3, workers=2, chunk_size=10)
+    played = tournament.run(engine)
+    assert tournament.recorded == played
+
+    wins = dict(engine.db.query(Battle.winner_id, func.count()).filter(Battle.winner_id.in_(player_ids))
+                .group_by(Battle.winner_id).all())
+    engine.db.expire_all()
+    for player_id in player_ids:
+        assert engine.db.get(PlayerCounter, player_id).battle_wins == wins.get(player_id, 0)
+    incremental = {e.player_id: (e.level, e.experience, e.monster_count, e.battle_wins)
+                   for e in engine.db.query(LeaderboardEntry).filter(LeaderboardEntry.player_id.in_(player_ids))}
+    engine.rebuild_leaderboard()
+    rebuilt = {e.player_id: (e.level, e.experience, e.monster_count, e.battle_wins)
+               for e in engine.db.query(LeaderboardEntry).filter(LeaderboardEntry.player_id.in_(player_ids))}
+    assert incremental == rebuilt
+    assert tournament.unlocked == sum(len(v) for k, v in engine.pop_pending_achievements().items() if k in player_ids)
+
+    battle = engine.db.query(Battle).filter(Battle.player1_id.in_(player_ids)).first()
+    assert engine.replay_pvp_battle(battle.id)["matches_record"]
+
+
+@pytest.mark.parametrize("seed", [-1, MAX_SEED + 1])
+def test_rejects_seeds_that_cannot_be_recorded(entrants, seed):
+    with pytest.raises(ValueError):
+        Tournament(entrants, seed=seed)
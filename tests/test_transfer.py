@@ -0,0 +1,78 @@
+"""Export -> import gives the same monsters back; bad rows are skipped with their line and reason"""
+
+import io
+import itertools
+import json
+
+import pytest
+
+from models import LeaderboardEntry, Player, PlayerCounter
+from transfer import export_monsters, import_monsters
+
+_names = itertools.count(1)
+
+
+def trainer_with_monsters(engine, count=12):
+    player = engine.create_player(f"mover{next(_names)}")
+    species = engine.game_data.species
+    for i in range(count):
+        engine.create_player_monster(player.id, species[i % len(species)].id, level=1 + i % 7)
+    return player
+
+
+def exported(engine, player_id, fmt):
+    out = io.StringIO()
+    export_monsters(engine.db, out, fmt, player_id)
+    return out.getvalue()
+
+
+def comparable(text, fmt):
+    """Exported rows without the parts an import is allowed to change (id and owner)"""
+    if fmt == "csv":
+        lines = text.splitlines()[1:]
+        return [line.split(",", 2)[2] for line in lines]
+    return [{k: v for k, v in json.loads(line).items() if k not in ("id", "owner")} for line in text.splitlines()]
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_round_trip(engine, fmt):
+    source = trainer_with_monsters(engine)
+    text = exported(engine, source.id, fmt)
+    copy_name = f"copy{next(_names)}"
+    report = import_monsters(engine, io.StringIO(text.replace(source.username, copy_name)), fmt, chunk_size=5)
+    assert (report.imported, report.players_created, report.errors) == (13, 1, [])
+
+    copy = engine.db.query(Player).filter_by(username=copy_name).one()
+    assert comparable(exported(engine, copy.id, fmt), fmt) == comparable(text, fmt)
+    # Imported monsters count as catches: counters, unlocks and the leaderboard all know about them
+    assert engine.db.get(PlayerCounter, copy.id).catch_count == 13
+    assert engine.db.get(LeaderboardEntry, copy.id).monster_count == 13
+    assert report.achievements == len(engine.check_achievements(copy.id)) == 3
+
+
+def test_bad_rows_are_reported(engine):
+    source = trainer_with_monsters(engine, 1)
+    good = json.loads(exported(engine, source.id, "ndjson").splitlines()[0])
+    rows = [
+        json.dumps(good),
+        "{not json",
+        json.dumps({**good, "species": "Nobodymon"}),
+        json.dumps({**good, "owner": ""}),
+        json.dumps({**good, "level": 0}),
+        json.dumps({**good, "hp": good["max_hp"] + 1}),
+        json.dumps({**good, "attack": "lots"}),
+        json.dumps({**good, "caught_at": "yesterday"}),
+        json.dumps({**good, "owner": "nobody-by-this-name"}),
+        "[1, 2]",
+        "",
+        json.dumps(good),
+    ]
+    report = import_monsters(engine, io.StringIO("\n".join(rows) + "\n"), "ndjson", create_players=False)
+    assert report.imported == 2
+    assert report.players_created == 0
+    assert [line for line, _ in report.errors] == [2, 3, 4, 5, 6, 7, 8, 9, 10]
+    reasons = dict(report.errors)
+    assert reasons[2].startswith("bad JSON")
+    assert reasons[3] == "unknown species 'Nobodymon'"
+    assert reasons[9] == "trainer not found"
+    assert engine.db.get(PlayerCounter, source.id).catch_count == 4   # Starter, one caught, two imported
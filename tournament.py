@@ -0,0 +1,315 @@
+"""
+Tournament Runner - Partner B's league night!
+Runs round-robin leagues and knockout brackets between players' monsters
+on every CPU core. Monsters are copied into plain snapshot lists first
+(see Combatant.snapshot), so the worker processes never need the
+database: they only get pairs of entrant numbers and run the same PvP
+turn loop as GameEngine.pvp_battle.
+
+Every match's seed is the tournament seed plus the match number, so a
+tournament gives the same results however many workers run it, and any
+recorded match can be replayed with replay_pvp_battle.
+"""
+
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select
+
+from battle_codec import pack_pvp
+from game_engine import Combatant, GameEngine
+from models import Battle, PlayerMonster
+
+FORMATS = ("round-robin", "bracket")
+CHUNK_SIZE = 2000        # Matches per work unit sent to a worker
+RECORD_CHUNK = 5000      # Battle rows written per insert when recording
+MAX_TURNS = 20
+MAX_SEED = 2 ** 32 - 1   # Match seeds (seed + match number) must fit the packed record's 64 bits
+
+# Match outcomes: who won, from the first entrant's side
+DRAW, FIRST, SECOND = 0, 1, 2
+
+
+class MatchResult(NamedTuple):
+    """One finished match, by entrant number"""
+    number: int
+    first: int
+    second: int
+    outcome: int
+    turns: int
+    first_hp: int
+    second_hp: int
+
+
+class Standing(NamedTuple):
+    """One entrant's line in the final table"""
+    entrant: int
+    monster_id: int
+    player_id: int
+    name: str
+    level: int
+    wins: int
+    losses: int
+    draws: int
+    points: int
+    damage: int
+
+
+# Worker side (one copy of the entrants per process)
+_entrants: List[list] = []
+_engine: Optional[GameEngine] = None
+
+# Per-entrant tally: wins, losses, draws, damage dealt
+WINS, LOSSES, DRAWS, DAMAGE = range(4)
+
+
+def _init_worker(entrants: List[list]):
+    global _entrants, _engine
+    from database import engine
+    engine.dispose(close=False)   # Connections inherited from the parent are never used here
+    _entrants = entrants
+    _engine = GameEngine()
+
+
+def _fight(number: int, first: int, second: int, seed: int) -> MatchResult:
+    a, b = Combatant(*_entrants[first]), Combatant(*_entrants[second])
+    winner, turns, _ = _engine.resolve_pvp(a, b, seed + number, MAX_TURNS, log=False)
+    outcome = FIRST if winner is a else SECOND if winner is b else DRAW
+    return MatchResult(number, first, second, outcome, turns, a.hp, b.hp)
+
+
+def _run_unit(unit: Tuple[List[Tuple[int, int, int]], int, bool]) -> Tuple[Dict[int, list], Optional[List[MatchResult]]]:
+    """
+    Fight one chunk of (match number, first, second) matchups and return
+    the chunk's per-entrant tallies, plus the matches themselves only when
+    `keep` is set (recording, or a bracket that needs to know who advances)
+    """
+    matches, seed, keep = unit
+    tally: Dict[int, list] = {}
+    kept = [] if keep else None
+    for number, first, second in matches:
+        match = _fight(number, first, second, seed)
+        a = tally.setdefault(first, [0, 0, 0, 0])
+        b = tally.setdefault(second, [0, 0, 0, 0])
+        a[DAMAGE] += _entrants[second][6] - match.second_hp
+        b[DAMAGE] += _entrants[first][6] - match.first_hp
+        if match.outcome == DRAW:
+            a[DRAWS] += 1
+            b[DRAWS] += 1
+        elif match.outcome == FIRST:
+            a[WINS] += 1
+            b[LOSSES] += 1
+        else:
+            b[WINS] += 1
+            a[LOSSES] += 1
+        if keep:
+            kept.append(match)
+    return tally, kept
+
+
+# Schedules
+def round_robin(owners: Sequence[int], chunk_size: int = CHUNK_SIZE) -> Iterator[List[Tuple[int, int, int]]]:
+    """Every entrant against every other entrant (not their own trainer's), chunk_size matches at a time"""
+    chunk, number = [], 0
+    for first in range(len(owners)):
+        for second in range(first + 1, len(owners)):
+            if owners[first] == owners[second]:
+                continue
+            chunk.append((number, first, second))
+            number += 1
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def bracket_round(alive: List[int], first_number: int) -> Tuple[List[Tuple[int, int, int]], List[int]]:
+    """Pair the top seed with the bottom seed and so on; returns (matches, entrants with a bye)"""
+    size = 1
+    while size < len(alive):
+        size *= 2
+    byes = size - len(alive)
+    matches, playing = [], alive[byes:]
+    for i in range(len(playing) // 2):
+        matches.append((first_number + i, playing[i], playing[-1 - i]))
+    return matches, alive[:byes]
+
+
+class Tournament:
+    """
+    A league or knockout between snapshot entrants, run on a process pool.
+    Only per-entrant tallies are kept; single matches are looked at as they
+    come back (to record them) and then dropped, so a league of millions
+    of matches needs no more memory than one of thousands.
+    """
+
+    def __init__(self, entrants: List[Combatant], fmt: str = "round-robin", seed: Optional[int] = None,
+                 workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown tournament format '{fmt}' (choose from {', '.join(FORMATS)})")
+        if len(entrants) < 2:
+            raise ValueError("A tournament needs at least two entrants")
+        if seed is not None and not 0 <= seed <= MAX_SEED:
+            raise ValueError(f"The tournament seed must be between 0 and {MAX_SEED}")
+        self.entrants = [c.snapshot() for c in entrants]
+        self.fmt = fmt
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.tally = [[0, 0, 0, 0] for _ in self.entrants]
+        self.matches = 0
+        self.recorded = 0
+        self.unlocked = 0    # Achievements the recorded wins unlocked
+        self.champion: Optional[int] = None
+        self.rounds_reached = [0] * len(self.entrants)   # Bracket only: how far each entrant got
+        self._recorder: Optional[GameEngine] = None
+        self._pending_rows: List[dict] = []
+
+    def run(self, record: Optional[GameEngine] = None) -> int:
+        """
+        Play every match and return how many were played. With `record`
+        (a GameEngine) every match between different trainers is saved as a
+        replayable PvP Battle, RECORD_CHUNK rows per transaction as results
+        arrive, each chunk moving its winners' win counters, unlocks and
+        leaderboard rows along with it.
+        """
+        self._recorder = record
+        if self.workers == 1:
+            _init_worker(self.entrants)
+            runner = None
+        else:
+            runner = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.entrants,))
+        try:
+            if self.fmt == "round-robin":
+                owners = [snapshot[1] for snapshot in self.entrants]
+                self._play(runner, round_robin(owners, self.chunk_size))
+            else:
+                self._play_bracket(runner)
+        finally:
+            if runner:
+                runner.shutdown()
+        if record is not None:
+            self._flush_battles()
+        return self.matches
+
+    def _play(self, runner, units, keep: bool = False) -> List[MatchResult]:
+        """
+        Run work units, keeping only a few per worker in flight so big
+        schedules stream; returns the single matches only when `keep` is set
+        """
+        keep_matches = keep or self._recorder is not None
+        kept = []
+
+        def collect(tally, matches):
+            for entrant, counts in tally.items():
+                totals = self.tally[entrant]
+                for i, count in enumerate(counts):
+                    totals[i] += count
+            if matches is not None:
+                self.matches += len(matches)
+                self._record(matches)
+                if keep:
+                    kept.extend(matches)
+            else:
+                self.matches += sum(counts[WINS] + counts[LOSSES] + counts[DRAWS] for counts in tally.values()) // 2
+
+        if runner is None:
+            for unit in units:
+                collect(*_run_unit((unit, self.seed, keep_matches)))
+            return kept
+        pending = set()
+        for unit in units:
+            pending.add(runner.submit(_run_unit, (unit, self.seed, keep_matches)))
+            if len(pending) >= self.workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(*future.result())
+        for future in pending:
+            collect(*future.result())
+        return kept
+
+    def _play_bracket(self, runner):
+        # Best seeds are the highest levels (then lowest entrant number)
+        alive = sorted(range(len(self.entrants)), key=lambda e: (-self.entrants[e][5], e))
+        round_number = 0
+        while len(alive) > 1:
+            round_number += 1
+            for entrant in alive:
+                self.rounds_reached[entrant] = round_number
+            matches, byes = bracket_round(alive, self.matches)
+            units = [matches[i:i + self.chunk_size] for i in range(0, len(matches), self.chunk_size)]
+            winners = {match.number: self._advancing(match) for match in self._play(runner, units, keep=True)}
+            alive = byes + [winners[number] for number, _, _ in matches]
+        self.champion = alive[0]
+        self.rounds_reached[self.champion] = round_number + 1
+
+    def _advancing(self, match: MatchResult) -> int:
+        """Winner of a knockout match; a draw goes to whoever has more HP left, then the better seed"""
+        if match.outcome != DRAW:
+            return match.first if match.outcome == FIRST else match.second
+        first_share = match.first_hp / self.entrants[match.first][7]
+        second_share = match.second_hp / self.entrants[match.second][7]
+        return match.second if second_share > first_share else match.first
+
+    def standings(self) -> List[Standing]:
+        """Table of wins/losses/draws (3 points a win, 1 a draw), best first (furthest first in a bracket)"""
+        table = [Standing(e, s[0], s[1], s[4], s[5], w, l, d, 3 * w + d, damage)
+                 for e, (s, (w, l, d, damage)) in enumerate(zip(self.entrants, self.tally))]
+        return sorted(table, key=lambda s: (-self.rounds_reached[s.entrant], -s.points, -s.wins,
+                                            -s.damage, -s.level, s.entrant))
+
+    # Recording
+    def _record(self, matches: List[MatchResult]):
+        """Queue these matches as Battle rows, writing a chunk whenever RECORD_CHUNK are waiting"""
+        if self._recorder is None:
+            return
+        for match in matches:
+            first, second = self.entrants[match.first], self.entrants[match.second]
+            if first[1] == second[1]:
+                continue    # Two of the same trainer's monsters met in the bracket
+            winner_id = None if match.outcome == DRAW else first[1] if match.outcome == FIRST else second[1]
+            self._pending_rows.append({
+                "player1_id": first[1], "player2_id": second[1], "winner_id": winner_id,
+                "battle_type": "player", "experience_gained": 0, "money_gained": 0,
+                "battle_blob": pack_pvp(self.seed + match.number, [Combatant(*first), Combatant(*second)]),
+            })
+            if len(self._pending_rows) >= RECORD_CHUNK:
+                self._flush_battles()
+
+    def _flush_battles(self):
+        """Write the waiting rows, with the winners' counters and leaderboard rows, as one transaction"""
+        if not self._pending_rows:
+            return
+        wins: Dict[int, int] = {}
+        for row in self._pending_rows:
+            if row["winner_id"] is not None:
+                wins[row["winner_id"]] = wins.get(row["winner_id"], 0) + 1
+        with self._recorder.transaction():
+            self.unlocked += self._recorder.add_to_counters("battle_wins", wins)
+            self._recorder.db.execute(insert(Battle), self._pending_rows)
+        self.recorded += len(self._pending_rows)
+        self._pending_rows = []
+
+
+def load_entrants(engine: GameEngine, player_ids: Optional[List[int]] = None,
+                  per_player: Optional[int] = None) -> List[Combatant]:
+    """Snapshot monsters as tournament entrants: everyone's (or these players'), their best `per_player` by level"""
+    rank = func.row_number().over(partition_by=PlayerMonster.player_id,
+                                  order_by=(PlayerMonster.level.desc(), PlayerMonster.id)).label("rank")
+    ranked = select(PlayerMonster.id, rank)
+    if player_ids:
+        ranked = ranked.where(PlayerMonster.player_id.in_(player_ids))
+    ranked = ranked.subquery()
+    query = select(PlayerMonster).join(ranked, ranked.c.id == PlayerMonster.id).order_by(PlayerMonster.id)
+    if per_player:
+        query = query.where(ranked.c.rank <= per_player)
+    species = engine.game_data.species_by_id
+    entrants = []
+    for monster in engine.db.execute(query.execution_options(yield_per=2000)).scalars():
+        entrant = Combatant.from_monster(monster, species[monster.species_id])
+        entrant.hp = entrant.max_hp    # Everyone starts a tournament at full health
+        entrants.append(entrant)
+    return entrants
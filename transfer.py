@@ -0,0 +1,227 @@
+"""
+Collection Transfer - Partner A's backup and moving van!
+Streams monsters out of the database as NDJSON (one JSON object per line)
+or CSV, optionally gzip-compressed, a chunk at a time so even millions
+of monsters never sit in memory together. The importer reads the same
+files back, checks every row and inserts them in bulk.
+
+Monsters are written with their trainer's username and species name
+(not ids), so a file from one database can be loaded into another.
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Dict, IO, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert, select
+
+from models import Player, PlayerMonster, MonsterSpecies, PlayerCounter, regenerated_hp
+
+FORMATS = ("ndjson", "csv")
+
+# Column order for both formats
+EXPORT_FIELDS = ["id", "owner", "species", "nickname", "level", "experience",
+                 "hp", "max_hp", "attack", "defense", "speed", "caught_at"]
+INT_FIELDS = ("level", "experience", "hp", "max_hp", "attack", "defense", "speed")
+
+CHUNK_SIZE = 1000
+
+
+def detect_format(path: str) -> str:
+    """ndjson or csv from a file name like 'backup.csv.gz' (ndjson unless it says csv)"""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return "csv" if name.endswith(".csv") else "ndjson"
+
+
+def open_file(path: str, mode: str, compress: Optional[bool] = None) -> IO[str]:
+    """Open a text file for reading ('r') or writing ('w'), gzipped if asked or if it ends in .gz; '-' is stdin/stdout"""
+    if compress is None:
+        compress = path.endswith(".gz")
+    if path == "-":
+        stream = sys.stdin if mode == "r" else sys.stdout
+        if compress:
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=stream.buffer, mode=mode + "b"), encoding="utf-8")
+        return stream
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+# Export
+def iter_monster_rows(db, player_id: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Every monster (or one player's) as a plain dict, fetched chunk_size rows at a time"""
+    query = select(
+        PlayerMonster.id, Player.username, MonsterSpecies.name, PlayerMonster.nickname,
+        PlayerMonster.level, PlayerMonster.experience, PlayerMonster.hp, PlayerMonster.max_hp,
+        PlayerMonster.attack, PlayerMonster.defense, PlayerMonster.speed, PlayerMonster.caught_at,
+        PlayerMonster.hp_updated_at,
+    ).join(Player, Player.id == PlayerMonster.player_id) \
+     .join(MonsterSpecies, MonsterSpecies.id == PlayerMonster.species_id) \
+     .order_by(PlayerMonster.id) \
+     .execution_options(yield_per=chunk_size)
+    if player_id is not None:
+        query = query.where(PlayerMonster.player_id == player_id)
+    now = int(time.time())
+    for row in db.execute(query):
+        record = dict(zip(EXPORT_FIELDS, row))
+        # Passive healing so far is baked in; the importing side starts a fresh clock
+        record["hp"] = regenerated_hp(record["hp"], record["max_hp"], row[-1], now)
+        record["caught_at"] = record["caught_at"].isoformat() if record["caught_at"] else None
+        yield record
+
+
+def export_monsters(db, output: IO[str], fmt: str = "ndjson", player_id: Optional[int] = None,
+                    chunk_size: int = CHUNK_SIZE) -> int:
+    """Write monsters to `output` as ndjson or csv, return how many were written"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}' (choose from {', '.join(FORMATS)})")
+    rows = iter_monster_rows(db, player_id, chunk_size)
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(output, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            output.write(json.dumps(row) + "\n")
+            count += 1
+    return count
+
+
+# Import
+class ImportReport(NamedTuple):
+    """What an import did: rows inserted, trainers created, (line, reason) for every skipped row and achievements unlocked"""
+    imported: int
+    players_created: int
+    errors: List[Tuple[int, str]]
+    achievements: int = 0
+
+
+def read_rows(source: IO[str], fmt: str = "ndjson") -> Iterator[Tuple[int, object]]:
+    """(line number, row) pairs; a row that isn't even parseable comes back as an Exception"""
+    if fmt == "csv":
+        reader = csv.DictReader(source)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, text in enumerate(source, 1):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            yield line_number, json.loads(text)
+        except json.JSONDecodeError as error:
+            yield line_number, error
+
+
+def validate_row(row, species_ids: Dict[str, int]) -> dict:
+    """Check one imported row and turn it into a player_monsters mapping (owner still a name)"""
+    if isinstance(row, Exception):
+        raise ValueError(f"bad JSON: {row}")
+    if not isinstance(row, dict):
+        raise ValueError("each row must be an object")
+    owner = (row.get("owner") or "").strip()
+    if not owner:
+        raise ValueError("missing owner")
+    species_id = species_ids.get(row.get("species"))
+    if species_id is None:
+        raise ValueError(f"unknown species '{row.get('species')}'")
+
+    mapping = {"owner": owner, "species_id": species_id, "nickname": row.get("nickname") or None}
+    for field in INT_FIELDS:
+        try:
+            mapping[field] = int(row.get(field))
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be a whole number") from None
+        if mapping[field] < 0:
+            raise ValueError(f"{field} can't be negative")
+    if mapping["level"] < 1:
+        raise ValueError("level must be at least 1")
+    if mapping["hp"] > mapping["max_hp"]:
+        raise ValueError("hp is above max_hp")
+
+    caught_at = row.get("caught_at")
+    try:
+        mapping["caught_at"] = datetime.fromisoformat(caught_at) if caught_at else datetime.utcnow()
+    except (TypeError, ValueError):
+        raise ValueError(f"bad caught_at '{caught_at}'") from None
+    return mapping
+
+
+def import_monsters(engine, source: IO[str], fmt: str = "ndjson", chunk_size: int = CHUNK_SIZE,
+                    create_players: bool = True) -> ImportReport:
+    """
+    Bulk load monsters from an export file through a GameEngine.
+    Each chunk is committed on its own, together with its trainers' catch
+    counters, unlocks and leaderboard rows; bad rows are skipped and reported.
+    New monsters get fresh ids, and trainers that don't exist yet are
+    created when create_players is on.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}' (choose from {', '.join(FORMATS)})")
+    db = engine.db
+    species_ids = {s.name: s.id for s in engine.game_data.species}
+    player_ids: Dict[str, Optional[int]] = {}
+    imported = created = unlocked = 0
+    errors: List[Tuple[int, str]] = []
+
+    def resolve_owners(usernames: set):
+        """Look up (and maybe create) every trainer in one go, 500 names per query"""
+        nonlocal created
+        names = sorted(usernames)
+        for start in range(0, len(names), 500):
+            batch = names[start:start + 500]
+            found = dict(db.execute(select(Player.username, Player.id).where(Player.username.in_(batch))).all())
+            missing = [name for name in batch if name not in found]
+            if missing and create_players:
+                db.execute(insert(Player), [{"username": name} for name in missing])
+                new_ids = dict(db.execute(select(Player.username, Player.id).where(Player.username.in_(missing))).all())
+                db.execute(insert(PlayerCounter), [{"player_id": player_id, "catch_count": 0, "battle_wins": 0}
+                                                   for player_id in new_ids.values()])
+                found.update(new_ids)
+                created += len(missing)
+            for name in batch:
+                player_ids[name] = found.get(name)
+
+    def flush(chunk: List[Tuple[int, dict]]) -> int:
+        nonlocal unlocked
+        with engine.transaction():
+            resolve_owners({m["owner"] for _, m in chunk} - player_ids.keys())
+            mappings, counts = [], {}
+            for line_number, mapping in chunk:
+                player_id = player_ids[mapping.pop("owner")]
+                if player_id is None:
+                    errors.append((line_number, "trainer not found"))
+                    continue
+                mapping["player_id"] = player_id
+                counts[player_id] = counts.get(player_id, 0) + 1
+                mappings.append(mapping)
+            # Imported monsters count as catches, so counters, unlocks and leaderboard rows move with the rows
+            unlocked += engine.add_to_counters("catch_count", counts)
+            # render_nulls keeps rows with and without nicknames in one executemany
+            db.bulk_insert_mappings(PlayerMonster, mappings, render_nulls=True)
+        return len(mappings)
+
+    chunk: List[Tuple[int, dict]] = []
+    for line_number, row in read_rows(source, fmt):
+        try:
+            chunk.append((line_number, validate_row(row, species_ids)))
+        except ValueError as error:
+            errors.append((line_number, str(error)))
+            continue
+        if len(chunk) >= chunk_size:
+            imported += flush(chunk)
+            chunk = []
+    if chunk:
+        imported += flush(chunk)
+
+    return ImportReport(imported, created, sorted(errors), unlocked)
@@ -0,0 +1,55 @@
+"""
+Type Chart - Partner A's type effectiveness, compiled for speed!
+config.TYPE_EFFECTIVENESS is the readable rulebook. At load time every
+type gets a small integer id and the chart becomes a dense matrix, so a
+damage lookup is just EFFECTIVENESS[attacker_id][defender_id].
+"""
+
+from typing import Dict, List, Tuple
+
+from config import TYPE_EFFECTIVENESS
+
+# Id 0 is for any type the chart doesn't mention (it's neutral against everything)
+UNKNOWN_TYPE_ID = 0
+
+
+def compile_type_chart(chart: Dict[str, Dict[str, float]]) -> Tuple[List[str], Dict[str, int], List[List[float]]]:
+    """Turn a nested {attacker: {defender: multiplier}} dict into (names, ids, matrix)"""
+    names = ["Normal"]
+    for attacker, row in chart.items():
+        for type_name in [attacker, *row]:
+            if type_name not in names:
+                names.append(type_name)
+    ids = {name: i for i, name in enumerate(names)}
+
+    # Anything missing from the chart is normal damage (1.0)
+    matrix = [[1.0] * len(names) for _ in names]
+    for attacker, row in chart.items():
+        for defender, multiplier in row.items():
+            matrix[ids[attacker]][ids[defender]] = multiplier
+    return names, ids, matrix
+
+
+TYPE_NAMES, TYPE_IDS, EFFECTIVENESS = compile_type_chart(TYPE_EFFECTIVENESS)
+
+
+def type_id(type_name: str) -> int:
+    """Intern a type name to its id (unknown types share the neutral id)"""
+    return TYPE_IDS.get(type_name, UNKNOWN_TYPE_ID)
+
+
+def effectiveness(attacker_type_id: int, defender_type_id: int) -> float:
+    """Damage multiplier for one matchup"""
+    return EFFECTIVENESS[attacker_type_id][defender_type_id]
+
+
+_effectiveness_array = None
+
+
+def effectiveness_array():
+    """The chart as a NumPy array, for gathering whole batches of matchups at once"""
+    global _effectiveness_array
+    if _effectiveness_array is None:
+        import numpy as np
+        _effectiveness_array = np.array(EFFECTIVENESS, dtype=np.float64)
+    return _effectiveness_array
@@ -0,0 +1,277 @@
+"""
+World Generator - Partner A's instant production server!
+Fills a database with as many trainers as you like, each with monsters,
+battle history, trades, unlocked achievements, counters and a leaderboard
+row, so the leaderboard, achievement checks and collection pages can be
+tried at real-world size on a laptop.
+
+Everything comes from one seeded random.Random, so the same settings on
+the same starting database make the same world. Rows are built as plain
+dicts and written with one executemany INSERT per table per chunk of
+trainers (no ORM objects), which keeps it to tens of thousands of rows a
+second.
+
+Monsters are what the game itself would make: species picked by rarity,
+stats from the species' stat curve at the monster's level, and already
+evolved if that level is past the evolution level.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from achievements import AchievementIndex
+from battle_codec import pack_pvp, pack_wild
+from config import (BATTLE_EXP_MULTIPLIER, BATTLE_MONEY_MULTIPLIER, EXP_PER_LEVEL, MAX_LEVEL,
+                    PLAYER_EXP_PER_LEVEL, RARITY_WEIGHTS, STARTER_MONEY)
+from game_data import GameData
+from game_engine import Combatant, GameEngine
+from models import (Battle, LeaderboardEntry, Player, PlayerAchievement, PlayerCounter, PlayerMonster,
+                    Trade)
+
+CHUNK_SIZE = 2000        # Trainers generated (and committed) together
+STARTERS = ("Flamewyrm", "Aquafin", "Vinewhip")
+PVP_SHARE = 0.15         # Share of battles against another trainer instead of a wild monster
+TRADE_STATUSES = (("completed", 50), ("pending", 30), ("rejected", 20))
+HISTORY_DAYS = 365       # Trainers joined at some point in the last year
+
+
+class WorldReport(NamedTuple):
+    """Rows written per table, and how long it took"""
+    players: int
+    monsters: int
+    battles: int
+    trades: int
+    achievements: int
+    seconds: float
+
+    @property
+    def rows(self) -> int:
+        return self.players + self.monsters + self.battles + self.trades + self.achievements
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class WorldGenerator:
+    """Builds one chunk of trainers at a time as row dicts ready for executemany"""
+
+    def __init__(self, game_data: GameData, seed: int = 42, monsters_per_player: int = 20,
+                 battles_per_player: int = 30, trades_per_player: int = 2, prefix: str = "trainer"):
+        self.rng = random.Random(seed)
+        self.game_data = game_data
+        self.monsters_per_player = monsters_per_player
+        self.battles_per_player = battles_per_player
+        self.trades_per_player = trades_per_player
+        self.prefix = prefix
+        self.achievements = AchievementIndex(game_data.achievements)
+        # Only species that can be found in the wild (evolved forms have weight 0)
+        self.wild_species = [s for s in game_data.species if RARITY_WEIGHTS.get(s.rarity, 0) > 0]
+        self.wild_weights = [RARITY_WEIGHTS[s.rarity] for s in self.wild_species]
+        self.starters = [game_data.species_by_name[n] for n in STARTERS if n in game_data.species_by_name] \
+            or self.wild_species
+        # resolve_pvp needs no database, only the damage formula
+        self.fighter = GameEngine()
+        self.now = datetime.utcnow()
+        self.clock = int(time.time())
+
+    def _count(self, mean: int) -> int:
+        """A per-trainer amount around `mean`: most trainers do a little, a few do a lot"""
+        return int(self.rng.expovariate(1 / mean)) if mean > 0 else 0
+
+    def _monster(self, monster_id: int, player_id: int, species, level: int, caught_at: datetime) -> dict:
+        final_form = self.game_data.evolutions.final_form(species.id, level)
+        if final_form:
+            species = self.game_data.species_by_id[final_form]
+        stats = self.game_data.stat_curves[species.id].at(level)
+        hp = stats.hp if self.rng.random() < 0.7 else self.rng.randint(0, stats.hp)
+        return {
+            "id": monster_id, "player_id": player_id, "species_id": species.id, "nickname": None,
+            "level": level, "experience": self.rng.randrange(level * EXP_PER_LEVEL),
+            "hp": hp, "max_hp": stats.hp, "attack": stats.attack, "defense": stats.defense,
+            "speed": stats.speed, "hp_updated_at": self.clock, "caught_at": caught_at,
+        }
+
+    def _combatant(self, monster: dict) -> Combatant:
+        species = self.game_data.species_by_id[monster["species_id"]]
+        return Combatant(monster["id"], monster["player_id"], species.id, species.type_id, species.name,
+                         monster["level"], monster["max_hp"], monster["max_hp"],
+                         monster["attack"], monster["defense"], monster["speed"])
+
+    def chunk(self, first_player_id: int, first_monster_id: int, count: int) -> Dict[str, List[dict]]:
+        """Rows for trainers first_player_id .. first_player_id + count - 1, keyed by table"""
+        rng = self.rng
+        players, monsters, battles, trades, unlocked = [], [], [], [], []
+        owned: Dict[int, List[dict]] = {}
+        monster_id = first_monster_id
+
+        for player_id in range(first_player_id, first_player_id + count):
+            level = min(MAX_LEVEL, 1 + self._count(8))
+            joined = self.now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+            players.append({
+                "id": player_id, "username": f"{self.prefix}{player_id}", "level": level,
+                "experience": rng.randrange(level * PLAYER_EXP_PER_LEVEL),
+                "money": STARTER_MONEY + rng.randrange(50 * level + 1), "created_at": joined,
+            })
+            # Everyone starts with a level 5 starter, then catches around their own level
+            team = [self._monster(monster_id, player_id, rng.choice(self.starters), 5, joined)]
+            monster_id += 1
+            picks = rng.choices(self.wild_species, self.wild_weights, k=self._count(self.monsters_per_player))
+            for species in picks:
+                monster_level = max(1, min(MAX_LEVEL, level + rng.randint(-2, 3)))
+                caught_at = joined + (self.now - joined) * rng.random()
+                team.append(self._monster(monster_id, player_id, species, monster_level, caught_at))
+                monster_id += 1
+            owned[player_id] = team
+            monsters.extend(team)
+
+        player_ids = list(owned)
+        for player_id in player_ids:
+            team = owned[player_id]
+            for _ in range(self._count(self.battles_per_player)):
+                mine = rng.choice(team)
+                opponent = rng.choice(player_ids) if rng.random() < PVP_SHARE else player_id
+                if opponent != player_id:
+                    battles.append(self._pvp_battle(mine, rng.choice(owned[opponent])))
+                else:
+                    battles.append(self._wild_battle(mine))
+        # Trades last: completed ones move monsters to their new owners
+        for player_id in player_ids:
+            team = owned[player_id]
+            for _ in range(self._count(self.trades_per_player)):
+                partner = rng.choice(player_ids)
+                if partner != player_id:
+                    trades.append(self._trade(rng.choice(team), rng.choice(owned[partner])))
+
+        # Totals the game keeps as it goes, worked out from the rows above
+        catches = {player_id: len(team) for player_id, team in owned.items()}
+        wins = dict.fromkeys(player_ids, 0)
+        for battle in battles:
+            if battle["winner_id"] is not None:
+                wins[battle["winner_id"]] += 1
+        current = dict.fromkeys(player_ids, 0)
+        for monster in monsters:
+            current[monster["player_id"]] += 1     # After completed trades moved monsters around
+        counters, leaderboard = [], []
+        for player in players:
+            player_id = player["id"]
+            counters.append({"player_id": player_id, "catch_count": catches[player_id], "battle_wins": wins[player_id]})
+            leaderboard.append({"player_id": player_id, "username": player["username"], "level": player["level"],
+                                "experience": player["experience"], "monster_count": current[player_id],
+                                "battle_wins": wins[player_id]})
+            for requirement_type, value in (("catch_count", catches[player_id]), ("battle_wins", wins[player_id]),
+                                            ("player_level", player["level"])):
+                for achievement in self.achievements.reached(requirement_type, value):
+                    unlocked.append({"player_id": player_id, "achievement_id": achievement.id,
+                                     "unlocked_at": player["created_at"]})
+
+        return {"players": players, "monsters": monsters, "battles": battles, "trades": trades,
+                "achievements": unlocked, "counters": counters, "leaderboard": leaderboard}
+
+    def _wild_battle(self, monster: dict) -> dict:
+        rng = self.rng
+        species = rng.choices(self.wild_species, self.wild_weights)[0]
+        level = max(1, monster["level"] + rng.randint(-2, 2))
+        stats = self.game_data.stat_curves[species.id].at(level)
+        wild = {"level": level, "hp": stats.hp, "max_hp": stats.hp, "attack": stats.attack,
+                "defense": stats.defense, "speed": stats.speed}
+        won = rng.random() < 0.6
+        return {
+            "player1_id": monster["player_id"], "player2_id": None,
+            "winner_id": monster["player_id"] if won else None, "battle_type": "wild",
+            "battle_blob": pack_wild(wild, species.id), "battle_data": None,
+            "experience_gained": level * BATTLE_EXP_MULTIPLIER + rng.randint(10, 30) if won else 0,
+            "money_gained": level * BATTLE_MONEY_MULTIPLIER + rng.randint(5, 15) if won else 0,
+            "created_at": monster["caught_at"] + (self.now - monster["caught_at"]) * rng.random(),
+        }
+
+    def _pvp_battle(self, mine: dict, theirs: dict) -> dict:
+        """A real PvP fight between two generated monsters, so replay-battle agrees with the record"""
+        first, second = self._combatant(mine), self._combatant(theirs)
+        seed = self.rng.getrandbits(32)
+        blob = pack_pvp(seed, [first, second])
+        winner, _, _ = self.fighter.resolve_pvp(first, second, seed, log=False)
+        loser = second if winner is first else first
+        started = max(mine["caught_at"], theirs["caught_at"])
+        return {
+            "player1_id": mine["player_id"], "player2_id": theirs["player_id"],
+            "winner_id": winner.player_id if winner else None, "battle_type": "player",
+            "battle_blob": blob, "battle_data": None,
+            "experience_gained": loser.level * BATTLE_EXP_MULTIPLIER if winner else 0,
+            "money_gained": loser.level * BATTLE_MONEY_MULTIPLIER if winner else 0,
+            "created_at": started + (self.now - started) * self.rng.random(),
+        }
+
+    def _trade(self, offered: dict, requested: dict) -> dict:
+        rng = self.rng
+        status = rng.choices([s for s, _ in TRADE_STATUSES], [w for _, w in TRADE_STATUSES])[0]
+        created = max(offered["caught_at"], requested["caught_at"])
+        created += (self.now - created) * rng.random()
+        trade = {
+            "from_player_id": offered["player_id"], "to_player_id": requested["player_id"],
+            "offered_monster_id": offered["id"], "requested_monster_id": requested["id"],
+            "status": status, "created_at": created, "completed_at": None,
+        }
+        if status == "completed" and offered["player_id"] != requested["player_id"]:
+            # The monsters changed hands, so they're written with their new owners
+            offered["player_id"], requested["player_id"] = requested["player_id"], offered["player_id"]
+            trade["completed_at"] = created + (self.now - created) * rng.random()
+        return trade
+
+
+def generate_world(engine: Engine, game_data: GameData, players: int, monsters_per_player: int = 20,
+                   battles_per_player: int = 30, trades_per_player: int = 2, seed: int = 42,
+                   chunk_size: int = CHUNK_SIZE, prefix: str = "trainer", progress=None) -> WorldReport:
+    """
+    Add `players` generated trainers (and everything they own) to the
+    database, chunk_size trainers per transaction. New trainers and
+    monsters get ids after the highest ones already there. `progress`, if
+    given, is called with the number of trainers written so far.
+    """
+    if players < 1 or chunk_size < 1:
+        raise ValueError("players and chunk_size must be at least 1")
+    generator = WorldGenerator(game_data, seed, monsters_per_player, battles_per_player, trades_per_player, prefix)
+    tables = {
+        "players": Player.__table__, "monsters": PlayerMonster.__table__, "battles": Battle.__table__,
+        "trades": Trade.__table__, "achievements": PlayerAchievement.__table__,
+        "counters": PlayerCounter.__table__, "leaderboard": LeaderboardEntry.__table__,
+    }
+    totals = dict.fromkeys(tables, 0)
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        next_player = (conn.execute(select(func.max(Player.id))).scalar() or 0) + 1
+        next_monster = (conn.execute(select(func.max(PlayerMonster.id))).scalar() or 0) + 1
+
+    done = 0
+    while done < players:
+        count = min(chunk_size, players - done)
+        rows = generator.chunk(next_player, next_monster, count)
+        with engine.begin() as conn:
+            # Parents before children, so foreign keys always point at real rows
+            for name, table in tables.items():
+                if rows[name]:
+                    conn.execute(insert(table), rows[name])
+                    totals[name] += len(rows[name])
+        next_player += count
+        next_monster += len(rows["monsters"])
+        done += count
+        if progress:
+            progress(done)
+
+    if engine.dialect.name == "sqlite":
+        # Fresh statistics, so the query planner knows how big the tables are now
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    elif engine.dialect.name == "postgresql":
+        # Ids were set by hand, so move the sequences past them
+        with engine.begin() as conn:
+            for table in ("players", "player_monsters"):
+                conn.exec_driver_sql(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                                     f"(SELECT MAX(id) FROM {table}))")
+    return WorldReport(totals["players"], totals["monsters"], totals["battles"], totals["trades"],
+                       totals["achievements"], time.perf_counter() - started)